@@ -2,23 +2,109 @@
 FastAPI backend for AstroCSV web application.
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.routing import Match
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import sys
 import os
+import asyncio
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime, date, timedelta
+from zoneinfo import ZoneInfo
 
 # Add the parent directory to Python path to import astrocsv
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from astrocsv.ephem import get_sunrise_times, get_ascendant_at_time
-from astrocsv.mapping_library import (
-    get_sign_and_lord, get_nakshatra_and_lord, get_kp_sub_lords, 
-    generate_ascendant_sub_sub_lord_changes
+from astrocsv.ephem import AYANAMSAS, DEFAULT_AYANAMSA, ENGINE_VERSION, get_ephemeris_status, setup_swiss_ephemeris, get_ephemeris_memo
+from astrocsv.mapping_library import get_ascendant_change_table
+from astrocsv.serialization import RawJSON, dumps, dumps_object, dumps_array
+from astrocsv.cache import LRUCache, quantize_coordinate, result_cache_from_env
+from astrocsv.summary import get_day_summary, summary_sunrise
+from astrocsv.timezones import get_timezone
+from astrocsv.gazetteer import resolve_place, search_places
+from astrocsv.panchang import panchang_for_dates
+from astrocsv.singleflight import SingleFlight
+from astrocsv.live import LiveAscendantHub
+from astrocsv.admission import AdmissionController, AdmissionRejected
+from astrocsv.metrics import (
+    REGISTRY, CONTENT_TYPE as METRICS_CONTENT_TYPE, CallbackMetric,
+    STAGE_SECONDS, HTTP_REQUEST_SECONDS, EXECUTOR_PENDING, cache_stats_collector
 )
 
+# Response cache for /calculate. Results for a (location, date) never change
+# for a given engine version, so entries are only evicted for space.
+CALCULATE_CACHE_MAX_ENTRIES = int(os.environ.get("ASTROCSV_API_CACHE_SIZE", "2048"))
+CALCULATE_CACHE_COORD_DECIMALS = 4  # ~11 m; see astrocsv.cache.quantize_coordinate
+CALCULATE_CACHE_CONTROL = "public, max-age=86400"
+calculate_cache = LRUCache(max_entries=CALCULATE_CACHE_MAX_ENTRIES)
+
+# Day-level results shared across uvicorn workers (ASTROCSV_CACHE_URL,
+# e.g. sqlite:///var/cache/astrocsv.db or redis://cache:6379/0)
+day_cache = result_cache_from_env(ENGINE_VERSION)
+
+# Concurrent misses for the same cache key share one computation
+calculate_flight = SingleFlight()
+
+# Ephemeris work runs off the event loop so concurrent requests can coalesce
+COMPUTE_THREADS = int(os.environ.get("ASTROCSV_API_COMPUTE_THREADS", "4"))
+compute_executor = ThreadPoolExecutor(
+    max_workers=COMPUTE_THREADS,
+    thread_name_prefix="astro-compute"
+)
+
+# Admission control for uncached /calculate work: at most one execution per
+# compute thread, a short bounded queue, and fast rejection beyond that so
+# admitted requests keep a stable latency under overload
+calculate_admission = AdmissionController(
+    "/calculate",
+    max_concurrent=COMPUTE_THREADS,
+    max_queue=int(os.environ.get("ASTROCSV_CALCULATE_MAX_QUEUE", "32")),
+    queue_timeout=float(os.environ.get("ASTROCSV_CALCULATE_QUEUE_TIMEOUT", "2.0"))
+)
+
+# /panchang shares the compute threads; a year of days is far heavier than a
+# /calculate, so it gets its own slots and queue
+panchang_admission = AdmissionController(
+    "/panchang",
+    max_concurrent=max(1, COMPUTE_THREADS // 2),
+    max_queue=int(os.environ.get("ASTROCSV_PANCHANG_MAX_QUEUE", "8")),
+    queue_timeout=float(os.environ.get("ASTROCSV_PANCHANG_QUEUE_TIMEOUT", "5.0"))
+)
+
+# Live ascendant updates: one computation per location per tick, fanned out
+# to every subscriber of that location
+LIVE_KEEPALIVE_SECONDS = 15.0
+live_hub = LiveAscendantHub(
+    tick_seconds=float(os.environ.get("ASTROCSV_LIVE_TICK_SECONDS", "5")),
+    crossings_only=os.environ.get("ASTROCSV_LIVE_CROSSINGS_ONLY", "") == "1",
+    executor=compute_executor
+)
+
+REGISTRY.register(CallbackMetric(
+    "astrocsv_live_hub",
+    "Live ascendant subscriptions and fan-out counters",
+    lambda: (({"stat": name}, value) for name, value in live_hub.stats().items())
+))
+
+REGISTRY.register(CallbackMetric(
+    "astrocsv_api_cache",
+    "Response cache and request coalescing statistics",
+    cache_stats_collector({
+        "calculate": calculate_cache.stats,
+        "calculate_singleflight": calculate_flight.stats,
+        "calculate_admission": calculate_admission.stats,
+        "panchang_admission": panchang_admission.stats,
+        "ephemeris_memo": lambda: get_ephemeris_memo().stats(),
+        "day_" + day_cache.backend.name: day_cache.stats
+    })
+))
+
 app = FastAPI(
     title="AstroCSV API",
     description="REST API for astrological calculations and CSV generation",
@@ -34,17 +120,43 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def _route_template(request: Request) -> str:
+    """Return the path template of the route serving a request, e.g. /calculate."""
+    for route in request.app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return getattr(route, "path", request.url.path)
+    return "unmatched"
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """Observe per-route request latency for /metrics."""
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - start,
+            method=request.method, route=_route_template(request), status=str(status)
+        )
+
 # Pydantic models for request/response
 class AstroRequest(BaseModel):
-    latitude: float
-    longitude: float
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    city: Optional[str] = None  # gazetteer name instead of coordinates
     date: str
     include_ascendant_changes: bool = True
+    timezone: Optional[str] = None  # IANA name or "auto"; default IST
 
 class AstroResponse(BaseModel):
     date: str
     latitude: float
     longitude: float
+    timezone: Optional[str] = None
     sunrise: str
     next_sunrise: str
     ascendant: float
@@ -71,6 +183,11 @@ class DegreeBucketResponse(BaseModel):
     is_sub_sub_lord_change: bool
     change_type: Optional[str] = None
 
+@app.on_event("startup")
+async def preload_ephemeris_files():
+    """Apply the ephemeris path and open its files before the first request."""
+    setup_swiss_ephemeris()
+
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
@@ -81,6 +198,10 @@ async def root():
             "/calculate": "Calculate astrological data for a location and date",
             "/ascendant-changes": "Generate ascendant-based Sub Sub Lord changes",
             "/search-astrological": "Search astrological data by criteria",
+            "/live/ascendant": "Server-sent events with the current ascendant and next change",
+            "/places": "Search the city gazetteer by name prefix",
+            "/cache/stats": "Response cache and request coalescing counters",
+            "/metrics": "Prometheus metrics",
             "/health": "Health check endpoint"
         }
     }
@@ -88,14 +209,150 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "message": "AstroCSV API is running"}
+    ephemeris = get_ephemeris_status()
+    return {
+        "status": "healthy",
+        "message": "AstroCSV API is running",
+        "ephemeris_backend": ephemeris["backend"],
+        "ephemeris_path": ephemeris["path"],
+        "ephemeris_covers_current_year": ephemeris["covers_current_year"]
+    }
+
+@lru_cache(maxsize=2)
+def _change_row_fragments(include_change_flag: bool) -> Tuple[Tuple[float, bytes, bytes], ...]:
+    """
+    Pre-serialize the static parts of every ascendant change row.
+
+    Only the date and time of a row depend on the request, so each row is
+    stored as (degree, prefix, suffix) bytes around those two values.
+
+    Args:
+        include_change_flag: Whether rows carry is_sub_sub_lord_change
+
+    Returns:
+        Tuple of (degree, prefix, suffix) per change point
+    """
+    fragments = []
+    for change_data in get_ascendant_change_table():
+        static_fields = {
+            "ascendant_degree": change_data['degree'],
+            "sign": change_data['sign'],
+            "sign_lord": change_data['sign_lord'],
+            "nakshatra": change_data['nakshatra'],
+            "nakshatra_lord": change_data['nakshatra_lord'],
+            "sub_lord": change_data['sub_lord'],
+            "sub_sub_lord": change_data['sub_sub_lord']
+        }
+        if include_change_flag:
+            static_fields["is_sub_sub_lord_change"] = 'Sub Sub Lord:' in change_data['change_type']
+        static_fields["change_type"] = change_data['change_type']
+        
+        prefix = b'{"degree":' + dumps(change_data['degree']) + b',"date":"'
+        suffix = b'",' + dumps_object(static_fields)[1:]
+        fragments.append((change_data['degree'], prefix, suffix))
+    return tuple(fragments)
+
+def _render_change_rows(
+    base_time: datetime,
+    fragments: Tuple[Tuple[float, bytes, bytes], ...],
+    selected: Optional[List[int]] = None
+) -> RawJSON:
+    """
+    Render change rows as a JSON array, timing each change from base_time.
+
+    Args:
+        base_time: Time of the 0° change point (sunrise or now)
+        fragments: Output of _change_row_fragments
+        selected: Optional indices of the rows to include
+
+    Returns:
+        Encoded JSON array of change rows
+    """
+    rows = []
+    indices = range(len(fragments)) if selected is None else selected
+    for index in indices:
+        degree, prefix, suffix = fragments[index]
+        # Each degree represents 4 minutes of time (24 hours / 360 degrees)
+        stamp = (base_time + timedelta(minutes=degree * 4)).isoformat()
+        rows.append(prefix + stamp[:10].encode() + b'","time":"' + stamp[11:19].encode() + suffix)
+    return dumps_array(rows)
+
+def _json_response(body: bytes, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Wrap pre-encoded JSON bytes in a response, skipping model validation."""
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def _calculate_payload(
+    latitude: float,
+    longitude: float,
+    target_date: date,
+    include_ascendant_changes: bool,
+    tz: Optional[ZoneInfo] = None
+) -> Dict[str, Any]:
+    """
+    Compute the location- and date-dependent part of a /calculate response.
+
+    Args:
+        latitude: Latitude in decimal degrees
+        longitude: Longitude in decimal degrees
+        target_date: Local date to calculate for
+        include_ascendant_changes: Whether to build the change table
+        tz: Time zone of the date and times (default IST)
+
+    Returns:
+        Dictionary of AstroResponse fields, without the request echo fields.
+        ascendant_changes is pre-encoded JSON.
+    """
+    # Sunrise, ascendant and lords, shared across workers via the day cache
+    summary = get_day_summary(latitude, longitude, target_date, day_cache, tz)
+    sunrise = summary_sunrise(summary)
+    
+    # Generate ascendant-based Sub Sub Lord changes if requested
+    degree_buckets = None
+    if include_ascendant_changes:
+        with STAGE_SECONDS.time(stage="serialization"):
+            degree_buckets = _render_change_rows(sunrise, _change_row_fragments(True))
+    
+    return {
+        "sunrise": summary["sunrise"],
+        "next_sunrise": summary["next_sunrise"],
+        "ascendant": round(summary["ascendant"], 3),
+        "ascendant_sign": summary["sign"],
+        "ascendant_sign_lord": summary["sign_lord"],
+        "ascendant_nakshatra": summary["nakshatra"],
+        "ascendant_nakshatra_lord": summary["nakshatra_lord"],
+        "ascendant_sub_lord": summary["sub_lord"],
+        "ascendant_sub_sub_lord": summary["sub_sub_lord"],
+        "ascendant_changes": degree_buckets
+    }
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header value against a strong ETag."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
 
 @app.post("/calculate", response_model=AstroResponse)
-async def calculate_astro_data(request: AstroRequest):
+async def calculate_astro_data(request: AstroRequest, http_request: Request):
     """
     Calculate astrological data for a given location and date.
+
+    Results are cached per quantized location, date and engine version, and
+    served with a strong ETag; a matching If-None-Match gets a 304.
     """
     try:
+        # Resolve a city name to coordinates (and its zone, unless one was given)
+        timezone = request.timezone
+        if request.city:
+            try:
+                place = resolve_place(request.city)
+            except KeyError as e:
+                raise HTTPException(status_code=404, detail=str(e.args[0]))
+            request.latitude, request.longitude = place.latitude, place.longitude
+            timezone = timezone or place.timezone or None
+        elif request.latitude is None or request.longitude is None:
+            raise HTTPException(status_code=400, detail="Either latitude and longitude or city is required")
+        
         # Validate coordinates
         if not -90 <= request.latitude <= 90:
             raise HTTPException(status_code=400, detail="Latitude must be between -90 and 90")
@@ -105,68 +362,182 @@ async def calculate_astro_data(request: AstroRequest):
         # Parse date string to datetime object (at sunrise time)
         target_date = datetime.strptime(request.date, "%Y-%m-%d").date()
         
-        # Calculate sunrise times
-        sunrise, next_sunrise = get_sunrise_times(request.latitude, request.longitude, target_date)
+        # Results are computed at the quantized location so a cache entry
+        # does not depend on which nearby request happened to fill it
+        latitude = quantize_coordinate(request.latitude, CALCULATE_CACHE_COORD_DECIMALS)
+        longitude = quantize_coordinate(request.longitude, CALCULATE_CACHE_COORD_DECIMALS)
+        try:
+            tz = get_timezone(timezone, latitude, longitude)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        cache_key = (ENGINE_VERSION, latitude, longitude, target_date, request.include_ascendant_changes, tz.key)
         
-        # Calculate ascendant at sunrise time
-        ascendant = get_ascendant_at_time(request.latitude, request.longitude, sunrise)
+        payload = calculate_cache.get(cache_key)
+        if payload is None:
+            async def compute_and_store():
+                # Coalesced callers share the leader's execution slot
+                async with calculate_admission.admit():
+                    loop = asyncio.get_running_loop()
+                    with EXECUTOR_PENDING.track_inprogress(executor="compute"):
+                        result = await loop.run_in_executor(
+                            compute_executor, _calculate_payload,
+                            latitude, longitude, target_date, request.include_ascendant_changes, tz
+                        )
+                calculate_cache.set(cache_key, result)
+                return result
+            
+            try:
+                payload = await calculate_flight.do(cache_key, compute_and_store)
+            except AdmissionRejected as e:
+                raise HTTPException(
+                    status_code=e.status_code,
+                    detail="Server is busy, please retry later",
+                    headers={"Retry-After": str(e.retry_after)}
+                )
         
-        # Get astrological details for ascendant
-        sign, sign_lord = get_sign_and_lord(ascendant)
-        nakshatra, nakshatra_lord = get_nakshatra_and_lord(ascendant)
-        sub_lord, sub_sub_lord = get_kp_sub_lords(ascendant)
+        response_data = {
+            "date": request.date,
+            "latitude": request.latitude,
+            "longitude": request.longitude,
+            "timezone": tz.key,
+            **payload,
+            "message": "Astrological calculations completed successfully"
+        }
+        with STAGE_SECONDS.time(stage="serialization"):
+            body = dumps_object(response_data)
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        headers = {"ETag": etag, "Cache-Control": CALCULATE_CACHE_CONTROL}
         
-        # Generate ascendant-based Sub Sub Lord changes if requested
-        degree_buckets = None
-        if request.include_ascendant_changes:
-            # Generate changes based on ascendant Sub Sub Lord transitions
-            ascendant_changes = generate_ascendant_sub_sub_lord_changes()
-            degree_buckets = []
-            
-            for change_data in ascendant_changes:
-                # Calculate the time for this change point
-                # Each degree represents 4 minutes of time (24 hours / 360 degrees)
-                minutes_offset = change_data['degree'] * 4  # 4 minutes per degree
-                change_time = sunrise + timedelta(minutes=minutes_offset)
-                
-                # Determine if this is a Sub Sub Lord change
-                is_sub_sub_lord_change = 'Sub Sub Lord:' in change_data['change_type']
-                
-                degree_buckets.append({
-                    "degree": change_data['degree'],
-                    "date": change_time.strftime("%Y-%m-%d"),
-                    "time": change_time.strftime("%H:%M:%S"),
-                    "ascendant_degree": change_data['degree'],
-                    "sign": change_data['sign'],
-                    "sign_lord": change_data['sign_lord'],
-                    "nakshatra": change_data['nakshatra'],
-                    "nakshatra_lord": change_data['nakshatra_lord'],
-                    "sub_lord": change_data['sub_lord'],
-                    "sub_sub_lord": change_data['sub_sub_lord'],
-                    "is_sub_sub_lord_change": is_sub_sub_lord_change,
-                    "change_type": change_data['change_type']
-                })
+        if _etag_matches(http_request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
         
-        return AstroResponse(
-            date=request.date,
-            latitude=request.latitude,
-            longitude=request.longitude,
-            sunrise=sunrise.isoformat(),
-            next_sunrise=next_sunrise.isoformat(),
-            ascendant=round(ascendant, 3),
-            ascendant_sign=sign,
-            ascendant_sign_lord=sign_lord,
-            ascendant_nakshatra=nakshatra,
-            ascendant_nakshatra_lord=nakshatra_lord,
-            ascendant_sub_lord=sub_lord,
-            ascendant_sub_sub_lord=sub_sub_lord,
-            ascendant_changes=degree_buckets,
-            message="Astrological calculations completed successfully"
-        )
+        return _json_response(body, headers)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Calculation error: {str(e)}")
 
+@app.get("/live/ascendant")
+async def live_ascendant(latitude: float, longitude: float, request: Request, timezone: Optional[str] = None):
+    """
+    Stream the current ascendant for a location as server-sent events.
+
+    Each "ascendant" event carries the current ascendant, its lords and the
+    time of the next sign/nakshatra/sub/sub-sub lord change. Clients watching
+    the same location share one computation. If the ascendant cannot be
+    computed there (polar latitudes), one "error" event ends the stream.
+    Times are in the given zone (IANA name or "auto", default IST).
+    """
+    if not -90.0 <= latitude <= 90.0 or not -180.0 <= longitude <= 180.0:
+        raise HTTPException(status_code=400, detail="Latitude or longitude out of range")
+    try:
+        tz = get_timezone(timezone, latitude, longitude)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def events():
+        # Subscribe only once the response is streaming: a client that drops
+        # before the first iteration never runs this generator, and so never
+        # leaves a topic behind without a matching unsubscribe
+        key, queue = live_hub.subscribe(latitude, longitude, tz)
+        try:
+            while not await request.is_disconnected():
+                try:
+                    snapshot = await asyncio.wait_for(queue.get(), timeout=LIVE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                if "error" in snapshot:
+                    # The hub closed this location's topic; end the stream
+                    yield b"event: error\ndata: " + dumps(snapshot) + b"\n\n"
+                    break
+                yield b"event: ascendant\ndata: " + dumps(snapshot) + b"\n\n"
+        finally:
+            live_hub.unsubscribe(key, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/places")
+async def places(q: str, limit: int = 10, country: Optional[str] = None):
+    """Search the offline gazetteer by name prefix, most populous places first."""
+    if not 1 <= limit <= 100:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 100")
+    return {"places": [place.to_dict() for place in search_places(q, limit=limit, country=country)]}
+
+# Longest date range served by /panchang in one request
+PANCHANG_MAX_DAYS = 366
+
+@app.get("/panchang")
+async def panchang(
+    latitude: float,
+    longitude: float,
+    start_date: str,
+    end_date: Optional[str] = None,
+    timezone: Optional[str] = None,
+    ayanamsa: str = DEFAULT_AYANAMSA
+):
+    """
+    Tithi, nakshatra, yoga, karana and vara at sunrise for each date, with
+    the time each element ends. Nakshatra and yoga use the sidereal zodiac
+    of the given ayanamsa.
+    """
+    if not -90.0 <= latitude <= 90.0 or not -180.0 <= longitude <= 180.0:
+        raise HTTPException(status_code=400, detail="Latitude or longitude out of range")
+    try:
+        first = datetime.strptime(start_date, "%Y-%m-%d").date()
+        last = datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else first
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    if not 0 <= (last - first).days < PANCHANG_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"end_date must be within {PANCHANG_MAX_DAYS} days on or after start_date")
+    if ayanamsa not in AYANAMSAS:
+        raise HTTPException(status_code=400, detail=f"ayanamsa must be one of {', '.join(AYANAMSAS)}")
+    try:
+        tz = get_timezone(timezone, latitude, longitude)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    dates = [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+    try:
+        async with panchang_admission.admit():
+            loop = asyncio.get_running_loop()
+            with EXECUTOR_PENDING.track_inprogress(executor="compute"):
+                rows = await loop.run_in_executor(
+                    compute_executor, panchang_for_dates, latitude, longitude, dates, tz, None, ayanamsa
+                )
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail="Server is busy, please retry later",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"latitude": latitude, "longitude": longitude, "timezone": tz.key, "ayanamsa": ayanamsa, "days": rows}
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus text exposition of request, stage, ephemeris and cache metrics."""
+    return Response(content=REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Report response cache and request coalescing counters."""
+    return {
+        "engine_version": ENGINE_VERSION,
+        "calculate": calculate_cache.stats(),
+        "calculate_singleflight": calculate_flight.stats(),
+        "calculate_admission": calculate_admission.stats(),
+        "panchang_admission": panchang_admission.stats(),
+        "ephemeris_memo": get_ephemeris_memo().stats(),
+        "day": {"backend": day_cache.backend.name, **day_cache.stats()}
+    }
+
 @app.get("/ascendant-changes")
 async def get_ascendant_changes():
     """
@@ -176,38 +547,13 @@ async def get_ascendant_changes():
         # Use current date and time for standalone endpoint
         current_datetime = datetime.now()
         
-        # Generate ascendant-based sub-sub lord changes
-        ascendant_changes = generate_ascendant_sub_sub_lord_changes()
-        
-        result = []
-        for change_data in ascendant_changes:
-            # Calculate the time for this change point
-            # Each degree represents 4 minutes of time (24 hours / 360 degrees)
-            minutes_offset = change_data['degree'] * 4  # 4 minutes per degree
-            change_time = current_datetime + timedelta(minutes=minutes_offset)
-            
-            # Determine if this is a Sub Sub Lord change
-            is_sub_sub_lord_change = 'Sub Sub Lord:' in change_data['change_type']
-            
-            result.append({
-                "degree": change_data['degree'],
-                "date": change_time.strftime("%Y-%m-%d"),
-                "time": change_time.strftime("%H:%M:%S"),
-                "ascendant_degree": change_data['degree'],
-                "sign": change_data['sign'],
-                "sign_lord": change_data['sign_lord'],
-                "nakshatra": change_data['nakshatra'],
-                "nakshatra_lord": change_data['nakshatra_lord'],
-                "sub_lord": change_data['sub_lord'],
-                "sub_sub_lord": change_data['sub_sub_lord'],
-                "is_sub_sub_lord_change": is_sub_sub_lord_change,
-                "change_type": change_data['change_type']
+        fragments = _change_row_fragments(True)
+        with STAGE_SECONDS.time(stage="serialization"):
+            body = dumps_object({
+                "total_changes": len(fragments),
+                "ascendant_changes": _render_change_rows(current_datetime, fragments)
             })
-        
-        return {
-            "total_changes": len(result),
-            "ascendant_changes": result
-        }
+        return _json_response(body)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating ascendant changes: {str(e)}")
@@ -225,61 +571,31 @@ async def search_astrological(
     Search for astrological data by various criteria.
     """
     try:
-        # Generate ascendant-based sub-sub lord changes
-        ascendant_changes = generate_ascendant_sub_sub_lord_changes()
+        criteria = {
+            "nakshatra": nakshatra,
+            "nakshatra_lord": nakshatra_lord,
+            "sub_lord": sub_lord,
+            "sub_sub_lord": sub_sub_lord,
+            "sign": sign,
+            "sign_lord": sign_lord
+        }
+        active_criteria = [(field, value.lower()) for field, value in criteria.items() if value]
         
         # Filter results based on search criteria
-        filtered_results = []
-        for change_data in ascendant_changes:
-            # Check if this entry matches all provided search criteria
-            matches = True
-            
-            if nakshatra and nakshatra.lower() not in change_data['nakshatra'].lower():
-                matches = False
-            if nakshatra_lord and nakshatra_lord.lower() not in change_data['nakshatra_lord'].lower():
-                matches = False
-            if sub_lord and sub_lord.lower() not in change_data['sub_lord'].lower():
-                matches = False
-            if sub_sub_lord and sub_sub_lord.lower() not in change_data['sub_sub_lord'].lower():
-                matches = False
-            if sign and sign.lower() not in change_data['sign'].lower():
-                matches = False
-            if sign_lord and sign_lord.lower() not in change_data['sign_lord'].lower():
-                matches = False
-            
-            if matches:
-                # Calculate the time for this change point
-                # Each degree represents 4 minutes of time (24 hours / 360 degrees)
-                current_datetime = datetime.now()
-                minutes_offset = change_data['degree'] * 4  # 4 minutes per degree
-                change_time = current_datetime + timedelta(minutes=minutes_offset)
-                
-                filtered_results.append({
-                    "degree": change_data['degree'],
-                    "date": change_time.strftime("%Y-%m-%d"),
-                    "time": change_time.strftime("%H:%M:%S"),
-                    "ascendant_degree": change_data['degree'],
-                    "sign": change_data['sign'],
-                    "sign_lord": change_data['sign_lord'],
-                    "nakshatra": change_data['nakshatra'],
-                    "nakshatra_lord": change_data['nakshatra_lord'],
-                    "sub_lord": change_data['sub_lord'],
-                    "sub_sub_lord": change_data['sub_sub_lord'],
-                    "change_type": change_data['change_type']
-                })
+        matched = [
+            index for index, change_data in enumerate(get_ascendant_change_table())
+            if all(value in change_data[field].lower() for field, value in active_criteria)
+        ]
         
-        return {
-            "search_criteria": {
-                "nakshatra": nakshatra,
-                "nakshatra_lord": nakshatra_lord,
-                "sub_lord": sub_lord,
-                "sub_sub_lord": sub_sub_lord,
-                "sign": sign,
-                "sign_lord": sign_lord
-            },
-            "total_results": len(filtered_results),
-            "results": filtered_results
-        }
+        # Change times are counted from now, like /ascendant-changes
+        current_datetime = datetime.now()
+        with STAGE_SECONDS.time(stage="serialization"):
+            body = dumps_object({
+                "search_criteria": criteria,
+                "total_results": len(matched),
+                "results": _render_change_rows(current_datetime, _change_row_fragments(False), matched)
+            })
+        return _json_response(body)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error searching astrological data: {str(e)}")
@@ -0,0 +1,124 @@
+"""
+Admission control for CPU-bound API work.
+
+Each controller admits a fixed number of concurrent executions, lets a
+bounded number of requests wait for a slot up to a deadline, and rejects
+the rest immediately. Rejecting early keeps latency of admitted requests
+bounded by the queue limit instead of growing with the backlog.
+"""
+
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
+
+from .metrics import ADMISSION_IN_FLIGHT, ADMISSION_QUEUED, ADMISSION_WAIT_SECONDS, ADMISSION_REJECTED
+
+class AdmissionRejected(Exception):
+    """
+    Raised when a request is shed by admission control.
+
+    Attributes:
+        status_code: 429 when the wait queue is full, 503 when the wait
+            deadline passed before a slot freed up
+        retry_after: Suggested seconds before retrying
+        reason: "queue_full" or "queue_timeout"
+    """
+
+    def __init__(self, status_code: int, retry_after: int, reason: str):
+        super().__init__(f"Request rejected by admission control ({reason})")
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.reason = reason
+
+class AdmissionController:
+    """
+    Concurrency limit with a bounded, deadline-limited wait queue.
+
+    Args:
+        route: Label used in metrics
+        max_concurrent: Executions allowed at once
+        max_queue: Requests allowed to wait for a slot
+        queue_timeout: Seconds a request may wait before it is rejected
+    """
+
+    # Weight of the newest sample in the service time moving average
+    SERVICE_TIME_ALPHA = 0.2
+
+    def __init__(self, route: str, max_concurrent: int, max_queue: int, queue_timeout: float):
+        self.route = route
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected_full = 0
+        self.rejected_timeout = 0
+        self.service_time = 0.0
+
+    def retry_after(self) -> int:
+        """Estimate seconds until the current backlog has drained."""
+        backlog = self.in_flight + self.queued
+        return max(1, math.ceil(backlog * self.service_time / self.max_concurrent))
+
+    def _reject(self, status_code: int, reason: str) -> AdmissionRejected:
+        ADMISSION_REJECTED.inc(route=self.route, reason=reason)
+        return AdmissionRejected(status_code, self.retry_after(), reason)
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """
+        Hold an execution slot for the duration of the block.
+
+        Raises:
+            AdmissionRejected: If the queue is full or the wait deadline passes
+        """
+        if self._semaphore.locked():
+            if self.queued >= self.max_queue:
+                self.rejected_full += 1
+                raise self._reject(429, "queue_full")
+
+            self.queued += 1
+            ADMISSION_QUEUED.inc(route=self.route)
+            start = time.perf_counter()
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected_timeout += 1
+                raise self._reject(503, "queue_timeout")
+            finally:
+                self.queued -= 1
+                ADMISSION_QUEUED.dec(route=self.route)
+            ADMISSION_WAIT_SECONDS.observe(time.perf_counter() - start, route=self.route)
+        else:
+            await self._semaphore.acquire()
+            ADMISSION_WAIT_SECONDS.observe(0.0, route=self.route)
+
+        self.admitted += 1
+        self.in_flight += 1
+        ADMISSION_IN_FLIGHT.inc(route=self.route)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.service_time += self.SERVICE_TIME_ALPHA * (elapsed - self.service_time)
+            self.in_flight -= 1
+            ADMISSION_IN_FLIGHT.dec(route=self.route)
+            self._semaphore.release()
+
+    def stats(self) -> Dict[str, float]:
+        """Return admission counters and current queue state."""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_full,
+            "rejected_queue_timeout": self.rejected_timeout,
+            "service_time_seconds": round(self.service_time, 6)
+        }
@@ -0,0 +1,244 @@
+"""
+Precomputed almanac of daily sunrise and ascendant data for a set of cities.
+
+The almanac file is a fixed-width binary table with one record per city per
+day, so a (city, date) lookup is a single offset computation into a
+memory-mapped file and never touches Swiss Ephemeris. Dates outside the
+stored range fall back to live computation, and so does every date of a
+file written by a different engine version (ENGINE_VERSION), whose stored
+results may no longer match what the engine computes.
+
+File layout (little-endian):
+
+    header   magic, format version, engine version, first day (proleptic
+             ordinal), number of days, number of cities, record size
+    cities   name (UTF-8, 64 bytes), latitude, longitude per city
+    records  city-major: sunrise and next sunrise (Unix seconds, float64),
+             ascendant (float64), KP segment index (uint16)
+
+The KP segment index points into mapping_library.get_kp_segment_table(),
+which gives the sign, nakshatra, sub lord and sub-sub lord without storing
+any strings per record.
+"""
+
+import bisect
+import logging
+import math
+import mmap
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .ephem import get_sunrise_times, get_ascendant_at_time, ENGINE_VERSION, IST
+from .mapping_library import get_kp_segment_table, get_kp_boundaries
+from .summary import compute_day_summary
+
+MAGIC = b"ASTALMNC"
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct("<8sH64siiiH")
+CITY = struct.Struct("<64sdd")
+RECORD = struct.Struct("<dddH")
+
+# Segment index marking a day that could not be computed
+MISSING_SEGMENT = 0xFFFF
+
+logger = logging.getLogger(__name__)
+
+City = Tuple[str, float, float]
+
+def read_cities_file(path: str) -> List[City]:
+    """
+    Read a tab-separated city list with name, latitude and longitude columns.
+
+    Blank lines, lines starting with '#' and a header line starting with
+    'name' are skipped.
+
+    Args:
+        path: TSV file path
+
+    Returns:
+        List of (name, latitude, longitude)
+    """
+    cities = []
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            line = line.rstrip("\n")
+            if not line.strip() or line.startswith("#") or line.lower().startswith("name\t"):
+                continue
+            name, lat, lon = line.split("\t")[:3]
+            cities.append((name.strip(), float(lat), float(lon)))
+    return cities
+
+def _city_block(city: City, start_date: date, days: int) -> bytes:
+    """Compute the packed records of one city for every day in the range."""
+    _, lat, lon = city
+    boundaries = get_kp_boundaries()
+    records = []
+    for offset in range(days):
+        current_date = start_date + timedelta(days=offset)
+        try:
+            sunrise, next_sunrise = get_sunrise_times(lat, lon, current_date)
+            ascendant = get_ascendant_at_time(lat, lon, sunrise)
+            segment = bisect.bisect_right(boundaries, ascendant) - 1
+            records.append(RECORD.pack(sunrise.timestamp(), next_sunrise.timestamp(), ascendant, segment))
+        except Exception:
+            records.append(RECORD.pack(math.nan, math.nan, math.nan, MISSING_SEGMENT))
+    return b"".join(records)
+
+def build_almanac(
+    cities: Sequence[City],
+    start_date: date,
+    days: int,
+    path: str,
+    workers: int = 1,
+    progress: Optional[Callable[[int, int], None]] = None
+) -> int:
+    """
+    Precompute an almanac file.
+
+    Args:
+        cities: (name, latitude, longitude) per city; names must be unique
+        start_date: First day stored
+        days: Number of days stored per city
+        path: Output file; written to a temporary file and renamed
+        workers: Processes used to compute cities in parallel
+        progress: Optional callback(cities_done, cities_total)
+
+    Returns:
+        Size of the written file in bytes
+    """
+    names = [name.lower() for name, _, _ in cities]
+    if len(set(names)) != len(names):
+        raise ValueError("City names must be unique")
+
+    partial = path + ".part"
+    with open(partial, "wb") as handle:
+        handle.write(HEADER.pack(
+            MAGIC, FORMAT_VERSION, ENGINE_VERSION.encode("utf-8")[:64],
+            start_date.toordinal(), days, len(cities), RECORD.size
+        ))
+        for name, lat, lon in cities:
+            handle.write(CITY.pack(name.encode("utf-8")[:64], lat, lon))
+
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                blocks = executor.map(_city_block, cities, [start_date] * len(cities), [days] * len(cities))
+                for done, block in enumerate(blocks, 1):
+                    handle.write(block)
+                    if progress:
+                        progress(done, len(cities))
+        else:
+            for done, city in enumerate(cities, 1):
+                handle.write(_city_block(city, start_date, days))
+                if progress:
+                    progress(done, len(cities))
+    os.replace(partial, path)
+    return os.path.getsize(path)
+
+class Almanac:
+    """
+    Memory-mapped reader for almanac files.
+
+    Args:
+        path: Almanac file written by build_almanac
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, engine, start_ordinal, days, city_count, record_size = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"{path} is not an almanac file of format version {FORMAT_VERSION}")
+        self.engine_version = engine.rstrip(b"\0").decode("utf-8")
+        # Stored days are only served when written by this engine version
+        self.current = self.engine_version == ENGINE_VERSION.encode("utf-8")[:64].decode("utf-8", "ignore")
+        if not self.current:
+            logger.warning(
+                "Almanac %s was built by engine %s, not %s; computing its days live",
+                path, self.engine_version, ENGINE_VERSION
+            )
+        self.start_date = date.fromordinal(start_ordinal)
+        self.days = days
+        self.cities: List[City] = []
+        self._index: Dict[str, int] = {}
+        for position in range(city_count):
+            name, lat, lon = CITY.unpack_from(self._map, HEADER.size + position * CITY.size)
+            name = name.rstrip(b"\0").decode("utf-8")
+            self.cities.append((name, lat, lon))
+            self._index[name.lower()] = position
+        self._records_offset = HEADER.size + city_count * CITY.size
+
+    @property
+    def end_date(self) -> date:
+        """Last day stored."""
+        return self.start_date + timedelta(days=self.days - 1)
+
+    def city(self, name: str) -> Optional[City]:
+        """Return (name, latitude, longitude) of a stored city, matched case-insensitively."""
+        position = self._index.get(name.lower())
+        return None if position is None else self.cities[position]
+
+    def lookup(self, name: str, target_date: date) -> Optional[Dict[str, Any]]:
+        """
+        Read one stored day.
+
+        Args:
+            name: City name (case-insensitive)
+            target_date: Date to read
+
+        Returns:
+            Day summary in the format of summary.compute_day_summary, or None
+            if the city, date or record is not stored or the file was built
+            by another engine version
+        """
+        position = self._index.get(name.lower())
+        day = (target_date - self.start_date).days
+        if not self.current or position is None or not 0 <= day < self.days:
+            return None
+        sunrise, next_sunrise, ascendant, segment = RECORD.unpack_from(
+            self._map, self._records_offset + (position * self.days + day) * RECORD.size
+        )
+        if segment == MISSING_SEGMENT:
+            return None
+        _, _, sign, sign_lord, nakshatra, nakshatra_lord, sub_lord, sub_sub_lord = get_kp_segment_table()[segment]
+        return {
+            "sunrise": datetime.fromtimestamp(sunrise, IST).isoformat(),
+            "next_sunrise": datetime.fromtimestamp(next_sunrise, IST).isoformat(),
+            "ascendant": ascendant,
+            "sign": sign,
+            "sign_lord": sign_lord,
+            "nakshatra": nakshatra,
+            "nakshatra_lord": nakshatra_lord,
+            "sub_lord": sub_lord,
+            "sub_sub_lord": sub_sub_lord
+        }
+
+    def get_day_summary(self, name: str, target_date: date) -> Dict[str, Any]:
+        """
+        Return a stored day, computing it live when it is not stored.
+
+        Raises:
+            KeyError: If the city is not in the almanac
+        """
+        summary = self.lookup(name, target_date)
+        if summary is not None:
+            return summary
+        city = self.city(name)
+        if city is None:
+            raise KeyError(name)
+        return compute_day_summary(city[1], city[2], target_date)
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "Almanac":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
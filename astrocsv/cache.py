@@ -0,0 +1,405 @@
+"""
+Result caching helpers: bounded in-memory LRU cache, coordinate quantization
+and pluggable byte-level cache backends that can be shared across processes.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Sequence
+from urllib.parse import urlparse, parse_qs
+
+def quantize_coordinate(value: float, decimals: int = 4) -> float:
+    """
+    Quantize a latitude or longitude for use in a cache key.
+
+    Four decimals is roughly 11 m on the ground, which moves sunrise by
+    well under 0.1 s and the ascendant at sunrise by about 1e-4 degrees.
+
+    Args:
+        value: Coordinate in decimal degrees
+        decimals: Number of decimal places to keep
+
+    Returns:
+        Quantized coordinate
+    """
+    # Adding 0.0 folds -0.0 into 0.0 so both hash to the same key
+    return round(value, decimals) + 0.0
+
+class LRUCache:
+    """
+    Thread-safe bounded cache with least-recently-used eviction.
+
+    Keeps hit, miss and eviction counters for reporting.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return the cached value for key, or default if it is not cached."""
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used entries if full."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache counters and current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries
+            }
+
+class CacheBackend:
+    """
+    Interface for key/value caches of encoded results.
+
+    Keys are strings and values are bytes. Backends must never raise for
+    connectivity or storage problems on get/set; a failing backend behaves
+    like an empty cache so callers fall back to computing.
+    """
+
+    name = "base"
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the stored value for key, or None."""
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes) -> None:
+        """Store value under key."""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, int]:
+        """Return backend counters."""
+        raise NotImplementedError
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process backend built on LRUCache."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 4096):
+        self._cache = LRUCache(max_entries=max_entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: bytes) -> None:
+        self._cache.set(key, value)
+
+    def stats(self) -> Dict[str, int]:
+        return self._cache.stats()
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    File-backed backend shared by every process that opens the same database.
+
+    Entries beyond max_entries are evicted oldest-written first; reads do not
+    update recency so that hits stay write-free across processes.
+    """
+
+    name = "sqlite"
+
+    # Check the entry count every this many writes
+    TRIM_INTERVAL = 256
+
+    def __init__(self, path: str, max_entries: int = 100000):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, stored_at REAL NOT NULL)"
+        )
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            with self._lock:
+                row = self._conn.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            self.errors += 1
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return bytes(row[0])
+
+    def set(self, key: str, value: bytes) -> None:
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, stored_at) VALUES (?, ?, ?)",
+                    (key, sqlite3.Binary(value), time.time())
+                )
+                self._writes += 1
+                if self._writes % self.TRIM_INTERVAL == 0:
+                    self._trim()
+        except sqlite3.Error:
+            self.errors += 1
+
+    def _trim(self) -> None:
+        """Evict the oldest entries above max_entries. Caller holds the lock."""
+        count = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY stored_at LIMIT ?)",
+                (excess,)
+            )
+            self.evictions += excess
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "errors": self.errors,
+            "max_entries": self.max_entries
+        }
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Backend speaking the Redis protocol (RESP) to Redis or a compatible server.
+
+    Only GET and SET are used, so a minimal client is built in instead of
+    depending on redis-py. Connection failures are treated as misses and the
+    connection is retried on the next call.
+    """
+
+    name = "redis"
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 6379,
+        db: int = 0,
+        password: Optional[str] = None,
+        ttl: Optional[int] = None,
+        timeout: float = 0.5,
+        retry_interval: float = 5.0
+    ):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.ttl = ttl
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self._retry_at = 0.0
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _connect(self) -> None:
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._reader = self._sock.makefile("rb")
+        if self.password:
+            self._command("AUTH", self.password)
+        if self.db:
+            self._command("SELECT", str(self.db))
+
+    def _close(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._reader = None
+
+    def _command(self, *args: Any) -> Any:
+        """Send one command and return its decoded reply. Caller holds the lock."""
+        if self._sock is None:
+            self._connect()
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self._sock.sendall(b"".join(parts))
+        return self._read_reply()
+
+    def _read_reply(self) -> Any:
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by cache server")
+        prefix, payload = line[:1], line[1:-2]
+        if prefix == b"+":
+            return payload
+        if prefix == b"-":
+            raise RuntimeError(payload.decode("utf-8", "replace"))
+        if prefix == b":":
+            return int(payload)
+        if prefix == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if prefix == b"*":
+            length = int(payload)
+            if length < 0:
+                return None
+            return [self._read_reply() for _ in range(length)]
+        raise ConnectionError(f"Unexpected reply from cache server: {line!r}")
+
+    def _safe_command(self, *args: Any) -> Any:
+        with self._lock:
+            # After a failure, skip the server for a while instead of paying
+            # the connect timeout on every request
+            if self._sock is None and time.monotonic() < self._retry_at:
+                return None
+            try:
+                return self._command(*args)
+            except (OSError, ConnectionError, RuntimeError, ValueError):
+                self.errors += 1
+                self._close()
+                self._retry_at = time.monotonic() + self.retry_interval
+                return None
+
+    def get(self, key: str) -> Optional[bytes]:
+        value = self._safe_command("GET", key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        if self.ttl:
+            self._safe_command("SET", key, value, "EX", str(self.ttl))
+        else:
+            self._safe_command("SET", key, value)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "errors": self.errors}
+
+def create_cache_backend(url: str) -> CacheBackend:
+    """
+    Create a cache backend from a URL.
+
+    Supported forms:
+        memory://?max_entries=4096
+        sqlite:///path/to/cache.db?max_entries=100000
+        redis://[:password@]host:port/db?ttl=86400
+
+    Args:
+        url: Backend URL
+
+    Returns:
+        CacheBackend instance
+    """
+    parsed = urlparse(url)
+    params = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+    if parsed.scheme == "memory":
+        return MemoryCacheBackend(max_entries=int(params.get("max_entries", 4096)))
+    if parsed.scheme == "sqlite":
+        path = parsed.netloc + parsed.path
+        if not path:
+            raise ValueError("sqlite cache URL needs a path, e.g. sqlite:///tmp/astrocsv-cache.db")
+        return SQLiteCacheBackend(path, max_entries=int(params.get("max_entries", 100000)))
+    if parsed.scheme == "redis":
+        db = parsed.path.lstrip("/")
+        return RedisCacheBackend(
+            host=parsed.hostname or "127.0.0.1",
+            port=parsed.port or 6379,
+            db=int(db) if db else 0,
+            password=parsed.password,
+            ttl=int(params["ttl"]) if "ttl" in params else None
+        )
+    raise ValueError(f"Unsupported cache backend URL: {url}")
+
+class ResultCache:
+    """
+    JSON result cache on top of a CacheBackend, namespaced by engine version.
+
+    Every key is prefixed with the engine version, so entries written by a
+    different astrocsv or Swiss Ephemeris version are never read back and
+    simply age out of the backend after an upgrade.
+    """
+
+    def __init__(self, backend: CacheBackend, engine_version: str):
+        self.backend = backend
+        self.engine_version = engine_version
+
+    def make_key(self, namespace: str, parts: Sequence[Any]) -> str:
+        """Build a backend key from a namespace and key parts."""
+        return ":".join([self.engine_version, namespace, *(repr(part) if isinstance(part, float) else str(part) for part in parts)])
+
+    def get(self, namespace: str, parts: Sequence[Any]) -> Optional[Any]:
+        """Return the cached JSON value, or None."""
+        data = self.backend.get(self.make_key(namespace, parts))
+        if data is None:
+            return None
+        try:
+            return json.loads(data)
+        except ValueError:
+            return None
+
+    def set(self, namespace: str, parts: Sequence[Any], value: Any) -> None:
+        """Store a JSON-serializable value."""
+        self.backend.set(self.make_key(namespace, parts), json.dumps(value, separators=(",", ":")).encode("utf-8"))
+
+    def stats(self) -> Dict[str, int]:
+        """Return the backend's counters."""
+        return self.backend.stats()
+
+# Backend used when ASTROCSV_CACHE_URL is not set
+DEFAULT_CACHE_URL = "memory://"
+
+def result_cache_from_env(engine_version: str) -> ResultCache:
+    """Create a ResultCache for the backend named by ASTROCSV_CACHE_URL."""
+    url = os.environ.get("ASTROCSV_CACHE_URL", DEFAULT_CACHE_URL)
+    return ResultCache(create_cache_backend(url), engine_version)
@@ -0,0 +1,278 @@
+"""
+Natal charts for bulk birth records: ascendant, MC, cusps and planets.
+
+Records (id, birth_time, latitude, longitude and an optional timezone) are
+read with pandas in chunks. Within a chunk, each distinct zone is resolved
+once and the birth times of all its records are parsed in one vectorised
+call; the valid records are then cut, in input order and regardless of
+location, into tasks of TASK_SIZE for a process pool. Each task returns raw
+longitudes only; all of them are then classified in one np.searchsorted
+pass (planets.classify_longitudes) and written in input order before the
+next chunk is read.
+
+Every chart point (asc, mc, cusp_1..cusp_12 and the nine grahas) gets the
+columns of csvout.PLANET_FIELDS. Cusps are Placidus, read by KP lords, and
+positions are taken at the whole birth second like the ascendant column of
+the sunrise CSV. Beyond the polar circles, where Placidus cusps are
+undefined, the cusp columns are left empty and the rest of the chart is
+still written. Invalid records are skipped and reported with their row
+number and reason.
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .csvout import PLANET_FIELDS, PLANET_GRAHAS
+from .cusps import compute_angle_longitudes, compute_cusp_longitudes
+from .dasha import parse_birth_times
+from .ephem import UNIX_EPOCH_JD, setup_swiss_ephemeris
+from .planets import classify_longitudes, get_planet_longitudes
+from .timezones import AUTO_TIMEZONE, DEFAULT_TIMEZONE, get_zone, resolve_timezone_name
+
+CHART_POINTS = ["asc", "mc"] + [f"cusp_{number}" for number in range(1, 13)] + PLANET_GRAHAS
+
+CHART_COLUMNS = ["id", "birth_time", "latitude", "longitude", "timezone"] + [
+    f"{point}_{field}" for point in CHART_POINTS for field in PLANET_FIELDS
+]
+REJECT_COLUMNS = ["row", "id", "reason"]
+
+DEFAULT_CHUNK_SIZE = 20000
+# Records per process pool task, across locations
+TASK_SIZE = 1000
+
+def chart_longitudes(
+    lats: Sequence[float],
+    lons: Sequence[float],
+    birth_seconds: Sequence[int]
+) -> np.ndarray:
+    """
+    Longitudes of every chart point for many records.
+
+    Args:
+        lats: Latitude of each record in decimal degrees
+        lons: Longitude of each record in decimal degrees
+        birth_seconds: Unix time of each record in whole seconds
+
+    Returns:
+        Array of shape (len(birth_seconds), len(CHART_POINTS)); the cusps
+        are NaN where Placidus cusps are undefined
+    """
+    longitudes = np.full((len(birth_seconds), len(CHART_POINTS)), np.nan)
+    for i, (lat, lon, second) in enumerate(zip(lats, lons, birth_seconds)):
+        jd_ut = second / 86400.0 + UNIX_EPOCH_JD
+        try:
+            houses = compute_cusp_longitudes(lat, lon, jd_ut)[0]
+        except ValueError:
+            houses = np.full(2 + 12, np.nan)
+            houses[:2] = compute_angle_longitudes(lat, lon, jd_ut)
+        longitudes[i, :len(houses)] = houses
+        longitudes[i, len(houses):] = get_planet_longitudes(int(second))
+    return longitudes
+
+def _chart_task(task: Tuple[List[float], List[float], List[int]]) -> np.ndarray:
+    return chart_longitudes(*task)
+
+def _prepare_chunk(
+    chunk: pd.DataFrame,
+    default_timezone: Optional[str],
+    first_row: int
+) -> Tuple[Dict[str, np.ndarray], List[Dict[str, Any]]]:
+    """
+    Validate a chunk, resolve zones and parse birth times.
+
+    Zones are resolved once per distinct name and birth times parsed in one
+    call per zone, so the cost does not depend on how many records share a
+    location.
+
+    Returns:
+        (records, rejects): chunk positions, latitude, longitude, whole Unix
+        seconds and zone of the valid records in input order, and a row per
+        rejected record
+    """
+    count = len(chunk)
+    reasons = np.full(count, None, dtype=object)
+    rejected = np.zeros(count, dtype=bool)
+
+    def reject(mask: np.ndarray, reason: str) -> None:
+        mask = mask & ~rejected
+        reasons[mask] = reason
+        rejected[mask] = True
+
+    reject((chunk["id"].fillna("").astype(str).str.strip() == "").to_numpy(), "Missing id")
+    lat = pd.to_numeric(chunk["latitude"], errors="coerce").to_numpy(dtype=float)
+    lon = pd.to_numeric(chunk["longitude"], errors="coerce").to_numpy(dtype=float)
+    with np.errstate(invalid="ignore"):
+        reject(~((lat >= -90) & (lat <= 90)), "Latitude must be a number between -90 and 90")
+        reject(~((lon >= -180) & (lon <= 180)), "Longitude must be a number between -180 and 180")
+
+    default_name = default_timezone or DEFAULT_TIMEZONE
+    if "timezone" in chunk.columns:
+        names = chunk["timezone"].fillna("").astype(str).str.strip().to_numpy(dtype=object)
+        names[names == ""] = default_name
+    else:
+        names = np.full(count, default_name, dtype=object)
+    for position in np.flatnonzero((names == AUTO_TIMEZONE) & ~rejected):
+        try:
+            names[position] = resolve_timezone_name(lat[position], lon[position])
+        except ValueError as e:
+            reasons[position] = str(e)
+            rejected[position] = True
+
+    seconds = np.full(count, np.nan)
+    zones = np.empty(count, dtype=object)
+    births = chunk["birth_time"]
+    for name in pd.unique(names[~rejected]):
+        rows = np.flatnonzero((names == name) & ~rejected)
+        try:
+            zone = get_zone(name)
+        except ValueError as e:
+            reject(names == name, str(e))
+            continue
+        zones[rows] = zone
+        seconds[rows] = parse_birth_times(births.iloc[rows], zone)
+    reject(np.isnan(seconds), "Birth time must be ISO 8601 and exist in its time zone")
+
+    rejects = [
+        {"row": first_row + position, "id": chunk["id"].iat[position], "reason": reasons[position]}
+        for position in np.flatnonzero(rejected)
+    ]
+    positions = np.flatnonzero(~rejected)
+    records = {
+        "positions": positions,
+        "latitude": lat[positions],
+        "longitude": lon[positions],
+        "seconds": np.floor(seconds[positions]),
+        "zones": zones[positions],
+    }
+    return records, rejects
+
+def _chart_frame(
+    chunk: pd.DataFrame,
+    records: Dict[str, np.ndarray],
+    longitudes: np.ndarray
+) -> pd.DataFrame:
+    """Rows of the valid records of a chunk, in input order; NaN longitudes get empty lords."""
+    zones = records["zones"]
+    seconds = records["seconds"]
+    missing = np.isnan(longitudes)
+    classified = []
+    for column in classify_longitudes(np.where(missing, 0.0, longitudes).ravel()):
+        column = column.reshape(longitudes.shape).astype(object)
+        column[missing] = None
+        classified.append(column)
+    columns: Dict[str, Any] = {
+        "id": chunk["id"].to_numpy()[records["positions"]],
+        "birth_time": [datetime.fromtimestamp(float(second), zone).isoformat() for second, zone in zip(seconds, zones)],
+        "latitude": records["latitude"],
+        "longitude": records["longitude"],
+        "timezone": [zone.key for zone in zones],
+    }
+    for index, point in enumerate(CHART_POINTS):
+        columns[f"{point}_deg"] = np.round(longitudes[:, index], 3)
+        for field, column in zip(PLANET_FIELDS[1:], classified):
+            columns[f"{point}_{field}"] = column[:, index]
+    return pd.DataFrame(columns, columns=CHART_COLUMNS)
+
+def write_chart_batch(
+    input_path: str,
+    output_path: str,
+    rejects_path: str,
+    timezone: Optional[str] = None,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ephe_path: Optional[str] = None,
+    progress: Optional[Callable[[int], None]] = None
+) -> Dict[str, Any]:
+    """
+    Compute natal charts for a CSV of birth records.
+
+    The input needs id, birth_time (ISO 8601), latitude and longitude
+    columns; a timezone column overrides the timezone argument per record.
+    Naive birth times are local to the record's zone.
+
+    Args:
+        input_path: CSV of birth records
+        output_path: CSV to write, one row per valid record in input order
+        rejects_path: CSV of skipped records (row, id, reason); rows are
+            numbered from 1 for the first record
+        timezone: Default IANA name, "auto" to resolve from coordinates, or
+            None for IST
+        workers: Processes computing charts; 1 computes in this process
+        chunk_size: Records read, computed and written at a time
+        ephe_path: Swiss Ephemeris data directory for the worker processes
+        progress: Optional callback(records_done) as computation proceeds;
+            raising from it stops the run
+
+    Returns:
+        Record, chart and rejected counts and records per second
+
+    Raises:
+        ValueError: If a required column is missing
+    """
+    started = time.perf_counter()
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=setup_swiss_ephemeris, initargs=(ephe_path, False))
+    records = charts = rejected = 0
+    try:
+        with open(output_path, "w", newline="") as output, open(rejects_path, "w", newline="") as rejects_handle:
+            pd.DataFrame(columns=CHART_COLUMNS).to_csv(output, index=False)
+            pd.DataFrame(columns=REJECT_COLUMNS).to_csv(rejects_handle, index=False)
+            for chunk in pd.read_csv(input_path, chunksize=chunk_size, dtype=str, keep_default_na=False, na_values=[""]):
+                missing = [column for column in ("id", "birth_time", "latitude", "longitude") if column not in chunk.columns]
+                if missing:
+                    raise ValueError(f"Input is missing column(s): {', '.join(missing)}")
+                prepared, rejects = _prepare_chunk(chunk, timezone, records + 1)
+                count = len(prepared["positions"])
+                tasks = [
+                    (
+                        prepared["latitude"][start:start + TASK_SIZE].tolist(),
+                        prepared["longitude"][start:start + TASK_SIZE].tolist(),
+                        prepared["seconds"][start:start + TASK_SIZE].astype(np.int64).tolist()
+                    )
+                    for start in range(0, count, TASK_SIZE)
+                ]
+                mapper = executor.map if executor is not None else map
+                longitudes = np.full((count, len(CHART_POINTS)), np.nan)
+                done = records + len(chunk) - count
+                for index, values in enumerate(mapper(_chart_task, tasks)):
+                    start = index * TASK_SIZE
+                    longitudes[start:start + len(values)] = values
+                    done += len(values)
+                    if progress:
+                        progress(done)
+
+                frame = _chart_frame(chunk, prepared, longitudes)
+                frame.to_csv(output, header=False, index=False)
+                rejects.sort(key=lambda reject: reject["row"])
+                pd.DataFrame(rejects, columns=REJECT_COLUMNS).to_csv(rejects_handle, header=False, index=False)
+                records += len(chunk)
+                charts += len(frame)
+                rejected += len(rejects)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    elapsed = time.perf_counter() - started
+    return {
+        "records": records,
+        "charts": charts,
+        "rejected": rejected,
+        "records_per_second": round(records / elapsed, 1) if elapsed > 0 else None
+    }
+
+def count_records(path: str) -> int:
+    """Number of data lines in a CSV file (an upper bound with quoted newlines)."""
+    lines = 0
+    last = b"\n"
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            lines += block.count(b"\n")
+            last = block[-1:]
+    if last != b"\n":
+        lines += 1
+    return max(lines - 1, 0)
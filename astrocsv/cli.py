@@ -3,17 +3,29 @@ Command line interface for AstroCSV.
 """
 
 import typer
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from typing import Optional
 from pathlib import Path
+from zoneinfo import ZoneInfo
+import os
 import sys
+import time
 
 from .ephem import setup_swiss_ephemeris, get_sunrise_times, get_ascendant_at_time
 from .mapping import get_sign_and_lord, get_nakshatra_and_lord, get_kp_sub_lords
 from .csvout import generate_csv_rows_for_date, write_csv_to_file, write_csv_to_stdout
+from .timezones import DEFAULT_TIMEZONE, get_timezone, get_zone
 
 app = typer.Typer(help="Location-based astro transit CSV generator with KP nakshatra calculations")
 
+# Additional commands (almanac building, batch tools). Run as
+# `astrocsv-tools <command>` or `python -m astrocsv.cli <command>`.
+tools_app = typer.Typer(help="AstroCSV data building and batch tools")
+
+@tools_app.callback()
+def tools():
+    """AstroCSV data building and batch tools."""
+
 def validate_latitude(lat: float) -> float:
     """Validate latitude is between -90 and 90 degrees."""
     if not -90 <= lat <= 90:
@@ -36,21 +48,34 @@ def validate_date(date_str: str) -> date:
 def process_single_date(
     target_date: date,
     lat: float,
-    lon: float
+    lon: float,
+    tz: Optional[ZoneInfo] = None,
+    sunrise_model=None,
+    include_planets: bool = False,
+    sunrise_definition: Optional[str] = None,
+    observer=None
 ) -> list:
     """
     Process a single date and return CSV rows.
     
     Args:
-        target_date: Date to process
+        target_date: Local date to process
         lat: Latitude in decimal degrees
         lon: Longitude in decimal degrees
+        tz: Time zone of the date and sunrise times (default IST)
+        sunrise_model: Optional fitted SunriseModel used instead of the exact engine
+        include_planets: Add the nine grahas at sunrise to the ascendant row
+        sunrise_definition: Optional name from sunrise_definitions.SUNRISE_DEFINITIONS
+        observer: Optional sunrise_definitions.Observer (elevation, pressure)
         
     Returns:
         List of CSV row dictionaries
     """
     # Get sunrise times
-    sunrise_ist, next_sunrise_ist = get_sunrise_times(lat, lon, target_date)
+    if sunrise_model is not None:
+        sunrise_ist, next_sunrise_ist = sunrise_model.sunrise_times(target_date)
+    else:
+        sunrise_ist, next_sunrise_ist = get_sunrise_times(lat, lon, target_date, tz, sunrise_definition, observer)
     
     # Get ascendant at sunrise
     asc_abs_deg = get_ascendant_at_time(lat, lon, sunrise_ist)
@@ -64,23 +89,53 @@ def process_single_date(
     # Get KP sub-lord and sub-sub-lord
     asc_sub_lord, asc_sub_sub_lord = get_kp_sub_lords(asc_abs_deg)
     
+    # Planets at sunrise, shared between locations with the same sunrise second
+    planets = None
+    if include_planets:
+        from .planets import planet_columns
+        planets = planet_columns(sunrise_ist)
+    
     # Generate CSV rows for this date
     rows = generate_csv_rows_for_date(
         target_date, sunrise_ist, next_sunrise_ist, lat, lon,
         asc_abs_deg, asc_sign, asc_sign_lord, asc_nakshatra,
-        asc_nakshatra_lord, asc_sub_lord, asc_sub_sub_lord
+        asc_nakshatra_lord, asc_sub_lord, asc_sub_sub_lord, planets
     )
     
     return rows
 
 @app.command()
 def main(
-    lat: float = typer.Argument(..., help="Latitude in decimal degrees (positive north)"),
-    lon: float = typer.Argument(..., help="Longitude in decimal degrees (positive east)"),
+    lat: Optional[float] = typer.Argument(None, help="Latitude in decimal degrees (positive north)"),
+    lon: Optional[float] = typer.Argument(None, help="Longitude in decimal degrees (positive east)"),
     date_str: Optional[str] = typer.Option(None, "--date", help="Single date in YYYY-MM-DD format"),
     start_date: Optional[str] = typer.Option(None, "--start-date", help="Start date in YYYY-MM-DD format"),
     end_date: Optional[str] = typer.Option(None, "--end-date", help="End date in YYYY-MM-DD format"),
-    outfile: Optional[str] = typer.Option(None, "--outfile", help="Output CSV file path (default: stdout)")
+    outfile: Optional[str] = typer.Option(None, "--outfile", help="Output CSV file path (default: stdout)"),
+    ephe_path: Optional[str] = typer.Option(
+        None, "--ephe-path", help="Swiss Ephemeris data directory (default: $ASTROCSV_EPHE_PATH or bundled files)"
+    ),
+    timezone: Optional[str] = typer.Option(
+        None, "--timezone", help="IANA time zone for dates and times, or 'auto' to resolve from the location (default: Asia/Kolkata, or the city's zone with --city)"
+    ),
+    city: Optional[str] = typer.Option(
+        None, "--city", help="Place name from the gazetteer instead of LAT LON, e.g. 'Pune' or 'Paris, FR'"
+    ),
+    fit_sunrise: bool = typer.Option(
+        False, "--fit-sunrise", help="Evaluate sunrise from a verified Chebyshev fit (for long date ranges)"
+    ),
+    planets: bool = typer.Option(
+        False, "--planets", help="Add Sun through Ketu at sunrise with sign, nakshatra and KP lords"
+    ),
+    sunrise_definition: Optional[str] = typer.Option(
+        None, "--sunrise-definition", help="upper_limb, center, lower_limb, upper_limb_geometric or center_geometric (default: astral's sunrise)"
+    ),
+    elevation: Optional[float] = typer.Option(
+        None, "--elevation", help="Observer elevation above the horizon in metres (lowers the horizon by its dip)"
+    ),
+    pressure: Optional[float] = typer.Option(
+        None, "--pressure", help="Atmospheric pressure in hPa for refraction (default: from elevation)"
+    )
 ):
     """
     Generate astro transit CSV for location and date(s).
@@ -88,7 +143,27 @@ def main(
     Examples:
         astrocsv --date 2025-08-20 --lat 18.5204 --lon 73.8567 --outfile pune_2025-08-20.csv
         astrocsv --start-date 2025-08-20 --end-date 2025-08-22 --lat 18.5204 --lon 73.8567 --outfile pune_aug20-22.csv
+        astrocsv --date 2025-08-20 --city Pune --outfile pune_2025-08-20.csv
     """
+    # Resolve the location
+    if city:
+        if lat is not None or lon is not None:
+            typer.echo("Error: Cannot specify both LAT LON and --city", err=True)
+            raise typer.Exit(1)
+        from .gazetteer import resolve_place
+        try:
+            place = resolve_place(city)
+        except KeyError:
+            typer.echo(f"Error: Unknown city: {city}", err=True)
+            raise typer.Exit(1)
+        lat, lon = place.latitude, place.longitude
+        if timezone is None and place.timezone:
+            timezone = place.timezone
+        typer.echo(f"Using {place.label()} ({lat}, {lon})", err=True)
+    elif lat is None or lon is None:
+        typer.echo("Error: Must specify either LAT LON or --city", err=True)
+        raise typer.Exit(1)
+    
     # Validate inputs
     try:
         lat = validate_latitude(lat)
@@ -129,21 +204,50 @@ def main(
     
     # Setup Swiss Ephemeris
     try:
-        setup_swiss_ephemeris()
+        ephemeris = setup_swiss_ephemeris(ephe_path)
     except Exception as e:
         typer.echo(f"Error setting up Swiss Ephemeris: {e}", err=True)
-        typer.echo("Please ensure ephemeris files are available in ./ephe/ directory", err=True)
+        typer.echo("Please ensure ephemeris files are available (see --ephe-path)", err=True)
+        raise typer.Exit(1)
+    
+    if ephemeris["backend"] == "moshier":
+        typer.echo(
+            f"Warning: no Swiss Ephemeris files found in {ephemeris['path']}, "
+            "using the less precise Moshier ephemeris",
+            err=True
+        )
+    
+    try:
+        tz = get_timezone(timezone, lat, lon)
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
         raise typer.Exit(1)
     
+    observer = None
+    if sunrise_definition is not None or elevation is not None or pressure is not None:
+        from .sunrise_definitions import SUNRISE_DEFINITIONS, Observer
+        if fit_sunrise:
+            typer.echo("Error: --fit-sunrise models astral's sunrise; it cannot be combined with --sunrise-definition, --elevation or --pressure", err=True)
+            raise typer.Exit(1)
+        if sunrise_definition is not None and sunrise_definition not in SUNRISE_DEFINITIONS:
+            typer.echo(f"Error: --sunrise-definition must be one of {', '.join(SUNRISE_DEFINITIONS)}", err=True)
+            raise typer.Exit(1)
+        observer = Observer(elevation=elevation or 0.0, pressure=pressure)
+    
+    sunrise_model = None
+    if fit_sunrise:
+        from .sunrise_model import SunriseModel
+        sunrise_model = SunriseModel.fit(lat, lon, start_date_obj, end_date_obj, tz)
+    
     # Process dates
     all_rows = []
     current_date = start_date_obj
     
     while current_date <= end_date_obj:
         try:
-            rows = process_single_date(current_date, lat, lon)
+            rows = process_single_date(current_date, lat, lon, tz, sunrise_model, planets, sunrise_definition, observer)
             all_rows.extend(rows)
-            current_date = current_date.replace(day=current_date.day + 1)
+            current_date += timedelta(days=1)
         except Exception as e:
             typer.echo(f"Error processing date {current_date}: {e}", err=True)
             raise typer.Exit(1)
@@ -151,7 +255,7 @@ def main(
     # Output results
     if outfile:
         try:
-            write_csv_to_file(all_rows, outfile)
+            write_csv_to_file(all_rows, outfile, include_planets=planets)
             typer.echo(f"CSV written to {outfile}")
             typer.echo(f"Total rows: {len(all_rows)}")
         except Exception as e:
@@ -159,7 +263,485 @@ def main(
             raise typer.Exit(1)
     else:
         # Write to stdout
-        write_csv_to_stdout(all_rows)
+        write_csv_to_stdout(all_rows, include_planets=planets)
+
+@tools_app.command("build-almanac")
+def build_almanac_command(
+    cities_file: str = typer.Argument(..., help="Tab-separated file with name, latitude, longitude per line"),
+    outfile: str = typer.Option(..., "--outfile", help="Almanac file to write"),
+    start_date: str = typer.Option(..., "--start-date", help="First date in YYYY-MM-DD format"),
+    years: int = typer.Option(3, "--years", help="Number of years to precompute"),
+    workers: int = typer.Option(1, "--workers", help="Processes computing cities in parallel"),
+    ephe_path: Optional[str] = typer.Option(None, "--ephe-path", help="Swiss Ephemeris data directory")
+):
+    """
+    Precompute sunrise, ascendant and lords per city per day into an almanac file.
+    
+    Example:
+        astrocsv-tools build-almanac cities.tsv --start-date 2025-01-01 --years 3 --outfile cities.almanac
+    """
+    from .almanac import build_almanac, read_cities_file
+    
+    first_date = validate_date(start_date)
+    days = (first_date.replace(year=first_date.year + years) - first_date).days
+    cities = read_cities_file(cities_file)
+    if not cities:
+        typer.echo(f"Error: no cities found in {cities_file}", err=True)
+        raise typer.Exit(1)
+    
+    setup_swiss_ephemeris(ephe_path)
+    size = build_almanac(
+        cities, first_date, days, outfile, workers=workers,
+        progress=lambda done, total: typer.echo(f"{done}/{total} cities", err=True)
+    )
+    typer.echo(f"Almanac written to {outfile}: {len(cities)} cities x {days} days, {size} bytes")
+
+@tools_app.command("build-gazetteer")
+def build_gazetteer_command(
+    geonames_file: str = typer.Argument(..., help="GeoNames dump such as cities15000.txt (optionally gzipped)"),
+    outfile: str = typer.Option(..., "--outfile", help="Gazetteer file to write (gzipped when ending in .gz)"),
+    min_population: int = typer.Option(15000, "--min-population", help="Drop places with a smaller population"),
+    admin1_codes: Optional[str] = typer.Option(
+        None, "--admin1-codes", help="GeoNames admin1CodesASCII.txt (default: next to the dump)"
+    )
+):
+    """
+    Convert a GeoNames dump into a gazetteer file for $ASTROCSV_GAZETTEER.
+
+    Example:
+        astrocsv-tools build-gazetteer cities15000.txt --outfile places.tsv.gz
+    """
+    from .gazetteer import build_gazetteer
+
+    try:
+        count = build_gazetteer(
+            geonames_file, outfile, min_population=min_population, admin1_codes_path=admin1_codes
+        )
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+    typer.echo(f"Gazetteer written to {outfile}: {count} places")
+
+@tools_app.command("places")
+def places_command(
+    query: str = typer.Argument(..., help="Name prefix to search for"),
+    limit: int = typer.Option(10, "--limit", help="Maximum number of results"),
+    country: Optional[str] = typer.Option(None, "--country", help="Restrict to an ISO country code")
+):
+    """
+    Search the gazetteer by name prefix.
+
+    Example:
+        astrocsv-tools places ban --country IN
+    """
+    from .gazetteer import search_places
+
+    for place in search_places(query, limit=limit, country=country):
+        typer.echo(f"{place.label()}\t{place.latitude}\t{place.longitude}\t{place.timezone}")
+
+@tools_app.command("grid")
+def grid_command(
+    bbox: str = typer.Option("6,68,37,98", "--bbox", help="south,west,north,east in decimal degrees (default: India)"),
+    resolution: float = typer.Option(0.1, "--resolution", help="Cell size in degrees"),
+    start_date: str = typer.Option(..., "--start-date", help="First date in YYYY-MM-DD format"),
+    end_date: Optional[str] = typer.Option(None, "--end-date", help="Last date in YYYY-MM-DD format (default: start date)"),
+    outfile: str = typer.Option(..., "--outfile", help="NumPy .npz archive to write"),
+    raster_dir: Optional[str] = typer.Option(None, "--raster-dir", help="Also write ESRI ASCII rasters per date here"),
+    timezone: Optional[str] = typer.Option(None, "--timezone", help="IANA time zone defining the dates (default: Asia/Kolkata)"),
+    verify: int = typer.Option(0, "--verify", help="Check this many random cells against the per-location calculation"),
+    ephe_path: Optional[str] = typer.Option(None, "--ephe-path", help="Swiss Ephemeris data directory")
+):
+    """
+    Compute sunrise and sunrise ascendant fields over a lat/lon grid.
+    
+    Example:
+        astrocsv-tools grid --start-date 2025-08-20 --resolution 0.1 --outfile india_2025-08-20.npz
+    """
+    from .grid import compute_grid, verify_grid, write_grid_npz, write_grid_rasters
+    
+    try:
+        south, west, north, east = (float(value) for value in bbox.split(","))
+    except ValueError:
+        raise typer.BadParameter("--bbox must be four comma-separated numbers")
+    first_date = validate_date(start_date)
+    last_date = validate_date(end_date) if end_date else first_date
+    if first_date > last_date:
+        typer.echo("Error: Start date must be before or equal to end date", err=True)
+        raise typer.Exit(1)
+    dates = [first_date + timedelta(days=offset) for offset in range((last_date - first_date).days + 1)]
+    
+    setup_swiss_ephemeris(ephe_path)
+    try:
+        tz = get_timezone(timezone, (south + north) / 2, (west + east) / 2)
+        result = compute_grid((south, west, north, east), resolution, dates, tz)
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+    
+    write_grid_npz(result, outfile)
+    typer.echo(
+        f"Grid written to {outfile}: {len(result['latitude'])} x {len(result['longitude'])} cells x {len(dates)} days, "
+        f"{result['cells_per_second']:,.0f} cells/s"
+    )
+    if raster_dir:
+        paths = write_grid_rasters(result, raster_dir)
+        typer.echo(f"{len(paths)} raster files written to {raster_dir}")
+    if verify:
+        typer.echo(f"Verification: {verify_grid(result, samples=verify)}")
+
+@tools_app.command("sunrises")
+def sunrises_command(
+    lat: float = typer.Argument(..., help="Latitude in decimal degrees (positive north)"),
+    lon: float = typer.Argument(..., help="Longitude in decimal degrees (positive east)"),
+    start_date: str = typer.Option(..., "--start-date", help="First date in YYYY-MM-DD format"),
+    end_date: str = typer.Option(..., "--end-date", help="Last date in YYYY-MM-DD format"),
+    outfile: str = typer.Option(..., "--outfile", help="CSV file to write"),
+    timezone: Optional[str] = typer.Option(None, "--timezone", help="IANA time zone, or 'auto' (default: Asia/Kolkata)"),
+    max_error: float = typer.Option(0.01, "--max-error", help="Verified fit error bound in seconds"),
+    verify: bool = typer.Option(False, "--verify", help="Check every date against the exact engine"),
+    ephe_path: Optional[str] = typer.Option(None, "--ephe-path", help="Swiss Ephemeris data directory")
+):
+    """
+    Write sunrise and next sunrise for a long date range from a fitted model.
+    
+    Example:
+        astrocsv-tools sunrises 18.5204 73.8567 --start-date 2025-01-01 --end-date 2034-12-31 --outfile pune_sunrises.csv
+    """
+    import csv
+    from .sunrise_model import SunriseModel
+    
+    lat, lon = validate_latitude(lat), validate_longitude(lon)
+    first_date, last_date = validate_date(start_date), validate_date(end_date)
+    if first_date > last_date:
+        typer.echo("Error: Start date must be before or equal to end date", err=True)
+        raise typer.Exit(1)
+    setup_swiss_ephemeris(ephe_path)
+    try:
+        tz = get_timezone(timezone, lat, lon)
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+    
+    model = SunriseModel.fit(lat, lon, first_date, last_date, tz, max_error=max_error)
+    first, last = first_date.toordinal(), last_date.toordinal()
+    times = model.timestamps(list(range(first, last + 2)))
+    with open(outfile, "w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["date", "sunrise", "next_sunrise"])
+        for offset in range(last - first + 1):
+            sunrise, next_sunrise = times[offset], times[offset + 1]
+            writer.writerow([
+                date.fromordinal(first + offset).isoformat(),
+                "" if sunrise != sunrise else datetime.fromtimestamp(sunrise, tz).isoformat(),
+                "" if next_sunrise != next_sunrise else datetime.fromtimestamp(next_sunrise, tz).isoformat()
+            ])
+    typer.echo(f"Sunrises written to {outfile}: {model.stats()}")
+    if verify:
+        typer.echo(f"Verification: {model.verify()}")
+
+@tools_app.command("sunrise-variants")
+def sunrise_variants_command(
+    lat: float = typer.Argument(..., help="Latitude in decimal degrees (positive north)"),
+    lon: float = typer.Argument(..., help="Longitude in decimal degrees (positive east)"),
+    start_date: str = typer.Option(..., "--start-date", help="First date in YYYY-MM-DD format"),
+    end_date: Optional[str] = typer.Option(None, "--end-date", help="Last date in YYYY-MM-DD format (default: start date)"),
+    outfile: str = typer.Option(..., "--outfile", help="CSV file to write"),
+    definitions: str = typer.Option(
+        "upper_limb,center,center_geometric", "--definitions", help="Comma-separated sunrise definitions"
+    ),
+    elevation: float = typer.Option(0.0, "--elevation", help="Observer elevation above the horizon in metres"),
+    pressure: Optional[float] = typer.Option(None, "--pressure", help="Atmospheric pressure in hPa (default: from elevation)"),
+    temperature: float = typer.Option(15.0, "--temperature", help="Air temperature in degrees Celsius"),
+    timezone: Optional[str] = typer.Option(None, "--timezone", help="IANA time zone, or 'auto' (default: Asia/Kolkata)"),
+    ephe_path: Optional[str] = typer.Option(None, "--ephe-path", help="Swiss Ephemeris data directory")
+):
+    """
+    Write sunrise under several definitions side by side, computed in one pass.
+    
+    Example:
+        astrocsv-tools sunrise-variants 32.2432 77.1892 --start-date 2025-01-01 --end-date 2025-01-31 --elevation 2050 --outfile manali.csv
+    """
+    import csv
+    from .sunrise_definitions import Observer, compute_rise_times
+    
+    lat, lon = validate_latitude(lat), validate_longitude(lon)
+    first_date = validate_date(start_date)
+    last_date = validate_date(end_date) if end_date else first_date
+    if first_date > last_date:
+        typer.echo("Error: Start date must be before or equal to end date", err=True)
+        raise typer.Exit(1)
+    setup_swiss_ephemeris(ephe_path)
+    names = [name.strip() for name in definitions.split(",") if name.strip()]
+    dates = [first_date + timedelta(days=offset) for offset in range((last_date - first_date).days + 1)]
+    try:
+        tz = get_timezone(timezone, lat, lon)
+        times = compute_rise_times(lat, lon, dates, tz, names, Observer(elevation, pressure, temperature))
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+    
+    with open(outfile, "w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["date"] + names)
+        for index, current_date in enumerate(dates):
+            writer.writerow([current_date.isoformat()] + [
+                "" if times[name][index] != times[name][index] else datetime.fromtimestamp(times[name][index], tz).isoformat()
+                for name in names
+            ])
+    typer.echo(f"Sunrise variants written to {outfile}: {len(dates)} days x {len(names)} definitions")
+
+@tools_app.command("panchang")
+def panchang_command(
+    lat: float = typer.Argument(..., help="Latitude in decimal degrees (positive north)"),
+    lon: float = typer.Argument(..., help="Longitude in decimal degrees (positive east)"),
+    start_date: str = typer.Option(..., "--start-date", help="First date in YYYY-MM-DD format"),
+    end_date: Optional[str] = typer.Option(None, "--end-date", help="Last date in YYYY-MM-DD format (default: start date)"),
+    outfile: str = typer.Option(..., "--outfile", help="CSV file to write"),
+    timezone: Optional[str] = typer.Option(None, "--timezone", help="IANA time zone, or 'auto' (default: Asia/Kolkata)"),
+    fit_sunrise: bool = typer.Option(False, "--fit-sunrise", help="Evaluate sunrise from a verified Chebyshev fit"),
+    ayanamsa: str = typer.Option("lahiri", "--ayanamsa", help="Ayanamsa for nakshatra and yoga: lahiri, raman, krishnamurti, fagan_bradley, yukteshwar or true_chitra"),
+    ephe_path: Optional[str] = typer.Option(None, "--ephe-path", help="Swiss Ephemeris data directory")
+):
+    """
+    Write tithi, nakshatra, yoga, karana and vara at sunrise with their end times.
+
+    Nakshatra and yoga are sidereal (Lahiri unless --ayanamsa is given).
+
+    Example:
+        astrocsv-tools panchang 18.5204 73.8567 --start-date 2025-01-01 --end-date 2025-12-31 --outfile pune_panchang.csv
+    """
+    import csv
+    from .panchang import PANCHANG_COLUMNS, panchang_for_dates
+
+    lat, lon = validate_latitude(lat), validate_longitude(lon)
+    first_date = validate_date(start_date)
+    last_date = validate_date(end_date) if end_date else first_date
+    if first_date > last_date:
+        typer.echo("Error: Start date must be before or equal to end date", err=True)
+        raise typer.Exit(1)
+    setup_swiss_ephemeris(ephe_path)
+    try:
+        tz = get_timezone(timezone, lat, lon)
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+
+    sunrise_model = None
+    if fit_sunrise:
+        from .sunrise_model import SunriseModel
+        sunrise_model = SunriseModel.fit(lat, lon, first_date, last_date, tz)
+    dates = [first_date + timedelta(days=offset) for offset in range((last_date - first_date).days + 1)]
+    try:
+        rows = panchang_for_dates(lat, lon, dates, tz, sunrise_model, ayanamsa)
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+    with open(outfile, "w", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=PANCHANG_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    typer.echo(f"Panchang written to {outfile}: {len(rows)} days")
+
+@tools_app.command("cusps")
+def cusps_command(
+    lat: float = typer.Argument(..., help="Latitude in decimal degrees (positive north)"),
+    lon: float = typer.Argument(..., help="Longitude in decimal degrees (positive east)"),
+    outfile: str = typer.Option(..., "--outfile", help="CSV file to write"),
+    start_date: Optional[str] = typer.Option(None, "--start-date", help="First date in YYYY-MM-DD format (cusps at sunrise)"),
+    end_date: Optional[str] = typer.Option(None, "--end-date", help="Last date in YYYY-MM-DD format (default: start date)"),
+    at: Optional[str] = typer.Option(None, "--at", help="Single instant in ISO format instead of sunrise, e.g. 2025-08-20T14:30:00"),
+    timezone: Optional[str] = typer.Option(None, "--timezone", help="IANA time zone, or 'auto' (default: Asia/Kolkata)"),
+    ephe_path: Optional[str] = typer.Option(None, "--ephe-path", help="Swiss Ephemeris data directory")
+):
+    """
+    Write ASC, MC and the 12 cusps (Placidus, KP, Whole Sign) with KP lords.
+
+    Example:
+        astrocsv-tools cusps 18.5204 73.8567 --start-date 2025-08-20 --outfile pune_cusps.csv
+    """
+    import csv
+    from .cusps import CUSP_COLUMNS, cusp_tables, cusp_tables_at_sunrise
+
+    lat, lon = validate_latitude(lat), validate_longitude(lon)
+    if bool(at) == bool(start_date):
+        typer.echo("Error: Must specify either --start-date or --at", err=True)
+        raise typer.Exit(1)
+    setup_swiss_ephemeris(ephe_path)
+    try:
+        tz = get_timezone(timezone, lat, lon)
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+
+    try:
+        if at:
+            instant = datetime.fromisoformat(at)
+            rows = cusp_tables(lat, lon, [instant if instant.tzinfo else instant.replace(tzinfo=tz)])
+        else:
+            first_date = validate_date(start_date)
+            last_date = validate_date(end_date) if end_date else first_date
+            if first_date > last_date:
+                typer.echo("Error: Start date must be before or equal to end date", err=True)
+                raise typer.Exit(1)
+            dates = [first_date + timedelta(days=offset) for offset in range((last_date - first_date).days + 1)]
+            rows = cusp_tables_at_sunrise(lat, lon, dates, tz)
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+    with open(outfile, "w", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=CUSP_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    typer.echo(f"Cusp table written to {outfile}: {len(rows)} rows")
+
+@tools_app.command("ingress")
+def ingress_command(
+    start_date: str = typer.Option(..., "--start-date", help="First date in YYYY-MM-DD format"),
+    end_date: str = typer.Option(..., "--end-date", help="Last date in YYYY-MM-DD format (inclusive)"),
+    outfile: str = typer.Option(..., "--outfile", help="CSV file to write, or .parquet (requires pyarrow)"),
+    planets: Optional[str] = typer.Option(None, "--planets", help="Comma-separated grahas (default: all nine)"),
+    level: str = typer.Option("sub_sub", "--level", help="Finest change to report: sign, nakshatra, sub or sub_sub"),
+    timezone: Optional[str] = typer.Option(None, "--timezone", help="IANA time zone for dates and output times (default: Asia/Kolkata)"),
+    ephe_path: Optional[str] = typer.Option(None, "--ephe-path", help="Swiss Ephemeris data directory")
+):
+    """
+    Write every sign, nakshatra, sub and sub-sub lord change of the planets in a date range.
+
+    Example:
+        astrocsv-tools ingress --start-date 2025-01-01 --end-date 2029-12-31 --planets sun,mars --outfile ingress.csv
+    """
+    from .ingress import ingress_events, write_events_csv, write_events_parquet
+
+    first_date, last_date = validate_date(start_date), validate_date(end_date)
+    if first_date > last_date:
+        typer.echo("Error: Start date must be before or equal to end date", err=True)
+        raise typer.Exit(1)
+    try:
+        tz = get_zone(timezone or DEFAULT_TIMEZONE)
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+
+    setup_swiss_ephemeris(ephe_path)
+    start = datetime.combine(first_date, datetime.min.time(), tzinfo=tz)
+    end = datetime.combine(last_date + timedelta(days=1), datetime.min.time(), tzinfo=tz)
+    selected = [name.strip().lower() for name in planets.split(",")] if planets else None
+    try:
+        events = ingress_events(start, end, selected, level)
+        if outfile.endswith(".parquet"):
+            count = write_events_parquet(events, outfile, tz)
+        else:
+            with open(outfile, "w", newline="") as handle:
+                count = write_events_csv(events, handle, tz)
+    except (ValueError, RuntimeError) as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+    typer.echo(f"{count} events written to {outfile}")
+
+@tools_app.command("dasha")
+def dasha_command(
+    infile: str = typer.Argument(..., help="CSV of birth records with id and birth_time columns"),
+    outfile: str = typer.Option(..., "--outfile", help="CSV file to write"),
+    level: str = typer.Option("antar", "--level", help="Finest period to report: maha, antar or pratyantar"),
+    timezone: Optional[str] = typer.Option(None, "--timezone", help="IANA time zone of naive birth times and output times (default: Asia/Kolkata)"),
+    id_column: str = typer.Option("id", "--id-column", help="Record identifier column"),
+    birth_column: str = typer.Option("birth_time", "--birth-column", help="ISO 8601 birth time column"),
+    with_time: bool = typer.Option(False, "--with-time", help="Write start and end to the minute instead of dates"),
+    chunk_size: int = typer.Option(10000, "--chunk-size", help="Records read and written per chunk"),
+    ayanamsa: str = typer.Option("lahiri", "--ayanamsa", help="Ayanamsa of the sidereal Moon: lahiri, raman, krishnamurti, fagan_bradley, yukteshwar or true_chitra"),
+    ephe_path: Optional[str] = typer.Option(None, "--ephe-path", help="Swiss Ephemeris data directory")
+):
+    """
+    Write Vimshottari maha, antar and pratyantar dasha periods for a CSV of birth records.
+
+    A moon_longitude column, if present, is used instead of computing the Moon
+    and must hold sidereal longitudes in the --ayanamsa zodiac.
+
+    Example:
+        astrocsv-tools dasha births.csv --level pratyantar --outfile dashas.csv
+    """
+    from .dasha import stream_dasha_csv
+
+    try:
+        tz = get_zone(timezone or DEFAULT_TIMEZONE)
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+    if chunk_size < 1:
+        typer.echo("Error: Chunk size must be positive", err=True)
+        raise typer.Exit(1)
+
+    setup_swiss_ephemeris(ephe_path)
+    try:
+        stats = stream_dasha_csv(
+            infile, outfile, level, tz, id_column=id_column, birth_column=birth_column,
+            chunk_size=chunk_size, unit="m" if with_time else "D", ayanamsa=ayanamsa
+        )
+    except (OSError, ValueError) as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+    typer.echo(
+        f"{stats['periods']} periods for {stats['records']} records written to {outfile}"
+        f" ({stats['skipped']} skipped, {stats['records_per_second']} records/s)"
+    )
+
+@tools_app.command("chart-batch")
+def chart_batch_command(
+    infile: str = typer.Argument(..., help="CSV of birth records with id, birth_time, latitude and longitude columns"),
+    outfile: str = typer.Option(..., "--outfile", help="CSV file to write, one chart per record in input order"),
+    rejects: Optional[str] = typer.Option(None, "--rejects", help="CSV of skipped records and reasons (default: <outfile>.rejects.csv)"),
+    timezone: Optional[str] = typer.Option(None, "--timezone", help="IANA time zone or 'auto' for naive birth times without a timezone column (default: Asia/Kolkata)"),
+    workers: int = typer.Option(os.cpu_count() or 1, "--workers", help="Processes computing charts"),
+    chunk_size: int = typer.Option(20000, "--chunk-size", help="Records read and written per chunk"),
+    ephe_path: Optional[str] = typer.Option(None, "--ephe-path", help="Swiss Ephemeris data directory")
+):
+    """
+    Write ascendant, MC, Placidus cusps and planets with KP lords for a CSV of birth records.
+
+    Example:
+        astrocsv-tools chart-batch births.csv --timezone auto --outfile charts.csv
+    """
+    from .chart_batch import count_records, write_chart_batch
+
+    if workers < 1 or chunk_size < 1:
+        typer.echo("Error: Workers and chunk size must be positive", err=True)
+        raise typer.Exit(1)
+    if timezone and timezone != "auto":
+        try:
+            get_zone(timezone)
+        except ValueError as e:
+            typer.echo(f"Error: {e}", err=True)
+            raise typer.Exit(1)
+    rejects = rejects or f"{os.path.splitext(outfile)[0]}.rejects.csv"
+
+    setup_swiss_ephemeris(ephe_path)
+    last_report = [0.0]
+
+    def report(done: int) -> None:
+        # At most one progress line per second
+        now = time.monotonic()
+        if now - last_report[0] >= 1.0 or done == total:
+            typer.echo(f"{done}/{total} records", err=True)
+            last_report[0] = now
+
+    try:
+        total = count_records(infile)
+        stats = write_chart_batch(
+            infile, outfile, rejects, timezone=timezone, workers=workers, chunk_size=chunk_size,
+            ephe_path=ephe_path, progress=report
+        )
+    except (OSError, ValueError) as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+    typer.echo(
+        f"{stats['charts']} charts written to {outfile}, {stats['rejected']} records skipped"
+        f" (see {rejects}), {stats['records_per_second']} records/s"
+    )
+
+TOOL_COMMANDS = {command.name for command in tools_app.registered_commands}
 
 if __name__ == "__main__":
-    app()
+    if len(sys.argv) > 1 and sys.argv[1] in TOOL_COMMANDS:
+        tools_app()
+    else:
+        app()
@@ -0,0 +1,219 @@
+"""
+Spatial clustering of nearby locations for multi-location runs.
+
+Locations within a radius of a cluster representative share the
+representative's sunrise work. For each day, sunrise and next sunrise are
+computed exactly at the representative and at four points around it
+(+/- the cluster extent in latitude and longitude), which gives the
+gradient and curvature of both times. Each member's times are then
+interpolated linearly; the curvature terms estimate the interpolation
+error, and a member is computed exactly when that estimate exceeds the
+error bound.
+
+The ascendant is not interpolated. get_ascendant_at_time evaluates at the
+whole sunrise second, and one second moves the ascendant by about 0.004
+degrees, more than the three decimals reported for asc_abs_deg. Instead each
+member's ascendant is evaluated exactly (a single houses call, cheap next to
+a sunrise search) at its interpolated sunrise second, so its sign,
+nakshatra, sub and sub-sub lords are exact for that second. The one
+categorical quantity that depends on interpolation is therefore the sunrise
+second itself: when an interpolated sunrise lies within the error bound of
+a whole second, the member is recomputed exactly.
+
+Clusters smaller than MIN_INTERPOLATED_CLUSTER are computed exactly, since
+the four extra samples would cost more than they save.
+"""
+
+import math
+from datetime import date, datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+from .ephem import IST, get_sunrise_times, get_ascendant_at_time, _compute_sunrise_times
+
+KM_PER_DEGREE = 111.32
+
+DEFAULT_CLUSTER_RADIUS_KM = 5.0
+
+# Interpolated sunrise times further than this from the estimated exact
+# value (or from a whole-second boundary) are recomputed exactly
+DEFAULT_MAX_SUNRISE_ERROR_SECONDS = 0.01
+
+# Clusters with fewer members are computed exactly
+MIN_INTERPOLATED_CLUSTER = 6
+
+# Smallest sampling offset in degrees (~10 m)
+MIN_SAMPLE_STEP = 1e-4
+
+DayResult = Tuple[datetime, datetime, float]
+
+def cluster_locations(
+    locations: Sequence[Tuple[float, float]],
+    radius_km: float,
+    groups: Optional[Sequence[str]] = None
+) -> List[List[int]]:
+    """
+    Group locations greedily around representatives.
+
+    Each location joins the first representative within radius_km (and with
+    the same group key, e.g. time zone) or becomes a new representative.
+
+    Args:
+        locations: (latitude, longitude) per location
+        radius_km: Maximum distance of a member from its representative
+        groups: Optional key per location; only equal keys share a cluster
+
+    Returns:
+        Clusters as lists of location indices, representative first
+    """
+    cell = max(radius_km / KM_PER_DEGREE, MIN_SAMPLE_STEP)
+    clusters: List[List[int]] = []
+    buckets: Dict[Tuple[object, int, int], List[int]] = {}
+
+    for index, (lat, lon) in enumerate(locations):
+        group = groups[index] if groups is not None else None
+        row, col = math.floor(lat / cell), math.floor(lon / cell)
+        lon_reach = min(int(math.ceil(1.0 / max(math.cos(math.radians(lat)), 1e-6))), 360)
+        found = None
+        for d_row in (-1, 0, 1):
+            for d_col in range(-lon_reach, lon_reach + 1):
+                for cluster_id in buckets.get((group, row + d_row, col + d_col), ()):
+                    rep_lat, rep_lon = locations[clusters[cluster_id][0]]
+                    if _distance_km(lat, lon, rep_lat, rep_lon) <= radius_km:
+                        found = cluster_id
+                        break
+                if found is not None:
+                    break
+            if found is not None:
+                break
+        if found is None:
+            buckets.setdefault((group, row, col), []).append(len(clusters))
+            clusters.append([index])
+        else:
+            clusters[found].append(index)
+    return clusters
+
+def _distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Equirectangular distance, accurate at cluster scales."""
+    x = (lon2 - lon1) * math.cos(math.radians((lat1 + lat2) / 2))
+    return math.hypot(x, lat2 - lat1) * KM_PER_DEGREE
+
+class LocationClusters:
+    """
+    Clustered sunrise and ascendant calculation for many locations.
+
+    Args:
+        locations: (latitude, longitude) per location
+        radius_km: Cluster radius
+        zones: Time zone per location (default IST for all); locations in
+            different zones are never clustered together
+        max_sunrise_error: Error bound for interpolated sunrise times in seconds
+    """
+
+    def __init__(
+        self,
+        locations: Sequence[Tuple[float, float]],
+        radius_km: float = DEFAULT_CLUSTER_RADIUS_KM,
+        zones: Optional[Sequence[ZoneInfo]] = None,
+        max_sunrise_error: float = DEFAULT_MAX_SUNRISE_ERROR_SECONDS
+    ):
+        self.locations = [(float(lat), float(lon)) for lat, lon in locations]
+        self.zones = list(zones) if zones is not None else [IST] * len(self.locations)
+        self.max_sunrise_error = max_sunrise_error
+        self.clusters = cluster_locations(self.locations, radius_km, [zone.key for zone in self.zones])
+        self.cluster_of = [0] * len(self.locations)
+        for cluster_id, members in enumerate(self.clusters):
+            for index in members:
+                self.cluster_of[index] = cluster_id
+        self.exact = 0
+        self.interpolated = 0
+        self.recomputed = 0
+
+    def _exact(self, index: int, target_date: date) -> DayResult:
+        lat, lon = self.locations[index]
+        sunrise, next_sunrise = get_sunrise_times(lat, lon, target_date, self.zones[index])
+        self.exact += 1
+        return sunrise, next_sunrise, get_ascendant_at_time(lat, lon, sunrise)
+
+    def compute_day(self, cluster_id: int, target_date: date) -> Dict[int, DayResult]:
+        """
+        Compute (sunrise, next sunrise, ascendant) for every member of a cluster.
+
+        Returns:
+            Location index -> result
+        """
+        members = self.clusters[cluster_id]
+        rep = members[0]
+        results = {rep: self._exact(rep, target_date)}
+        if len(members) < MIN_INTERPOLATED_CLUSTER:
+            for index in members[1:]:
+                results[index] = self._exact(index, target_date)
+            return results
+
+        tz = self.zones[rep]
+        rep_lat, rep_lon = self.locations[rep]
+        step_lat = max(max(abs(self.locations[i][0] - rep_lat) for i in members), MIN_SAMPLE_STEP)
+        step_lon = max(max(abs(self.locations[i][1] - rep_lon) for i in members), MIN_SAMPLE_STEP)
+        base = (results[rep][0].timestamp(), results[rep][1].timestamp())
+        try:
+            samples = [
+                tuple(value.timestamp() for value in _compute_sunrise_times(lat, lon, target_date, tz))
+                for lat, lon in (
+                    (rep_lat + step_lat, rep_lon), (rep_lat - step_lat, rep_lon),
+                    (rep_lat, rep_lon + step_lon), (rep_lat, rep_lon - step_lon)
+                )
+            ]
+        except Exception:
+            # No sunrise at some sample point (polar day or night)
+            for index in members[1:]:
+                results[index] = self._exact(index, target_date)
+            return results
+
+        # Central differences per time (sunrise, next sunrise)
+        terms = []
+        for k in range(2):
+            north, south, east, west = (sample[k] for sample in samples)
+            terms.append((
+                (north - south) / (2 * step_lat), (east - west) / (2 * step_lon),
+                (north - 2 * base[k] + south) / step_lat ** 2, (east - 2 * base[k] + west) / step_lon ** 2
+            ))
+
+        for index in members[1:]:
+            lat, lon = self.locations[index]
+            d_lat, d_lon = lat - rep_lat, lon - rep_lon
+            estimates = []
+            for k in range(2):
+                grad_lat, grad_lon, curv_lat, curv_lon = terms[k]
+                value = base[k] + grad_lat * d_lat + grad_lon * d_lon
+                # Leading error term of the linear estimate, doubled for the
+                # unsampled cross term
+                error = abs(curv_lat) * d_lat ** 2 + abs(curv_lon) * d_lon ** 2
+                estimates.append((value, error))
+
+            (sunrise_ts, sunrise_error), (next_ts, next_error) = estimates
+            fraction = sunrise_ts - math.floor(sunrise_ts)
+            margin = sunrise_error + self.max_sunrise_error
+            if (
+                max(sunrise_error, next_error) > self.max_sunrise_error
+                or fraction < margin or fraction > 1.0 - margin
+            ):
+                self.recomputed += 1
+                results[index] = self._exact(index, target_date)
+                continue
+
+            sunrise = datetime.fromtimestamp(sunrise_ts, tz)
+            results[index] = (
+                sunrise, datetime.fromtimestamp(next_ts, tz), get_ascendant_at_time(lat, lon, sunrise)
+            )
+            self.interpolated += 1
+        return results
+
+    def stats(self) -> Dict[str, int]:
+        """Return cluster and evaluation counters."""
+        return {
+            "locations": len(self.locations),
+            "clusters": len(self.clusters),
+            "exact": self.exact,
+            "interpolated": self.interpolated,
+            "recomputed": self.recomputed
+        }
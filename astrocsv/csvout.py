@@ -4,7 +4,7 @@ CSV output generation with schema enforcement and proper ordering.
 
 import pandas as pd
 from datetime import datetime, date
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, TextIO
 from .mapping import generate_degree_buckets
 
 # CSV column order as specified in requirements
@@ -27,6 +27,16 @@ CSV_COLUMNS = [
     "bucket_sign_lord"
 ]
 
+# Optional column group with the nine grahas at sunrise, filled by
+# planets.planet_columns
+PLANET_GRAHAS = ["sun", "moon", "mars", "mercury", "jupiter", "venus", "saturn", "rahu", "ketu"]
+PLANET_FIELDS = ["deg", "sign", "sign_lord", "nakshatra", "nakshatra_lord", "sub_lord", "sub_sub_lord"]
+PLANET_COLUMNS = [f"{graha}_{field}" for graha in PLANET_GRAHAS for field in PLANET_FIELDS]
+
+def csv_columns(include_planets: bool = False) -> List[str]:
+    """Return the CSV column order, optionally with the planet column group."""
+    return CSV_COLUMNS + PLANET_COLUMNS if include_planets else CSV_COLUMNS
+
 def create_ascendant_row(
     date_ist: date,
     sunrise_ist: datetime,
@@ -39,15 +49,16 @@ def create_ascendant_row(
     asc_nakshatra: str,
     asc_nakshatra_lord: str,
     asc_sub_lord: str,
-    asc_sub_sub_lord: str
+    asc_sub_sub_lord: str,
+    planets: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
     Create a row for ascendant at sunrise.
     
     Args:
-        date_ist: Date in IST
-        sunrise_ist: Sunrise time in IST
-        next_sunrise_ist: Next sunrise time in IST
+        date_ist: Local date (IST unless another time zone was requested)
+        sunrise_ist: Sunrise time in the local time zone
+        next_sunrise_ist: Next sunrise time in the local time zone
         lat: Latitude
         lon: Longitude
         asc_abs_deg: Ascendant absolute degree
@@ -57,11 +68,12 @@ def create_ascendant_row(
         asc_nakshatra_lord: Ascendant nakshatra lord
         asc_sub_lord: Ascendant KP sub-lord
         asc_sub_sub_lord: Ascendant KP sub-sub-lord
+        planets: Optional planet columns from planets.planet_columns
         
     Returns:
         Dictionary representing the row
     """
-    return {
+    row = {
         "row_type": "ascendant_at_sunrise",
         "date_ist": date_ist.strftime("%Y-%m-%d"),
         "sunrise_ist": sunrise_ist.isoformat(),
@@ -79,6 +91,9 @@ def create_ascendant_row(
         "bucket_sign": "",
         "bucket_sign_lord": ""
     }
+    if planets:
+        row.update(planets)
+    return row
 
 def create_bucket_row(
     date_ist: date,
@@ -94,9 +109,9 @@ def create_bucket_row(
     Create a row for a degree bucket.
     
     Args:
-        date_ist: Date in IST
-        sunrise_ist: Sunrise time in IST
-        next_sunrise_ist: Next sunrise time in IST
+        date_ist: Local date (IST unless another time zone was requested)
+        sunrise_ist: Sunrise time in the local time zone
+        next_sunrise_ist: Next sunrise time in the local time zone
         lat: Latitude
         lon: Longitude
         bucket_start_deg: Bucket start degree
@@ -137,15 +152,16 @@ def generate_csv_rows_for_date(
     asc_nakshatra: str,
     asc_nakshatra_lord: str,
     asc_sub_lord: str,
-    asc_sub_sub_lord: str
+    asc_sub_sub_lord: str,
+    planets: Optional[Dict[str, Any]] = None
 ) -> List[Dict[str, Any]]:
     """
     Generate all CSV rows for a single date.
     
     Args:
-        date_ist: Date in IST
-        sunrise_ist: Sunrise time in IST
-        next_sunrise_ist: Next sunrise time in IST
+        date_ist: Local date (IST unless another time zone was requested)
+        sunrise_ist: Sunrise time in the local time zone
+        next_sunrise_ist: Next sunrise time in the local time zone
         lat: Latitude
         lon: Longitude
         asc_abs_deg: Ascendant absolute degree
@@ -155,6 +171,7 @@ def generate_csv_rows_for_date(
         asc_nakshatra_lord: Ascendant nakshatra lord
         asc_sub_lord: Ascendant KP sub-lord
         asc_sub_sub_lord: Ascendant KP sub-sub-lord
+        planets: Optional planet columns for the ascendant row
         
     Returns:
         List of dictionaries representing all rows for the date
@@ -165,7 +182,7 @@ def generate_csv_rows_for_date(
     ascendant_row = create_ascendant_row(
         date_ist, sunrise_ist, next_sunrise_ist, lat, lon,
         asc_abs_deg, asc_sign, asc_sign_lord, asc_nakshatra,
-        asc_nakshatra_lord, asc_sub_lord, asc_sub_sub_lord
+        asc_nakshatra_lord, asc_sub_lord, asc_sub_sub_lord, planets
     )
     rows.append(ascendant_row)
     
@@ -180,35 +197,63 @@ def generate_csv_rows_for_date(
     
     return rows
 
-def write_csv_to_file(rows: List[Dict[str, Any]], output_file: str) -> None:
+def write_csv_to_file(rows: List[Dict[str, Any]], output_file: str, include_planets: bool = False) -> None:
     """
     Write rows to CSV file with proper schema enforcement.
     
     Args:
         rows: List of row dictionaries
         output_file: Path to output CSV file
+        include_planets: Include the planet column group
     """
     # Create DataFrame
     df = pd.DataFrame(rows)
     
     # Ensure columns are in correct order
-    df = df[CSV_COLUMNS]
+    df = df.reindex(columns=csv_columns(include_planets))
     
     # Write to CSV without index
     df.to_csv(output_file, index=False, float_format='%.3f')
 
-def write_csv_to_stdout(rows: List[Dict[str, Any]]) -> None:
+def write_csv_to_stdout(rows: List[Dict[str, Any]], include_planets: bool = False) -> None:
     """
     Write rows to stdout with proper schema enforcement.
     
     Args:
         rows: List of row dictionaries
+        include_planets: Include the planet column group
     """
     # Create DataFrame
     df = pd.DataFrame(rows)
     
     # Ensure columns are in correct order
-    df = df[CSV_COLUMNS]
+    df = df.reindex(columns=csv_columns(include_planets))
     
     # Write to stdout without index
     df.to_csv('-', index=False, float_format='%.3f')
+
+def append_csv_rows(
+    rows: List[Dict[str, Any]],
+    handle: TextIO,
+    write_header: bool = False,
+    include_planets: bool = False
+) -> None:
+    """
+    Append rows to an open CSV file with the same schema and formatting as write_csv_to_file.
+    
+    Lets large exports be written incrementally instead of holding every row in memory.
+    
+    Args:
+        rows: List of row dictionaries
+        handle: Text file opened for writing
+        write_header: Whether to write the header line first
+        include_planets: Include the planet column group
+    """
+    # Create DataFrame
+    df = pd.DataFrame(rows)
+    
+    # Ensure columns are in correct order
+    df = df.reindex(columns=csv_columns(include_planets))
+    
+    # Append without index
+    df.to_csv(handle, header=write_header, index=False, float_format='%.3f')
@@ -0,0 +1,142 @@
+"""
+House cusp tables: ascendant, MC and the 12 cusps under several systems.
+
+One houses_ex call (Placidus) per instant gives the Placidus cusps, the
+ascendant and the MC. The other systems are derived from it rather than
+computed again:
+
+- kp: KP uses the Placidus cusps; what differs is the reading by KP
+  sign, nakshatra, sub and sub-sub lords, which every row carries anyway
+- whole_sign: cusp n is the start of the n-th sign from the ascendant's
+
+All longitudes of all instants are classified together with one
+np.searchsorted over the KP segment boundaries (planets.classify_longitudes).
+Instants are evaluated at the whole second, like get_ascendant_at_time, so
+the ASC row matches the ascendant column of the CSV.
+"""
+
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import swisseph as swe
+
+from .ephem import IST, UNIX_EPOCH_JD, _ensure_ephemeris, get_sunrise_times
+from .metrics import SWE_CALLS
+from .planets import classify_longitudes
+
+HOUSE_SYSTEMS = ("placidus", "kp", "whole_sign")
+
+# Rows per system: ASC, MC, then cusps 1-12
+CUSP_LABELS = ["ASC", "MC"] + [str(number) for number in range(1, 13)]
+
+CUSP_COLUMNS = [
+    "instant", "system", "cusp", "longitude", "sign", "sign_lord",
+    "nakshatra", "nakshatra_lord", "sub_lord", "sub_sub_lord"
+]
+
+def compute_cusp_longitudes(lat: float, lon: float, jd_ut: float) -> np.ndarray:
+    """
+    Longitudes of ASC, MC and cusps 1-12 for every system at one instant.
+
+    Args:
+        lat: Latitude in decimal degrees
+        lon: Longitude in decimal degrees
+        jd_ut: Julian Day (UT)
+
+    Returns:
+        Array of shape (len(HOUSE_SYSTEMS), len(CUSP_LABELS))
+
+    Raises:
+        ValueError: If Placidus cusps are undefined (polar latitudes)
+    """
+    _ensure_ephemeris()
+    SWE_CALLS.inc(function="houses_ex")
+    try:
+        cusps, ascmc = swe.houses_ex(jd_ut, lat, lon, b'P', 0)
+    except swe.Error as e:
+        raise ValueError(f"Placidus cusps are undefined at latitude {lat}: {e}")
+    placidus = np.concatenate(([ascmc[0], ascmc[1]], cusps[:12]))
+    whole_sign = np.concatenate((
+        [ascmc[0], ascmc[1]], np.floor(ascmc[0] / 30.0) * 30.0 + 30.0 * np.arange(12)
+    ))
+    return np.mod(np.vstack((placidus, placidus, whole_sign)), 360.0)
+
+def compute_angle_longitudes(lat: float, lon: float, jd_ut: float) -> np.ndarray:
+    """
+    Longitudes of ASC and MC at one instant, at any latitude.
+
+    The angles do not depend on the house system, so they are taken from a
+    whole sign houses_ex call, which is defined where Placidus is not.
+
+    Returns:
+        Array of [ASC, MC]
+    """
+    _ensure_ephemeris()
+    SWE_CALLS.inc(function="houses_ex")
+    ascmc = swe.houses_ex(jd_ut, lat, lon, b'W', 0)[1]
+    return np.mod(np.array([ascmc[0], ascmc[1]]), 360.0)
+
+def cusp_tables(lat: float, lon: float, instants: Sequence[datetime]) -> List[Dict[str, Any]]:
+    """
+    Cusp table rows for many instants, classified in one pass.
+
+    Args:
+        lat: Latitude in decimal degrees
+        lon: Longitude in decimal degrees
+        instants: Timezone-aware datetimes (truncated to the whole second)
+
+    Returns:
+        Rows keyed by CUSP_COLUMNS, per instant in HOUSE_SYSTEMS and
+        CUSP_LABELS order
+    """
+    longitudes = np.array([
+        compute_cusp_longitudes(lat, lon, (instant.timestamp() // 1) / 86400.0 + UNIX_EPOCH_JD)
+        for instant in instants
+    ]).reshape(len(instants), len(HOUSE_SYSTEMS), len(CUSP_LABELS))
+    classified = [values.reshape(longitudes.shape) for values in classify_longitudes(longitudes.ravel())]
+
+    rows = []
+    for i, instant in enumerate(instants):
+        stamp = instant.isoformat()
+        for s, system in enumerate(HOUSE_SYSTEMS):
+            for c, label in enumerate(CUSP_LABELS):
+                sign, sign_lord, nakshatra, nakshatra_lord, sub_lord, sub_sub_lord = (
+                    values[i, s, c] for values in classified
+                )
+                rows.append({
+                    "instant": stamp,
+                    "system": system,
+                    "cusp": label,
+                    "longitude": round(float(longitudes[i, s, c]), 3),
+                    "sign": sign,
+                    "sign_lord": sign_lord,
+                    "nakshatra": nakshatra,
+                    "nakshatra_lord": nakshatra_lord,
+                    "sub_lord": sub_lord,
+                    "sub_sub_lord": sub_sub_lord,
+                })
+    return rows
+
+def cusp_tables_at_sunrise(
+    lat: float,
+    lon: float,
+    dates: Sequence[date],
+    tz: Optional[ZoneInfo] = None
+) -> List[Dict[str, Any]]:
+    """
+    Cusp table rows at the sunrise of each date.
+
+    Args:
+        lat: Latitude in decimal degrees
+        lon: Longitude in decimal degrees
+        dates: Local dates
+        tz: Time zone of the dates and sunrise times (default IST)
+
+    Returns:
+        Rows as returned by cusp_tables, with the sunrise as the instant
+    """
+    tz = tz or IST
+    sunrises = [get_sunrise_times(lat, lon, target_date, tz)[0] for target_date in dates]
+    return cusp_tables(lat, lon, sunrises)
@@ -0,0 +1,232 @@
+"""
+Vimshottari dasha timelines for bulk birth records.
+
+The dasha sequence depends only on the Moon's nakshatra at birth, and its
+timing only on how far the Moon has travelled through it. All 729
+pratyantar periods of a 120-year cycle are therefore precomputed once per
+starting lord, as lord indices and cumulative offsets in years; antar and
+maha boundaries are every 9th and 81st of those offsets. A record's
+timeline is then its cycle start plus the offsets of its starting lord, one
+NumPy fancy-index and add over a whole chunk of records, with no per-period
+Python work.
+
+Each timeline covers the cycle the record is born into: from birth (the
+balance of the first maha dasha) to the end of the last maha dasha of that
+cycle. Years are DASHA_YEAR_DAYS long, and the Moon is sidereal (Lahiri
+unless another ayanamsa is chosen), so a supplied Moon longitude must be
+sidereal too.
+
+stream_dasha_csv reads birth records with pandas in chunks and appends
+each chunk's periods to the output, so memory stays bounded for millions of
+records.
+"""
+
+import time
+from typing import Any, Dict, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+import swisseph as swe
+
+from .ephem import DEFAULT_AYANAMSA, IST, UNIX_EPOCH_JD, sidereal_flags
+from .mapping_library import VIMSHOTTARI_SEQUENCE, VIMSHOTTARI_WEIGHTS, NAKSHATRA_SPAN
+from .metrics import SWE_CALLS
+
+LEVELS = ("maha", "antar", "pratyantar")
+
+CYCLE_YEARS = 120.0
+DASHA_YEAR_DAYS = 365.25
+_YEAR_SECONDS = DASHA_YEAR_DAYS * 86400.0
+
+DEFAULT_CHUNK_SIZE = 10000
+
+_LORD_NAMES = np.array(VIMSHOTTARI_SEQUENCE, dtype=object)
+
+_tables: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+def dasha_tables() -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Proportional tables of the 729 pratyantar periods per starting lord.
+
+    Returns:
+        (lords, offsets): lords has shape (9, 729, 3) with maha, antar and
+        pratyantar lord indices into VIMSHOTTARI_SEQUENCE; offsets has shape
+        (9, 730) with period boundaries in years from the start of the cycle
+    """
+    global _tables
+    if _tables is None:
+        years = np.array([VIMSHOTTARI_WEIGHTS[lord] for lord in VIMSHOTTARI_SEQUENCE], dtype=float)
+        i, j, p = np.meshgrid(np.arange(9), np.arange(9), np.arange(9), indexing="ij")
+        lords = np.empty((9, 729, 3), dtype=np.int8)
+        offsets = np.zeros((9, 730))
+        for start in range(9):
+            maha = (start + i) % 9
+            antar = (maha + j) % 9
+            pratyantar = (antar + p) % 9
+            lords[start] = np.stack((maha, antar, pratyantar), axis=-1).reshape(729, 3)
+            durations = years[maha] * years[antar] * years[pratyantar] / CYCLE_YEARS ** 2
+            offsets[start, 1:] = np.cumsum(durations.ravel())
+        lords.flags.writeable = False
+        offsets.flags.writeable = False
+        _tables = (lords, offsets)
+    return _tables
+
+def moon_longitudes(birth_seconds: np.ndarray, ayanamsa: str = DEFAULT_AYANAMSA) -> np.ndarray:
+    """Sidereal Moon longitude in degrees at each Unix time (ayanamsa: key of ephem.AYANAMSAS)."""
+    flags = sidereal_flags(ayanamsa)
+    jd_ut = np.asarray(birth_seconds, dtype=float) / 86400.0 + UNIX_EPOCH_JD
+    longitudes = np.empty(len(jd_ut))
+    for i, jd in enumerate(jd_ut):
+        SWE_CALLS.inc(function="calc_ut")
+        longitudes[i] = swe.calc_ut(float(jd), swe.MOON, flags)[0][0]
+    return longitudes
+
+def dasha_periods(birth_seconds: np.ndarray, moon_longitude: np.ndarray, level: str = "antar") -> Dict[str, np.ndarray]:
+    """
+    Dasha periods from birth to the end of the cycle for many records.
+
+    Args:
+        birth_seconds: Birth Unix times (seconds)
+        moon_longitude: Sidereal Moon longitude at birth (degrees)
+        level: "maha", "antar" or "pratyantar"
+
+    Returns:
+        Flat, record-ordered arrays: "record" (index into the inputs), one
+        lord index array per level down to the requested one, "start" and
+        "end" (Unix seconds, the first period starting at birth)
+    """
+    if level not in LEVELS:
+        raise ValueError(f"level must be one of {', '.join(LEVELS)}")
+    depth = LEVELS.index(level) + 1
+    stride = 9 ** (3 - depth)
+    lords, offsets = dasha_tables()
+
+    birth = np.asarray(birth_seconds, dtype=float)
+    moon = np.mod(np.asarray(moon_longitude, dtype=float), 360.0)
+    nakshatra = np.floor(moon / NAKSHATRA_SPAN).astype(int) % 27
+    start_lord = nakshatra % 9
+    elapsed = (moon - nakshatra * NAKSHATRA_SPAN) / NAKSHATRA_SPAN
+    first_years = offsets[start_lord, 81]  # length of the first maha dasha
+    cycle_start = birth - elapsed * first_years * _YEAR_SECONDS
+
+    # (records, periods + 1) boundaries, (records, periods, depth) lords
+    boundaries = cycle_start[:, None] + offsets[:, ::stride][start_lord] * _YEAR_SECONDS
+    period_lords = lords[:, ::stride, :depth][start_lord]
+    starts, ends = np.maximum(boundaries[:, :-1], birth[:, None]), boundaries[:, 1:]
+    keep = ends > birth[:, None]
+
+    records = np.broadcast_to(np.arange(len(birth))[:, None], keep.shape)[keep]
+    result = {"record": records}
+    for position, name in enumerate(LEVELS[:depth]):
+        result[name] = period_lords[..., position][keep]
+    result["start"] = starts[keep]
+    result["end"] = ends[keep]
+    return result
+
+def parse_birth_times(values: pd.Series, tz: ZoneInfo) -> np.ndarray:
+    """Unix seconds from ISO 8601 strings; naive times are local to tz, bad ones NaN."""
+    text = values.astype(str).str.strip()
+    aware = text.str.contains(r"(?:Z|[+-]\d\d:?\d\d)$", regex=True)
+    seconds = np.full(len(text), np.nan)
+    if aware.any():
+        parsed = pd.to_datetime(text[aware], format="ISO8601", utc=True, errors="coerce")
+        seconds[aware.to_numpy()] = (parsed.dt.tz_localize(None) - pd.Timestamp(0)).dt.total_seconds()
+    if not aware.all():
+        parsed = pd.to_datetime(text[~aware], format="ISO8601", errors="coerce")
+        parsed = parsed.dt.tz_localize(tz, ambiguous="NaT", nonexistent="NaT").dt.tz_convert("UTC")
+        seconds[~aware.to_numpy()] = (parsed.dt.tz_localize(None) - pd.Timestamp(0)).dt.total_seconds()
+    return seconds
+
+def _format_times(seconds: np.ndarray, tz: ZoneInfo, unit: str) -> np.ndarray:
+    """Local wall-clock ISO strings at the given NumPy datetime unit."""
+    local = pd.to_datetime(np.round(seconds).astype(np.int64), unit="s", utc=True).tz_convert(tz).tz_localize(None)
+    return np.datetime_as_string(local.values.astype(f"datetime64[{unit}]"), unit=unit)
+
+def dasha_frame(
+    ids: Sequence[Any],
+    birth_seconds: np.ndarray,
+    moon_longitude: np.ndarray,
+    level: str = "antar",
+    tz: ZoneInfo = IST,
+    unit: str = "D"
+) -> pd.DataFrame:
+    """
+    Dasha periods of many records as a DataFrame.
+
+    Args:
+        ids: Record identifiers
+        birth_seconds: Birth Unix times
+        moon_longitude: Sidereal Moon longitude at birth
+        level: Finest level ("maha", "antar" or "pratyantar")
+        tz: Zone of the output times
+        unit: NumPy datetime unit of the output times ("D" for dates, "m" for minutes)
+
+    Returns:
+        One row per period: id, lords down to level, start, end
+    """
+    periods = dasha_periods(birth_seconds, moon_longitude, level)
+    columns: Dict[str, Any] = {"id": np.asarray(ids, dtype=object)[periods["record"]]}
+    for name in LEVELS[:LEVELS.index(level) + 1]:
+        columns[name] = _LORD_NAMES[periods[name]]
+    columns["start"] = _format_times(periods["start"], tz, unit)
+    columns["end"] = _format_times(periods["end"], tz, unit)
+    return pd.DataFrame(columns)
+
+def stream_dasha_csv(
+    input_path: str,
+    output_path: str,
+    level: str = "antar",
+    tz: ZoneInfo = IST,
+    id_column: str = "id",
+    birth_column: str = "birth_time",
+    moon_column: str = "moon_longitude",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    unit: str = "D",
+    ayanamsa: str = DEFAULT_AYANAMSA
+) -> Dict[str, Any]:
+    """
+    Read birth records in chunks and append their dasha periods to a CSV.
+
+    Records need an id and an ISO 8601 birth time (naive times are local to
+    tz). A moon_column with the Moon's longitude, if present, is used
+    instead of computing it and must be sidereal in the same ayanamsa;
+    otherwise the Moon is computed with the given ayanamsa (key of
+    ephem.AYANAMSAS). Records with an unparseable birth time are skipped and
+    counted.
+
+    Returns:
+        Record, skipped-record and period counts and records per second
+    """
+    if level not in LEVELS:
+        raise ValueError(f"level must be one of {', '.join(LEVELS)}")
+    sidereal_flags(ayanamsa)
+    started = time.perf_counter()
+    records = skipped = periods = 0
+    header = True
+    with open(output_path, "w", newline="") as handle:
+        for chunk in pd.read_csv(input_path, chunksize=chunk_size, dtype={id_column: str}):
+            missing = [column for column in (id_column, birth_column) if column not in chunk.columns]
+            if missing:
+                raise ValueError(f"Input is missing column(s): {', '.join(missing)}")
+            births = parse_birth_times(chunk[birth_column], tz)
+            valid = ~np.isnan(births)
+            if moon_column in chunk.columns:
+                moon = chunk[moon_column].to_numpy(dtype=float)
+                valid &= ~np.isnan(moon)
+                moon = moon[valid]
+            else:
+                moon = moon_longitudes(births[valid], ayanamsa)
+            frame = dasha_frame(chunk[id_column].to_numpy()[valid], births[valid], moon, level, tz, unit)
+            frame.to_csv(handle, header=header, index=False)
+            header = False
+            records += int(valid.sum())
+            skipped += int((~valid).sum())
+            periods += len(frame)
+    elapsed = time.perf_counter() - started
+    return {
+        "records": records,
+        "skipped": skipped,
+        "periods": periods,
+        "records_per_second": round(records / elapsed, 1) if elapsed > 0 else None
+    }
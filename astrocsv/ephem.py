@@ -7,195 +7,346 @@ from astral import LocationInfo
 from astral.sun import sunrise
 from datetime import datetime, date, timedelta
 from zoneinfo import ZoneInfo
-from typing import Tuple
-import math
+from typing import Any, Dict, List, Optional, Tuple
+import os
+import re
+import threading
+
+import numpy as np
+
+from . import __version__
+from .metrics import SWE_CALLS
+from .memo import EphemerisMemo, ephemeris_memo_from_env, encode_datetimes, decode_datetimes
 
 # IST timezone
 IST = ZoneInfo("Asia/Kolkata")
+UTC = ZoneInfo("UTC")
 
-def setup_swiss_ephemeris():
-    """
-    Setup Swiss Ephemeris with topocentric observer.
-    """
-    # Set ephemeris path (default to ./ephe/ directory)
-    swe.set_ephe_path("./ephe/")
-    
-    # Set topocentric observer (altitude 0m by default)
-    # This will be set per calculation in get_ascendant_at_time
+# astral rises closer than this to 00:00 UTC are recomputed without its
+# date wrap (see _local_sunrise)
+UTC_MIDNIGHT_MARGIN_MINUTES = 5
+
+# Bumped when results change between releases (2: sunrises near 00:00 UTC)
+ENGINE_REVISION = 2
+
+# Identifies the calculation engine in cache keys and ETags; results computed
+# by a different astrocsv or Swiss Ephemeris version are never reused
+ENGINE_VERSION = f"astrocsv-{__version__}.r{ENGINE_REVISION}+swe-{getattr(swe, 'version', 'unknown')}"
+
+# Ephemeris directory lookup: explicit argument, then $ASTROCSV_EPHE_PATH, then
+# the directory bundled with the package, then ./ephe/ in the working directory
+EPHE_PATH_ENV = "ASTROCSV_EPHE_PATH"
+PACKAGE_EPHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ephe")
+
+# Swiss Ephemeris file names encode the first century covered, e.g.
+# sepl_18.se1 = 1800-2399 AD and seplm06.se1 = 600-1 BC; each spans 600 years
+_EPHE_FILE_PATTERN = re.compile(r"^se(pl|mo|as)(_|m)(\d{2})\.se1$")
+EPHE_FILE_YEARS = 600
 
-def get_sunrise_times(lat: float, lon: float, target_date: date) -> Tuple[datetime, datetime]:
+# Bodies opened by preload_ephemeris (the Sun for sunrise, the Moon for
+# nakshatra-based calculations)
+PRELOAD_BODIES = (swe.SUN, swe.MOON)
+
+_ephemeris_status: Optional[Dict[str, Any]] = None
+_ephemeris_lock = threading.Lock()
+
+def _has_ephemeris_files(directory: str) -> bool:
+    return os.path.isdir(directory) and any(
+        _EPHE_FILE_PATTERN.match(name) for name in os.listdir(directory)
+    )
+
+def resolve_ephemeris_path(path: Optional[str] = None) -> str:
     """
-    Get sunrise times for a given date and location.
+    Resolve the ephemeris directory to use.
     
     Args:
-        lat: Latitude in decimal degrees (positive north)
-        lon: Longitude in decimal degrees (positive east)
-        target_date: Date to calculate sunrise for
+        path: Explicit directory, taking precedence over everything else
         
     Returns:
-        Tuple of (sunrise_ist, next_sunrise_ist) as datetime objects in IST
+        Absolute directory path. When no candidate contains .se1 files the
+        package directory is returned and Swiss Ephemeris falls back to the
+        built-in Moshier ephemeris.
     """
-    # Create location info
-    location = LocationInfo(
-        latitude=lat,
-        longitude=lon,
-        timezone=IST,
-        name="Location"
-    )
-    
-    try:
-        # Get sunrise for target date
-        sunrise_time = sunrise(location.observer, date=target_date)
-        sunrise_ist = sunrise_time.astimezone(IST)
-        
-        # Get sunrise for next day
-        next_date = target_date + timedelta(days=1)
-        next_sunrise_time = sunrise(location.observer, date=next_date)
-        next_sunrise_ist = next_sunrise_time.astimezone(IST)
-        
-        return sunrise_ist, next_sunrise_ist
-        
-    except Exception as e:
-        # Fallback calculation using Swiss Ephemeris
-        return _fallback_sunrise_calculation(lat, lon, target_date)
+    if path:
+        return os.path.abspath(path)
+    if os.environ.get(EPHE_PATH_ENV):
+        return os.path.abspath(os.environ[EPHE_PATH_ENV])
+    for candidate in (PACKAGE_EPHE_DIR, os.path.abspath("ephe")):
+        if _has_ephemeris_files(candidate):
+            return candidate
+    return PACKAGE_EPHE_DIR
 
-def _fallback_sunrise_calculation(lat: float, lon: float, target_date: date) -> Tuple[datetime, datetime]:
+def ephemeris_file_coverage(directory: str) -> List[Dict[str, Any]]:
     """
-    Fallback sunrise calculation using Swiss Ephemeris.
+    List the Swiss Ephemeris files in a directory with the years they cover.
     
     Args:
-        lat: Latitude in decimal degrees
-        lon: Longitude in decimal degrees
-        target_date: Date to calculate sunrise for
+        directory: Ephemeris directory
         
     Returns:
-        Tuple of (sunrise_ist, next_sunrise_ist) as datetime objects in IST
+        List of {"file", "kind", "start_year", "end_year"} sorted by kind and
+        start year (astronomical years, 0 = 1 BC)
     """
-    # Convert date to Julian Day at 00:00 IST
-    ist_midnight = datetime.combine(target_date, datetime.min.time(), tzinfo=IST)
-    utc_midnight = ist_midnight.astimezone(ZoneInfo("UTC"))
-    
-    # Calculate Julian Day
-    jd_utc = _datetime_to_julian_day(utc_midnight)
-    
-    # Search for sunrise (solar altitude = 0 with refraction)
-    sunrise_jd = _find_solar_altitude_root(jd_utc, lat, lon, 0.0, search_forward=True)
-    next_sunrise_jd = _find_solar_altitude_root(jd_utc + 1.0, lat, lon, 0.0, search_forward=True)
-    
-    # Convert back to datetime
-    sunrise_utc = _julian_day_to_datetime(sunrise_jd)
-    next_sunrise_utc = _julian_day_to_datetime(next_sunrise_jd)
-    
-    # Convert to IST
-    sunrise_ist = sunrise_utc.astimezone(IST)
-    next_sunrise_ist = next_sunrise_utc.astimezone(IST)
-    
-    return sunrise_ist, next_sunrise_ist
+    if not os.path.isdir(directory):
+        return []
+    kinds = {"pl": "planets", "mo": "moon", "as": "asteroids"}
+    files = []
+    for name in sorted(os.listdir(directory)):
+        match = _EPHE_FILE_PATTERN.match(name)
+        if match is None:
+            continue
+        kind, era, century = match.groups()
+        start_year = int(century) * 100 if era == "_" else 1 - int(century) * 100
+        files.append({
+            "file": name,
+            "kind": kinds[kind],
+            "start_year": start_year,
+            "end_year": start_year + EPHE_FILE_YEARS - 1
+        })
+    files.sort(key=lambda entry: (entry["kind"], entry["start_year"]))
+    return files
 
-def _find_solar_altitude_root(jd_start: float, lat: float, lon: float, target_altitude: float, search_forward: bool = True) -> float:
+def preload_ephemeris(jd_ut: Optional[float] = None) -> Dict[str, Any]:
     """
-    Find the Julian Day when solar altitude equals target_altitude.
+    Open the ephemeris files needed around a date and report which backend answered.
+    
+    Swiss Ephemeris keeps files open after the first lookup, so this moves
+    the disk I/O out of the first real calculation.
     
     Args:
-        jd_start: Starting Julian Day
-        lat: Latitude in decimal degrees
-        lon: Longitude in decimal degrees
-        target_altitude: Target altitude in degrees
-        search_forward: If True, search forward in time
+        jd_ut: Julian Day to load data for (default: now)
         
     Returns:
-        Julian Day when solar altitude equals target_altitude
+        Dictionary with "backend" ("swiss_ephemeris" or "moshier") and "bodies"
+    """
+    if jd_ut is None:
+        jd_ut = julian_day_from_datetime(datetime.now(ZoneInfo("UTC")))
+    backends = set()
+    for body in PRELOAD_BODIES:
+        SWE_CALLS.inc(function="calc_ut")
+        _, return_flags = swe.calc_ut(jd_ut, body, swe.FLG_SWIEPH)
+        backends.add("moshier" if return_flags & swe.FLG_MOSEPH else "swiss_ephemeris")
+    # A single Moshier answer means some files are missing
+    return {
+        "backend": "moshier" if "moshier" in backends else "swiss_ephemeris",
+        "bodies": len(PRELOAD_BODIES)
+    }
+
+def setup_swiss_ephemeris(path: Optional[str] = None, preload: bool = True) -> Dict[str, Any]:
     """
-    # Use binary search to find the root
-    jd_low = jd_start
-    jd_high = jd_start + (1.0 if search_forward else -1.0)
+    Configure the Swiss Ephemeris data path and optionally preload it.
     
-    tolerance = 1e-6  # 1 second tolerance
+    Safe to call repeatedly; the path is only (re)applied when it changes,
+    since set_ephe_path closes any open ephemeris files.
     
-    while abs(jd_high - jd_low) > tolerance:
-        jd_mid = (jd_low + jd_high) / 2.0
-        
-        # Calculate solar altitude at jd_mid
-        altitude = _calculate_solar_altitude(jd_mid, lat, lon)
+    Args:
+        path: Ephemeris directory (see resolve_ephemeris_path for defaults)
+        preload: Open the ephemeris files now and detect the active backend
         
-        if abs(altitude - target_altitude) < 0.001:  # 0.001 degree tolerance
-            return jd_mid
-        elif altitude > target_altitude:
-            if search_forward:
-                jd_low = jd_mid
-            else:
-                jd_high = jd_mid
+    Returns:
+        Ephemeris status as returned by get_ephemeris_status
+    """
+    global _ephemeris_status
+    resolved = resolve_ephemeris_path(path)
+    with _ephemeris_lock:
+        current = _ephemeris_status
+        if current is not None and current["path"] == resolved:
+            if not preload or current["backend"] != "unknown":
+                return current
         else:
-            if search_forward:
-                jd_high = jd_mid
-            else:
-                jd_low = jd_mid
+            swe.set_ephe_path(resolved)
+        
+        files = ephemeris_file_coverage(resolved)
+        this_year = datetime.now().year
+        status = {
+            "path": resolved,
+            "backend": "unknown",
+            "files": files,
+            "covers_current_year": any(
+                entry["kind"] == "planets" and entry["start_year"] <= this_year <= entry["end_year"]
+                for entry in files
+            )
+        }
+        if preload:
+            status.update(preload_ephemeris())
+        _ephemeris_status = status
+        return status
+
+def get_ephemeris_status() -> Dict[str, Any]:
+    """
+    Return the active ephemeris configuration, setting it up on first use.
     
-    return (jd_low + jd_high) / 2.0
+    Returns:
+        Dictionary with "path", "backend" ("swiss_ephemeris", "moshier" or
+        "unknown" if not preloaded), "files" with their year coverage and
+        "covers_current_year"
+    """
+    current = _ephemeris_status
+    if current is None:
+        return setup_swiss_ephemeris()
+    if current["backend"] == "unknown":
+        return setup_swiss_ephemeris(current["path"])
+    return current
+
+def _ensure_ephemeris() -> None:
+    """Apply the default ephemeris path in processes that never called setup."""
+    if _ephemeris_status is None:
+        setup_swiss_ephemeris(preload=False)
+
+# Julian Day of the J2000.0 epoch (2000-01-01T12:00 TT), the origin of the
+# sidereal time and precession polynomials
+J2000 = 2451545.0
+
+def nutation(jd_ut: float) -> Tuple[float, float]:
+    """True obliquity and nutation in longitude (degrees) from Swiss Ephemeris."""
+    _ensure_ephemeris()
+    SWE_CALLS.inc(function="calc_ut")
+    values = swe.calc_ut(jd_ut, swe.ECL_NUT)[0]
+    return values[0], values[2]
+
+# Ayanamsas for sidereal longitudes (panchang nakshatra and yoga, the dasha
+# Moon); the ascendant, cusps and planet columns stay tropical
+AYANAMSAS = {
+    "lahiri": swe.SIDM_LAHIRI,
+    "raman": swe.SIDM_RAMAN,
+    "krishnamurti": swe.SIDM_KRISHNAMURTI,
+    "fagan_bradley": swe.SIDM_FAGAN_BRADLEY,
+    "yukteshwar": swe.SIDM_YUKTESHWAR,
+    "true_chitra": swe.SIDM_TRUE_CITRA,
+}
+DEFAULT_AYANAMSA = "lahiri"
+
+def sidereal_flags(ayanamsa: str = DEFAULT_AYANAMSA) -> int:
+    """
+    Select an ayanamsa and return the calc_ut flags for sidereal positions.
+
+    Args:
+        ayanamsa: Key of AYANAMSAS
 
-def _calculate_solar_altitude(jd: float, lat: float, lon: float) -> float:
+    Raises:
+        ValueError: If the ayanamsa is unknown
     """
-    Calculate solar altitude at given Julian Day and location.
+    if ayanamsa not in AYANAMSAS:
+        raise ValueError(f"Unknown ayanamsa: {ayanamsa} (expected one of {', '.join(AYANAMSAS)})")
+    _ensure_ephemeris()
+    swe.set_sid_mode(AYANAMSAS[ayanamsa])
+    return swe.FLG_SWIEPH | swe.FLG_SIDEREAL
+
+# Process-wide sunrise/ascendant memo, created from the environment on first use
+_memo: Optional[EphemerisMemo] = None
+
+def get_ephemeris_memo() -> EphemerisMemo:
+    """Return the sunrise/ascendant memo (see astrocsv.memo for configuration)."""
+    global _memo
+    if _memo is None:
+        _memo = ephemeris_memo_from_env(ENGINE_VERSION)
+    return _memo
+
+def configure_ephemeris_memo(memo: EphemerisMemo) -> None:
+    """Replace the sunrise/ascendant memo, e.g. to enable quantization or a store."""
+    global _memo
+    _memo = memo
+
+def get_sunrise_times(
+    lat: float,
+    lon: float,
+    target_date: date,
+    tz: Optional[ZoneInfo] = None,
+    definition: Optional[str] = None,
+    observer: Optional[Any] = None
+) -> Tuple[datetime, datetime]:
+    """
+    Get sunrise times for a given date and location.
+    
+    Results are memoized; see astrocsv.memo for quantization and persistence.
     
     Args:
-        jd: Julian Day
-        lat: Latitude in decimal degrees
-        lon: Longitude in decimal degrees
+        lat: Latitude in decimal degrees (positive north)
+        lon: Longitude in decimal degrees (positive east)
+        target_date: Local date to calculate sunrise for
+        tz: Time zone defining the local date and the results (default IST);
+            see astrocsv.timezones to resolve one from the coordinates
+        definition: Name from astrocsv.sunrise_definitions.SUNRISE_DEFINITIONS;
+            None keeps astral's sunrise (upper limb, sea level)
+        observer: astrocsv.sunrise_definitions.Observer with elevation and
+            atmosphere; implies the "upper_limb" definition if none is given
         
     Returns:
-        Solar altitude in degrees
+        Tuple of (sunrise, next_sunrise) as datetime objects in tz
     """
-    # Get solar position
-    sun_pos = swe.calc_ut(jd, swe.SUN)
-    sun_ra = sun_pos[0][0]  # Right Ascension
-    sun_dec = sun_pos[0][1]  # Declination
-    
-    # Convert to altitude
-    # This is a simplified calculation - for production use, consider using swe.azalt()
-    lst = _julian_day_to_lst(jd, lon)
-    hour_angle = lst - sun_ra
-    
-    # Convert to radians
-    lat_rad = math.radians(lat)
-    dec_rad = math.radians(sun_dec)
-    ha_rad = math.radians(hour_angle * 15)  # Convert hours to degrees
-    
-    # Calculate altitude
-    sin_alt = (math.sin(lat_rad) * math.sin(dec_rad) + 
-               math.cos(lat_rad) * math.cos(dec_rad) * math.cos(ha_rad))
-    altitude = math.degrees(math.asin(sin_alt))
-    
-    # Apply refraction (simplified)
-    if altitude > -0.833:  # Above horizon
-        altitude += 0.1594 + 0.0196 * altitude + 0.00002 * altitude * altitude
-    
-    return altitude
+    tz = tz or IST
+    if definition is not None or observer is not None:
+        from .sunrise_definitions import SEA_LEVEL, get_sunrise_variants
+        definition = definition or "upper_limb"
+        return get_sunrise_variants(lat, lon, target_date, tz, [definition], observer or SEA_LEVEL)[definition]
+    memo = get_ephemeris_memo()
+    lat, lon = memo.location(lat, lon)
+    return memo.get_or_compute(
+        "sunrise", (lat, lon, target_date.isoformat(), tz.key),
+        lambda: _compute_sunrise_times(lat, lon, target_date, tz),
+        encode=encode_datetimes, decode=lambda values: decode_datetimes(values, tz)
+    )
+
+def _compute_sunrise_times(lat: float, lon: float, target_date: date, tz: ZoneInfo) -> Tuple[datetime, datetime]:
+    """Compute sunrise times without the memo (see get_sunrise_times)."""
+    observer = LocationInfo(latitude=lat, longitude=lon, timezone=tz.key, name="Location").observer
+    return (
+        _local_sunrise(observer, lat, lon, target_date, tz),
+        _local_sunrise(observer, lat, lon, target_date + timedelta(days=1), tz)
+    )
 
-def _julian_day_to_lst(jd: float, lon: float) -> float:
+def _local_sunrise(observer, lat: float, lon: float, target_date: date, tz: ZoneInfo) -> datetime:
     """
-    Convert Julian Day to Local Sidereal Time.
-    
+    Sunrise on a local date.
+
+    astral computes the rise of a UTC date and raises when, converted to tz,
+    it lands on another local date (sunrise near 00:00 UTC, e.g. Bangladesh
+    and eastern Arunachal). The rises of the UTC dates around the local date
+    are tried instead and the one inside the local day is kept, as
+    sunrise_field does. On a UTC date with two rises astral can return
+    neither, and rises right at 00:00 UTC it gets a day's drift wrong;
+    _fallback_sunrise_calculation covers both.
+
+    Raises:
+        ValueError: If the sun does not rise on that date (polar day or night)
+    """
+    for offset in (0, -1, 1):
+        try:
+            rise = sunrise(observer, date=target_date + timedelta(days=offset), tzinfo=UTC)
+        except ValueError:
+            continue
+        # Within minutes of 00:00 UTC astral's two iterations can evaluate the
+        # sun a day apart, leaving the rise off by a day's drift (~1 minute)
+        minutes = rise.hour * 60 + rise.minute
+        if min(minutes, 1440 - minutes) < UTC_MIDNIGHT_MARGIN_MINUTES:
+            break
+        if rise.astimezone(tz).date() == target_date:
+            return rise.astimezone(tz)
+    return _fallback_sunrise_calculation(lat, lon, target_date, tz)
+
+def _fallback_sunrise_calculation(lat: float, lon: float, target_date: date, tz: ZoneInfo = IST) -> datetime:
+    """
+    Sunrise on a local date where astral cannot return it.
+
+    Uses sunrise_field, astral's NOAA algorithm without its wrap into the
+    UTC date, so the result matches astral's horizon and refraction.
+
     Args:
-        jd: Julian Day
+        lat: Latitude in decimal degrees
         lon: Longitude in decimal degrees
-        
+        target_date: Local date to calculate sunrise for
+        tz: Time zone defining the local date (default IST)
+
     Returns:
-        Local Sidereal Time in hours
+        Sunrise as a datetime in tz
+
+    Raises:
+        ValueError: If the sun does not rise on that date
     """
-    # Calculate Greenwich Sidereal Time
-    t = (jd - 2451545.0) / 36525.0
-    gst = 280.46061837 + 360.98564736629 * (jd - 2451545.0) + 0.000387933 * t * t - t * t * t / 38710000.0
-    
-    # Convert to hours and normalize
-    gst = (gst % 360) / 15.0
-    
-    # Add longitude correction
-    lst = gst + lon / 15.0
-    
-    # Normalize to 0-24 range
-    lst = lst % 24.0
-    
-    return lst
+    rise_jd = float(sunrise_field(lat, lon, target_date, tz))
+    if rise_jd != rise_jd:
+        raise ValueError(f"The sun does not rise at ({lat}, {lon}) on {target_date.isoformat()}")
+    return datetime_from_julian_day(rise_jd, tz)
 
 def _datetime_to_julian_day(dt: datetime) -> float:
     """
@@ -236,35 +387,124 @@ def _datetime_to_julian_day(dt: datetime) -> float:
     
     return jd
 
-def _julian_day_to_datetime(jd: float) -> datetime:
+# Julian Day of the Unix epoch (1970-01-01T00:00:00 UTC)
+UNIX_EPOCH_JD = 2440587.5
+
+def julian_day_from_datetime(dt: datetime) -> float:
     """
-    Convert Julian Day to datetime.
+    Convert a datetime to a Julian Day (UT), keeping sub-second precision.
     
     Args:
-        jd: Julian Day as float
+        dt: datetime object (naive values are taken as UTC)
         
     Returns:
-        datetime object in UTC
+        Julian Day as float
     """
-    # Extract date part
-    jd_int = int(jd + 0.5)
-    
-    # Convert to Gregorian date
-    f = jd_int + 1401 + (((4 * jd_int + 274277) // 146097) * 3) // 4 - 38
-    e = 4 * f + 3
-    g = (e % 1461) // 4
-    h = 5 * g + 2
-    day = (h % 153) // 5 + 1
-    month = (h // 153 + 2) % 12 + 1
-    year = e // 1461 - 4716 + (12 + 2 - month) // 12
-    
-    # Extract time part
-    time_fraction = jd - jd_int + 0.5
-    hour = int(time_fraction * 24)
-    minute = int((time_fraction * 24 - hour) * 60)
-    second = int(((time_fraction * 24 - hour) * 60 - minute) * 60)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=ZoneInfo("UTC"))
+    return UNIX_EPOCH_JD + dt.timestamp() / 86400.0
+
+def datetime_from_julian_day(jd: float, tz: ZoneInfo = IST) -> datetime:
+    """
+    Convert a Julian Day (UT) to a timezone-aware datetime, keeping sub-second precision.
     
-    return datetime(year, month, day, hour, minute, second, tzinfo=ZoneInfo("UTC"))
+    Args:
+        jd: Julian Day as float
+        tz: Timezone of the result (default IST)
+        
+    Returns:
+        datetime object in tz
+    """
+    return datetime.fromtimestamp((jd - UNIX_EPOCH_JD) * 86400.0, tz=tz)
+
+# Zenith distance of the sun's centre at sunrise, as astral computes it: the
+# apparent radius plus its low-altitude refraction formula at that altitude
+SUN_APPARENT_RADIUS = 32.0 / 60.0 / 2.0
+_RISE_ELEVATION = -SUN_APPARENT_RADIUS
+SUNRISE_ZENITH = 90.0 + SUN_APPARENT_RADIUS + (
+    1735.0 + _RISE_ELEVATION * (-518.2 + _RISE_ELEVATION * (103.4 + _RISE_ELEVATION * (-12.79 + _RISE_ELEVATION * 0.711)))
+) / 3600.0
+
+# Solar position evaluations per rise time (astral uses two)
+SUNRISE_ITERATIONS = 2
+
+# astral clamps latitudes to this range
+MAX_LATITUDE = 89.8
+
+def _solar_terms(jd: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """NOAA solar declination (degrees) and equation of time (minutes) at Julian Days (UT)."""
+    t = (jd - J2000) / 36525.0
+    mean_longitude = np.radians((280.46646 + t * (36000.76983 + 0.0003032 * t)) % 360.0)
+    anomaly = np.radians(357.52911 + t * (35999.05029 - 0.0001537 * t))
+    eccentricity = 0.016708634 - t * (0.000042037 + 0.0000001267 * t)
+    center = (
+        np.sin(anomaly) * (1.914602 - t * (0.004817 + 0.000014 * t))
+        + np.sin(2 * anomaly) * (0.019993 - 0.000101 * t)
+        + np.sin(3 * anomaly) * 0.000289
+    )
+    omega = np.radians(125.04 - 1934.136 * t)
+    apparent_longitude = np.radians(np.degrees(mean_longitude) + center - 0.00569 - 0.00478 * np.sin(omega))
+    mean_obliquity = 23.0 + (26.0 + (21.448 - t * (46.815 + t * (0.00059 - t * 0.001813))) / 60.0) / 60.0
+    obliquity = np.radians(mean_obliquity + 0.00256 * np.cos(omega))
+
+    declination = np.degrees(np.arcsin(np.sin(obliquity) * np.sin(apparent_longitude)))
+    y = np.tan(obliquity / 2) ** 2
+    equation_of_time = 4.0 * np.degrees(
+        y * np.sin(2 * mean_longitude)
+        - 2 * eccentricity * np.sin(anomaly)
+        + 4 * eccentricity * y * np.sin(anomaly) * np.cos(2 * mean_longitude)
+        - 0.5 * y * y * np.sin(4 * mean_longitude)
+        - 1.25 * eccentricity * eccentricity * np.sin(2 * anomaly)
+    )
+    return declination, equation_of_time
+
+def _rise_jd(lat: np.ndarray, lon: np.ndarray, day_jd: np.ndarray) -> np.ndarray:
+    """Sunrise (Julian Day, UT) for the UT date starting at day_jd, NaN without one."""
+    lat_rad = np.radians(np.clip(lat, -MAX_LATITUDE, MAX_LATITUDE))
+    cos_zenith = np.cos(np.radians(SUNRISE_ZENITH))
+    adjustment = np.zeros_like(day_jd)
+    for _ in range(SUNRISE_ITERATIONS):
+        declination, equation_of_time = _solar_terms(day_jd + adjustment)
+        dec_rad = np.radians(declination)
+        with np.errstate(invalid="ignore"):
+            cos_hour_angle = (cos_zenith - np.sin(lat_rad) * np.sin(dec_rad)) / (np.cos(lat_rad) * np.cos(dec_rad))
+            hour_angle = np.degrees(np.arccos(cos_hour_angle))
+        # Unlike astral, offsets below -720 are not wrapped into the UT date:
+        # far east the wrapped rise can be the one a whole day away, and a UT
+        # date near 00:00 UTC sunrise can hold two rises. The unwrapped rise
+        # moves with day_jd, so sunrise_field's shifts always find the local one
+        offset = 4.0 * (-lon - hour_angle) - equation_of_time
+        adjustment = (720.0 + offset) / 1440.0
+    return day_jd + adjustment
+
+def sunrise_field(lat: np.ndarray, lon: np.ndarray, target_date: date, tz: ZoneInfo = IST) -> np.ndarray:
+    """
+    Sunrise on a local date for every cell.
+
+    Args:
+        lat: Latitudes (any shape, broadcast against lon)
+        lon: Longitudes
+        target_date: Local date
+        tz: Zone defining the local date (default IST)
+
+    Returns:
+        Sunrise Julian Days (UT), NaN where the sun does not rise
+    """
+    lat, lon = np.broadcast_arrays(np.asarray(lat, dtype=float), np.asarray(lon, dtype=float))
+    local_start, local_end = (
+        datetime.combine(day, datetime.min.time(), tzinfo=tz).timestamp() / 86400.0 + UNIX_EPOCH_JD
+        for day in (target_date, target_date + timedelta(days=1))
+    )
+    # 0h UT of the same calendar date
+    day_jd = np.full(lat.shape, target_date.toordinal() + 1721424.5)
+
+    rise = _rise_jd(lat, lon, day_jd)
+    # A rise belonging to the neighbouring local day is recomputed for the
+    # solar day on the other side, as astral does
+    for shift, outside in ((1.0, rise < local_start), (-1.0, rise >= local_end)):
+        if outside.any():
+            rise = np.where(outside, _rise_jd(lat, lon, day_jd + shift), rise)
+    return rise
 
 def get_ascendant_at_time(lat: float, lon: float, dt: datetime) -> float:
     """
@@ -278,6 +518,17 @@ def get_ascendant_at_time(lat: float, lon: float, dt: datetime) -> float:
     Returns:
         Ascendant longitude in degrees (0-360)
     """
+    memo = get_ephemeris_memo()
+    lat, lon = memo.location(lat, lon)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=IST)
+    return memo.get_or_compute(
+        "ascendant", (lat, lon, dt.astimezone(ZoneInfo("UTC")).isoformat()),
+        lambda: _compute_ascendant_at_time(lat, lon, dt)
+    )
+
+def _compute_ascendant_at_time(lat: float, lon: float, dt: datetime) -> float:
+    """Compute the ascendant without the memo (see get_ascendant_at_time)."""
     # Convert to IST if not already
     if dt.tzinfo is None:
         dt = dt.replace(tzinfo=IST)
@@ -290,11 +541,29 @@ def get_ascendant_at_time(lat: float, lon: float, dt: datetime) -> float:
     # Convert to Julian Day
     jd_ut = _datetime_to_julian_day(utc_dt)
     
+    return get_ascendant_at_jd(lat, lon, jd_ut)
+
+def get_ascendant_at_jd(lat: float, lon: float, jd_ut: float) -> float:
+    """
+    Calculate the ascendant (Lagna) at a Julian Day (UT) and location.
+    
+    Args:
+        lat: Latitude in decimal degrees (positive north)
+        lon: Longitude in decimal degrees (positive east)
+        jd_ut: Julian Day in Universal Time
+        
+    Returns:
+        Ascendant longitude in degrees (0-360)
+    """
+    _ensure_ephemeris()
+    
     # Set topocentric observer
+    SWE_CALLS.inc(function="set_topo")
     swe.set_topo(lon, lat, 0)  # altitude 0m
     
     # Calculate houses (ascendant)
     # Use Placidus system, but for ascendant the system doesn't matter
+    SWE_CALLS.inc(function="houses_ex")
     houses_result = swe.houses_ex(jd_ut, lat, lon, b'P', 0)
     
     # houses_ex returns (cusps, ascmc) where cusps is the first element
@@ -0,0 +1,330 @@
+"""
+Offline city gazetteer with prefix search.
+
+Places are stored as a tab-separated file (optionally gzipped) with the
+columns name, country, admin1, latitude, longitude, population, timezone and
+alternate_names (comma-separated). The package ships a small set of major
+cities in geodata/places.tsv; a larger file built from a GeoNames dump with
+build_gazetteer (or `astrocsv-tools build-gazetteer`) is used instead when
+$ASTROCSV_GAZETTEER points at it.
+
+Names and alternate names are normalized (case-folded, accents and
+punctuation removed) into one sorted key list, so a prefix query is two
+binary searches. The most populous matches of every one- and two-character
+prefix are precomputed, because those ranges cover a large part of the
+file; longer prefixes select few enough keys to rank on the fly.
+
+nearest() finds the closest place to a coordinate, which timezones uses to
+pick a zone for "auto" when no time zone polygons are installed.
+"""
+
+import bisect
+import gzip
+import heapq
+import math
+import os
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+GAZETTEER_ENV = "ASTROCSV_GAZETTEER"
+PACKAGE_GAZETTEER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "geodata", "places.tsv")
+
+COLUMNS = ("name", "country", "admin1", "latitude", "longitude", "population", "timezone", "alternate_names")
+
+# Prefixes up to this length get their top matches precomputed
+PRECOMPUTED_PREFIX_LENGTH = 2
+PRECOMPUTED_RESULTS = 25
+
+# GeoNames feature class of populated places, the only class kept by build_gazetteer
+GEONAMES_FEATURE_CLASS = "P"
+
+# GeoNames table mapping "<country>.<admin1 code>" to region names, looked
+# for next to the dump when build_gazetteer is not given one
+GEONAMES_ADMIN1_FILE = "admin1CodesASCII.txt"
+
+EARTH_RADIUS_KM = 6371.0
+
+class Place(NamedTuple):
+    name: str
+    country: str
+    admin1: str
+    latitude: float
+    longitude: float
+    population: int
+    timezone: str
+
+    def label(self) -> str:
+        """Display name such as "Pune, Maharashtra, IN"."""
+        return ", ".join(part for part in (self.name, self.admin1, self.country) if part)
+
+    def to_dict(self) -> Dict[str, object]:
+        data = self._asdict()
+        data["label"] = self.label()
+        return data
+
+def normalize_name(name: str) -> str:
+    """Fold a place name to its search key: lower case, no accents, single spaces."""
+    decomposed = unicodedata.normalize("NFKD", name.casefold())
+    kept = "".join(
+        char if char.isalnum() else " "
+        for char in decomposed
+        if not unicodedata.combining(char)
+    )
+    return " ".join(kept.split())
+
+def _open_text(path: str, mode: str = "rt"):
+    opener = gzip.open if path.endswith(".gz") else open
+    return opener(path, mode, encoding="utf-8")
+
+class Gazetteer:
+    """
+    In-memory prefix index over places.
+
+    Args:
+        places: Places to index
+        alternate_names: Extra search names per place (same order as places)
+    """
+
+    def __init__(self, places: List[Place], alternate_names: Optional[List[Iterable[str]]] = None):
+        self.places = places
+        entries: List[Tuple[str, int]] = []
+        for position, place in enumerate(places):
+            names = {normalize_name(place.name)}
+            if alternate_names is not None:
+                names.update(normalize_name(name) for name in alternate_names[position])
+            entries.extend((key, position) for key in names if key)
+        entries.sort()
+        self._keys = [key for key, _ in entries]
+        self._positions = [position for _, position in entries]
+
+        # Precompute the most populous places for short prefixes
+        self._top: Dict[str, List[int]] = {}
+        ranked: Dict[str, List[int]] = {}
+        for key, position in entries:
+            for length in range(1, min(PRECOMPUTED_PREFIX_LENGTH, len(key)) + 1):
+                ranked.setdefault(key[:length], []).append(position)
+        for prefix, positions in ranked.items():
+            self._top[prefix] = self._rank(positions, PRECOMPUTED_RESULTS)
+
+    def __len__(self) -> int:
+        return len(self.places)
+
+    def _rank(self, positions: Iterable[int], limit: int) -> List[int]:
+        """Return distinct positions ordered by population, largest first."""
+        unique = set(positions)
+        return heapq.nsmallest(limit, unique, key=lambda position: (-self.places[position].population, position))
+
+    def _range(self, key: str) -> Tuple[int, int]:
+        return bisect.bisect_left(self._keys, key), bisect.bisect_left(self._keys, key + "\uffff")
+
+    def search(self, query: str, limit: int = 10, country: Optional[str] = None) -> List[Place]:
+        """
+        Return places whose name or alternate name starts with the query.
+
+        Args:
+            query: Name prefix (case and accents are ignored)
+            limit: Maximum number of results
+            country: Optional ISO country code to restrict results to
+
+        Returns:
+            Matching places, most populous first
+        """
+        key = normalize_name(query)
+        if not key or limit <= 0:
+            return []
+        if country is None and len(key) <= PRECOMPUTED_PREFIX_LENGTH and limit <= PRECOMPUTED_RESULTS:
+            return [self.places[position] for position in self._top.get(key, ())[:limit]]
+
+        start, end = self._range(key)
+        positions: Iterable[int] = self._positions[start:end]
+        if country is not None:
+            country = country.upper()
+            positions = (position for position in positions if self.places[position].country == country)
+        return [self.places[position] for position in self._rank(positions, limit)]
+
+    def resolve(self, name: str) -> Place:
+        """
+        Return the place for an exact name.
+
+        The name may be qualified with an admin1 region and/or country code
+        after commas ("Pune, IN", "Washington, District of Columbia, US").
+        Among several places with the same name, the most populous wins.
+
+        Raises:
+            KeyError: If no place matches
+        """
+        base, *qualifiers = [part.strip() for part in name.split(",")]
+        key = normalize_name(base)
+        qualifier_keys = [normalize_name(part) for part in qualifiers if part]
+
+        start = bisect.bisect_left(self._keys, key)
+        end = bisect.bisect_right(self._keys, key, lo=start)
+        candidates = []
+        for position in self._positions[start:end]:
+            place = self.places[position]
+            fields = {normalize_name(place.country), normalize_name(place.admin1)}
+            if all(qualifier in fields for qualifier in qualifier_keys):
+                candidates.append(position)
+        if not candidates:
+            raise KeyError(f"Unknown place: {name}")
+        return self.places[self._rank(candidates, 1)[0]]
+
+    def nearest(self, lat: float, lon: float) -> Tuple[Optional[Place], float]:
+        """
+        Return the place closest to a coordinate.
+
+        Returns:
+            (place, great-circle distance in km), or (None, inf) for an empty
+            gazetteer
+        """
+        best: Optional[Place] = None
+        best_haversine = math.inf
+        phi, lam = math.radians(lat), math.radians(lon)
+        cos_phi = math.cos(phi)
+        for place in self.places:
+            place_phi = math.radians(place.latitude)
+            haversine = (
+                math.sin((place_phi - phi) / 2.0) ** 2
+                + cos_phi * math.cos(place_phi) * math.sin((math.radians(place.longitude) - lam) / 2.0) ** 2
+            )
+            if haversine < best_haversine:
+                best, best_haversine = place, haversine
+        if best is None:
+            return None, math.inf
+        return best, 2.0 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(1.0, best_haversine)))
+
+def load_gazetteer(path: str) -> Gazetteer:
+    """
+    Read a gazetteer TSV file (".gz" is decompressed on the fly).
+
+    Lines starting with '#' and the header line are skipped.
+    """
+    places: List[Place] = []
+    alternate_names: List[List[str]] = []
+    with _open_text(path) as handle:
+        for line in handle:
+            line = line.rstrip("\n")
+            if not line or line.startswith("#") or line.startswith("name\t"):
+                continue
+            fields = line.split("\t")
+            fields += [""] * (len(COLUMNS) - len(fields))
+            name, country, admin1, lat, lon, population, timezone, alternates = fields[:len(COLUMNS)]
+            places.append(Place(
+                name, country, admin1, float(lat), float(lon), int(population or 0), timezone
+            ))
+            alternate_names.append([alias for alias in alternates.split(",") if alias])
+    return Gazetteer(places, alternate_names)
+
+def load_admin1_names(path: str) -> Dict[str, str]:
+    """
+    Read a GeoNames admin1CodesASCII.txt table.
+
+    Returns:
+        Region names keyed by "<country>.<admin1 code>" (e.g. "IN.16": "Maharashtra")
+    """
+    names = {}
+    with _open_text(path) as handle:
+        for line in handle:
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) >= 2:
+                names[fields[0]] = fields[1]
+    return names
+
+def build_gazetteer(
+    geonames_path: str,
+    path: str,
+    min_population: int = 15000,
+    max_alternate_names: int = 5,
+    admin1_codes_path: Optional[str] = None
+) -> int:
+    """
+    Convert a GeoNames dump (e.g. cities15000.txt) to a gazetteer file.
+
+    The dump holds admin1 codes ("16"), which are written as region names
+    ("Maharashtra") using the GeoNames admin1 code table.
+
+    Args:
+        geonames_path: GeoNames "geoname" table, tab-separated, optionally gzipped
+        path: Output file (gzipped when it ends in ".gz")
+        min_population: Places with a smaller population are dropped
+        max_alternate_names: ASCII alternate names kept per place
+        admin1_codes_path: GeoNames admin1CodesASCII.txt (default: the one
+            next to geonames_path)
+
+    Returns:
+        Number of places written
+
+    Raises:
+        ValueError: If the admin1 code table is missing
+    """
+    if admin1_codes_path is None:
+        admin1_codes_path = os.path.join(os.path.dirname(os.path.abspath(geonames_path)), GEONAMES_ADMIN1_FILE)
+    if not os.path.exists(admin1_codes_path):
+        raise ValueError(
+            f"GeoNames admin1 code table not found: {admin1_codes_path} "
+            f"(download {GEONAMES_ADMIN1_FILE} from the GeoNames dump)"
+        )
+    admin1_names = load_admin1_names(admin1_codes_path)
+
+    rows = []
+    with _open_text(geonames_path) as handle:
+        for line in handle:
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) < 18 or fields[6] != GEONAMES_FEATURE_CLASS:
+                continue
+            population = int(fields[14] or 0)
+            if population < min_population:
+                continue
+            name, ascii_name = fields[1], fields[2]
+            aliases = [ascii_name] if ascii_name != name else []
+            for alias in fields[3].split(","):
+                if len(aliases) >= max_alternate_names:
+                    break
+                if alias and alias.isascii() and alias not in aliases and alias != name:
+                    aliases.append(alias)
+            # Regions missing from the table keep their code
+            admin1 = admin1_names.get(f"{fields[8]}.{fields[10]}", fields[10])
+            rows.append((
+                name, fields[8], admin1, f"{float(fields[4]):.4f}", f"{float(fields[5]):.4f}",
+                str(population), fields[17], ",".join(alias.replace("\t", " ") for alias in aliases)
+            ))
+
+    rows.sort(key=lambda row: (normalize_name(row[0]), -int(row[5])))
+    partial = path + ".part"
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(partial, "wt", encoding="utf-8") as handle:
+        handle.write("\t".join(COLUMNS) + "\n")
+        for row in rows:
+            handle.write("\t".join(row) + "\n")
+    os.replace(partial, path)
+    return len(rows)
+
+def find_gazetteer_data() -> str:
+    """Return the gazetteer file to use: $ASTROCSV_GAZETTEER or the bundled one."""
+    return os.environ.get(GAZETTEER_ENV) or PACKAGE_GAZETTEER
+
+_gazetteer: Optional[Gazetteer] = None
+_gazetteer_lock = threading.Lock()
+
+def get_gazetteer() -> Gazetteer:
+    """Return the process-wide gazetteer, loading it on first use."""
+    global _gazetteer
+    if _gazetteer is None:
+        with _gazetteer_lock:
+            if _gazetteer is None:
+                _gazetteer = load_gazetteer(find_gazetteer_data())
+    return _gazetteer
+
+def search_places(query: str, limit: int = 10, country: Optional[str] = None) -> List[Place]:
+    """Prefix search in the process-wide gazetteer."""
+    return get_gazetteer().search(query, limit=limit, country=country)
+
+def resolve_place(name: str) -> Place:
+    """
+    Resolve a place name in the process-wide gazetteer.
+
+    Raises:
+        KeyError: If no place matches
+    """
+    return get_gazetteer().resolve(name)
@@ -0,0 +1,308 @@
+"""
+Planetary ingress events: sign, nakshatra, sub and sub-sub lord changes.
+
+Each planet is followed with calc_ut (longitude and speed) in adaptive
+steps sized from its current speed, so that a step spans a bounded number
+of KP segments, up to a per-planet maximum that is shorter than any
+retrograde loop. Speed changing sign between the ends of a step marks a
+station, which is located by bisection on the speed; the step is split
+there, so each piece is monotonic in longitude. The boundaries between the
+longitudes at the ends of a monotonic piece are exactly the boundaries
+crossed in it, and each crossing is refined with a Newton iteration
+safeguarded by bisection. A retrograde loop therefore produces every
+crossing of the same boundary (direct, retrograde, direct again).
+
+Every planet yields its events in time order; heapq.merge combines them
+into a single sorted stream that can be written out as it is produced.
+"""
+
+import bisect
+import csv
+import heapq
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, TextIO, Tuple
+from zoneinfo import ZoneInfo
+
+import swisseph as swe
+
+from .ephem import IST, _ensure_ephemeris, julian_day_from_datetime, datetime_from_julian_day
+from .mapping_library import get_kp_segment_table, get_kp_boundaries
+from .metrics import SWE_CALLS
+from .planets import GRAHAS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Levels from coarsest to finest; an event's level is the coarsest that changes
+LEVELS = ("sign", "nakshatra", "sub", "sub_sub")
+
+# Longest step per planet in days, well under its shortest retrograde loop
+# (the Sun and Moon never station; the mean node always moves backwards)
+MAX_STEP_DAYS: Dict[str, float] = {
+    "sun": 2.0,
+    "moon": 0.5,
+    "mars": 2.0,
+    "mercury": 1.0,
+    "jupiter": 4.0,
+    "venus": 2.0,
+    "saturn": 4.0,
+    "rahu": 8.0,
+    "ketu": 8.0,
+}
+
+# Target number of segments spanned per step; bounds the boundary list
+# handled per monotonic piece
+SEGMENTS_PER_STEP = 8
+
+# Crossing and station times are refined to this precision (~0.09 s)
+TOLERANCE_DAYS = 1e-6
+
+EVENT_COLUMNS = [
+    "time", "jd_ut", "planet", "level", "longitude", "retrograde",
+    "sign", "nakshatra", "sub_lord", "sub_sub_lord",
+    "previous_sign", "previous_nakshatra", "previous_sub_lord", "previous_sub_sub_lord"
+]
+
+class IngressEvent(NamedTuple):
+    jd_ut: float
+    planet: str
+    level: str
+    longitude: float
+    retrograde: bool
+    segment: int
+    previous_segment: int
+
+    def to_row(self, tz: ZoneInfo = IST) -> Dict[str, Any]:
+        """CSV/Parquet row with the segments' names and lords."""
+        table = get_kp_segment_table()
+        after, before = table[self.segment], table[self.previous_segment]
+        return {
+            "time": datetime_from_julian_day(self.jd_ut, tz).isoformat(),
+            "jd_ut": round(self.jd_ut, 7),
+            "planet": self.planet,
+            "level": self.level,
+            "longitude": round(self.longitude, 6),
+            "retrograde": self.retrograde,
+            "sign": after[2],
+            "nakshatra": after[4],
+            "sub_lord": after[6],
+            "sub_sub_lord": after[7],
+            "previous_sign": before[2],
+            "previous_nakshatra": before[4],
+            "previous_sub_lord": before[6],
+            "previous_sub_sub_lord": before[7],
+        }
+
+def _change_level(before: int, after: int) -> str:
+    """Coarsest level that differs between two segments."""
+    table = get_kp_segment_table()
+    a, b = table[before], table[after]
+    if a[2] != b[2]:
+        return "sign"
+    if a[4] != b[4]:
+        return "nakshatra"
+    if a[6] != b[6]:
+        return "sub"
+    return "sub_sub"
+
+class _Body:
+    """Longitude and speed of one graha (Ketu is opposite Rahu)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        bodies = dict(GRAHAS)
+        self.body = bodies["rahu"] if name == "ketu" else bodies[name]
+        self.offset = 180.0 if name == "ketu" else 0.0
+
+    def __call__(self, jd_ut: float) -> Tuple[float, float]:
+        SWE_CALLS.inc(function="calc_ut")
+        values = swe.calc_ut(jd_ut, self.body, swe.FLG_SWIEPH | swe.FLG_SPEED)[0]
+        return (values[0] + self.offset) % 360.0, values[3]
+
+def _signed_difference(longitude: float, boundary: float) -> float:
+    """longitude - boundary wrapped to [-180, 180)."""
+    return (longitude - boundary + 180.0) % 360.0 - 180.0
+
+def _find_station(body: _Body, low: float, high: float, low_speed: float) -> float:
+    """Time within [low, high] where the speed changes sign."""
+    while high - low > TOLERANCE_DAYS:
+        middle = (low + high) / 2.0
+        _, speed = body(middle)
+        if (speed > 0) == (low_speed > 0):
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2.0
+
+def _find_crossing(body: _Body, boundary: float, low: float, high: float, direction: float, guess: float) -> float:
+    """Time in a monotonic interval when the longitude equals boundary."""
+    t = guess
+    for _ in range(60):
+        longitude, speed = body(t)
+        difference = _signed_difference(longitude, boundary)
+        if difference * direction < 0:
+            low = t
+        else:
+            high = t
+        # Newton step, falling back to bisection when it leaves the bracket
+        if speed:
+            correction = difference / speed
+            if abs(correction) <= TOLERANCE_DAYS:
+                return t - correction
+            if low < t - correction < high:
+                t -= correction
+                continue
+        if high - low <= TOLERANCE_DAYS:
+            break
+        t = (low + high) / 2.0
+    return (low + high) / 2.0
+
+def _boundaries_between(start: float, distance: float) -> List[float]:
+    """KP boundaries passed moving `distance` degrees (signed, |distance| < 360) from start."""
+    boundaries = get_kp_boundaries()
+    crossed = []
+    if distance > 0:
+        end = start + distance
+        index = bisect.bisect_right(boundaries, start)
+        for lap in (0.0, 360.0):
+            while index < len(boundaries) and boundaries[index] + lap <= end:
+                crossed.append(boundaries[index])
+                index += 1
+            index = 0
+            if end < 360.0:
+                break
+    elif distance < 0:
+        end = start + distance
+        index = bisect.bisect_right(boundaries, start) - 1
+        if boundaries[index] == start:
+            index -= 1  # sitting on a boundary: not crossed again
+        for lap in (0.0, -360.0):
+            while index >= 0 and boundaries[index] + lap > end:
+                crossed.append(boundaries[index])
+                index -= 1
+            index = len(boundaries) - 1
+            if end >= 0.0:
+                break
+    return crossed
+
+def _segment_index(longitude: float) -> int:
+    return bisect.bisect_right(get_kp_boundaries(), longitude % 360.0) - 1
+
+def planet_events(planet: str, start_jd: float, end_jd: float) -> Iterator[IngressEvent]:
+    """
+    Yield every segment change of one planet between two Julian Days (UT), in time order.
+
+    Args:
+        planet: Graha name (sun, moon, mars, mercury, jupiter, venus, saturn, rahu, ketu)
+        start_jd: Start of the span (UT)
+        end_jd: End of the span (UT)
+    """
+    if planet not in MAX_STEP_DAYS:
+        raise ValueError(f"Unknown planet: {planet}")
+    _ensure_ephemeris()
+    body = _Body(planet)
+    segment_width = 360.0 / len(get_kp_boundaries())
+    max_step = MAX_STEP_DAYS[planet]
+
+    t0 = start_jd
+    l0, v0 = body(t0)
+    while t0 < end_jd:
+        step = min(max_step, SEGMENTS_PER_STEP * segment_width / max(abs(v0), 1e-9))
+        t1 = min(t0 + step, end_jd)
+        l1, v1 = body(t1)
+
+        pieces = [(t0, l0, v0, t1, l1)]
+        if (v0 > 0) != (v1 > 0):
+            station = _find_station(body, t0, t1, v0)
+            ls, _ = body(station)
+            pieces = [(t0, l0, v0, station, ls), (station, ls, v1, t1, l1)]
+
+        for a, la, va, b, lb in pieces:
+            a0 = a
+            distance = _signed_difference(lb, la)
+            direction = 1.0 if distance > 0 else -1.0
+            for boundary in _boundaries_between(la, distance):
+                # Linear interpolation over the piece seeds the solver
+                fraction = abs(_signed_difference(boundary, la)) / abs(distance)
+                jd = _find_crossing(body, boundary, a, b, direction, min(max(a0 + fraction * (b - a0), a), b))
+                a = jd  # later boundaries in this piece are crossed after this one
+                # Entering the segment that starts (direct) or ends (retrograde) at the boundary
+                after = _segment_index(boundary if direction > 0 else boundary - 1e-9)
+                before = _segment_index(boundary - 1e-9 if direction > 0 else boundary)
+                yield IngressEvent(jd, planet, _change_level(before, after), boundary, direction < 0, after, before)
+
+        t0, l0, v0 = t1, l1, v1
+
+def ingress_events(
+    start: datetime,
+    end: datetime,
+    planets: Optional[Sequence[str]] = None,
+    level: str = "sub_sub"
+) -> Iterator[IngressEvent]:
+    """
+    Merged, time-ordered ingress events of several planets.
+
+    Args:
+        start: Start of the span (timezone-aware)
+        end: End of the span (timezone-aware)
+        planets: Graha names (default: all nine)
+        level: Finest level to include; "sign" yields sign changes only,
+            "sub_sub" every change
+
+    Returns:
+        Iterator of IngressEvent sorted by time
+    """
+    if level not in LEVELS:
+        raise ValueError(f"level must be one of {', '.join(LEVELS)}")
+    planets = list(planets or MAX_STEP_DAYS)
+    unknown = [planet for planet in planets if planet not in MAX_STEP_DAYS]
+    if unknown:
+        raise ValueError(f"Unknown planet: {', '.join(unknown)}")
+    allowed = set(LEVELS[:LEVELS.index(level) + 1])
+    start_jd, end_jd = julian_day_from_datetime(start), julian_day_from_datetime(end)
+    streams = [
+        (event for event in planet_events(planet, start_jd, end_jd) if event.level in allowed)
+        for planet in planets
+    ]
+    return heapq.merge(*streams, key=lambda event: event.jd_ut)
+
+def write_events_csv(events: Iterable[IngressEvent], handle: TextIO, tz: ZoneInfo = IST) -> int:
+    """Stream events to an open CSV file; returns the number written."""
+    writer = csv.DictWriter(handle, fieldnames=EVENT_COLUMNS)
+    writer.writeheader()
+    count = 0
+    for event in events:
+        writer.writerow(event.to_row(tz))
+        count += 1
+    return count
+
+def write_events_parquet(events: Iterable[IngressEvent], path: str, tz: ZoneInfo = IST, batch_size: int = 10000) -> int:
+    """
+    Stream events to a Parquet file in row groups of batch_size.
+
+    Raises:
+        RuntimeError: If pyarrow is not installed
+    """
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("Parquet output requires pyarrow (pip install pyarrow)")
+    schema = pa.schema([
+        (name, pa.float64() if name in ("jd_ut", "longitude") else pa.bool_() if name == "retrograde" else pa.string())
+        for name in EVENT_COLUMNS
+    ])
+    count = 0
+    batch: List[Dict[str, Any]] = []
+    with pq.ParquetWriter(path, schema) as writer:
+        for event in events:
+            batch.append(event.to_row(tz))
+            if len(batch) >= batch_size:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                count += len(batch)
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            count += len(batch)
+    return count
@@ -0,0 +1,532 @@
+"""
+Background job subsystem for long-running exports.
+
+Jobs are persisted in SQLite so their state survives restarts, run on a
+bounded thread pool, are deduplicated by a hash of their specification and
+the engine version, and can be cancelled while queued or running. Runners
+registered with isolated=True (CPU-bound ones such as exports) execute in a
+process pool instead, so they never compete with request handling for the
+GIL of the serving process; their context writes progress to the same
+SQLite database and reads cancellation back from it. An on_finish hook
+runs once a job is finished, e.g. to delete an uploaded input.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+# A runner receives the job spec, the artifact path to write, and a context
+# for progress reporting and cancellation checks
+JobRunner = Callable[[Dict[str, Any], str, "JobContext"], None]
+# Called with the spec once a job reaches a finished state
+JobFinisher = Callable[[Dict[str, Any]], None]
+
+class JobCancelled(Exception):
+    """Raised inside a runner when its job has been cancelled."""
+
+class JobContext:
+    """Progress reporting and cancellation handle passed to job runners."""
+
+    # Minimum seconds between progress writes to the database
+    PROGRESS_INTERVAL = 0.5
+
+    def __init__(self, store: "JobStore", artifact_dir: str, job_id: str, is_cancelled: Callable[[], bool]):
+        self._store = store
+        self._artifact_dir = artifact_dir
+        self._is_cancelled = is_cancelled
+        self.job_id = job_id
+        self._last_write = 0.0
+
+    def sidecar_path(self, suffix: str) -> str:
+        """Path for an extra output of the job next to its artifact, e.g. "rejects.csv"."""
+        return os.path.join(self._artifact_dir, f"{self.job_id}.{suffix}")
+
+    def set_total(self, total: int) -> None:
+        """Record how many work units the job has."""
+        self._store.update(self.job_id, progress_total=total)
+
+    def advance(self, done: int) -> None:
+        """
+        Record progress and raise JobCancelled if the job was cancelled.
+
+        Args:
+            done: Number of work units completed so far
+        """
+        if self._is_cancelled():
+            raise JobCancelled(self.job_id)
+        now = time.monotonic()
+        if now - self._last_write >= self.PROGRESS_INTERVAL:
+            self._store.update(self.job_id, progress_done=done)
+            self._last_write = now
+
+def _run_in_process(runner: JobRunner, db_path: str, artifact_dir: str, job_id: str, spec: Dict[str, Any], path: str) -> None:
+    """Execute a runner in a pool process, reading cancellation from the stored job state."""
+    store = JobStore(db_path)
+    last_check = 0.0
+    cancelled = False
+
+    def is_cancelled() -> bool:
+        nonlocal last_check, cancelled
+        now = time.monotonic()
+        if not cancelled and now - last_check >= JobContext.PROGRESS_INTERVAL:
+            last_check = now
+            job = store.get(job_id)
+            cancelled = job is None or job["state"] == CANCELLED
+        return cancelled
+
+    try:
+        runner(spec, path, JobContext(store, artifact_dir, job_id, is_cancelled))
+    finally:
+        store.close()
+
+def spec_hash(kind: str, spec: Dict[str, Any]) -> str:
+    """
+    Return a stable hash identifying a job kind and specification.
+
+    The engine version is part of the hash, so artifacts built by another
+    engine are never reused, like entries of the result cache and memo.
+    """
+    from .ephem import ENGINE_VERSION
+
+    canonical = json.dumps(
+        {"kind": kind, "spec": spec, "engine": ENGINE_VERSION}, sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+class JobStore:
+    """SQLite persistence for job records."""
+
+    COLUMNS = (
+        "id", "kind", "spec", "spec_hash", "state", "progress_done", "progress_total",
+        "artifact", "error", "created_at", "updated_at"
+    )
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    spec TEXT NOT NULL,
+                    spec_hash TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    progress_done INTEGER NOT NULL DEFAULT 0,
+                    progress_total INTEGER NOT NULL DEFAULT 0,
+                    artifact TEXT,
+                    error TEXT,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_spec_hash ON jobs (spec_hash)")
+
+    def _row_to_job(self, row: Optional[Tuple]) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        job = dict(zip(self.COLUMNS, row))
+        job["spec"] = json.loads(job["spec"])
+        return job
+
+    def create(self, kind: str, spec: Dict[str, Any], digest: str) -> Dict[str, Any]:
+        """Insert a new queued job and return it."""
+        now = datetime.now().isoformat()
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, spec, spec_hash, state, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, json.dumps(spec, sort_keys=True), digest, QUEUED, now, now)
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job by id, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._row_to_job(row)
+
+    def find_reusable(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Return the newest queued, running or succeeded job with this spec hash."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM jobs "
+                "WHERE spec_hash = ? AND state IN (?, ?, ?) ORDER BY created_at DESC LIMIT 1",
+                (digest, QUEUED, RUNNING, SUCCEEDED)
+            ).fetchone()
+        return self._row_to_job(row)
+
+    def list_by_state(self, *states: str) -> List[Dict[str, Any]]:
+        """Return jobs in any of the given states, oldest first."""
+        placeholders = ", ".join("?" for _ in states)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM jobs "
+                f"WHERE state IN ({placeholders}) ORDER BY created_at",
+                states
+            ).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def update(self, job_id: str, expected_states: Sequence[str] = (), **fields: Any) -> bool:
+        """
+        Update columns of a job.
+
+        Args:
+            job_id: Job to update
+            expected_states: If given, update only while the job is in one of
+                these states (compare-and-set of the state transition)
+            **fields: Column values
+
+        Returns:
+            Whether the job was updated
+        """
+        fields["updated_at"] = datetime.now().isoformat()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        query = f"UPDATE jobs SET {assignments} WHERE id = ?"
+        parameters: Tuple[Any, ...] = (*fields.values(), job_id)
+        if expected_states:
+            query += f" AND state IN ({', '.join('?' for _ in expected_states)})"
+            parameters += tuple(expected_states)
+        with self._lock:
+            cursor = self._conn.execute(query, parameters)
+        return cursor.rowcount > 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+class JobManager:
+    """
+    Submits, runs, tracks and cancels jobs.
+
+    Args:
+        db_path: SQLite database file for job state
+        artifact_dir: Directory for job output files
+        max_workers: Number of jobs run concurrently (threads, and processes
+            for isolated runners)
+    """
+
+    def __init__(self, db_path: str, artifact_dir: str, max_workers: int = 2):
+        self.store = JobStore(db_path)
+        self.artifact_dir = artifact_dir
+        os.makedirs(artifact_dir, exist_ok=True)
+        self.max_workers = max_workers
+        self._runners: Dict[str, Tuple[JobRunner, str, bool, Optional[JobFinisher]]] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="astro-job")
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._cancelled: set = set()
+        self._lock = threading.Lock()
+
+    def register_runner(
+        self,
+        kind: str,
+        runner: JobRunner,
+        extension: str = "csv",
+        isolated: bool = False,
+        on_finish: Optional[JobFinisher] = None
+    ) -> None:
+        """
+        Register the function that executes jobs of a given kind.
+
+        Args:
+            kind: Job kind
+            runner: Module-level function when isolated (it is pickled)
+            extension: Artifact file extension
+            isolated: Run in a process pool instead of on a thread
+            on_finish: Called with the spec once a job succeeds, fails or is
+                cancelled (also when cancelled before it started), e.g. to
+                delete its input
+        """
+        self._runners[kind] = (runner, extension, isolated, on_finish)
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._process_pool
+
+    def resume(self) -> int:
+        """
+        Re-queue jobs left queued or running by a previous process.
+
+        Running jobs restart from the beginning since partial artifacts are
+        never kept.
+
+        Returns:
+            Number of jobs re-queued
+        """
+        jobs = self.store.list_by_state(QUEUED, RUNNING)
+        for job in jobs:
+            self.store.update(job["id"], state=QUEUED, progress_done=0)
+            self._executor.submit(self._run, job["id"])
+        return len(jobs)
+
+    def submit(
+        self,
+        kind: str,
+        spec: Dict[str, Any],
+        dedupe_spec: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Submit a job, reusing an identical queued, running or finished one.
+
+        Args:
+            kind: Registered job kind
+            spec: JSON-serializable job specification
+            dedupe_spec: What makes two jobs identical, when spec has fields
+                that differ between identical jobs such as an upload path
+                (default: spec)
+
+        Returns:
+            Tuple of (job, deduplicated)
+        """
+        if kind not in self._runners:
+            raise ValueError(f"Unknown job kind: {kind}")
+        digest = spec_hash(kind, spec if dedupe_spec is None else dedupe_spec)
+        with self._lock:
+            existing = self.store.find_reusable(digest)
+            if existing is not None:
+                artifact_missing = (
+                    existing["state"] == SUCCEEDED
+                    and not (existing["artifact"] and os.path.exists(existing["artifact"]))
+                )
+                if not artifact_missing:
+                    return existing, True
+            job = self.store.create(kind, spec, digest)
+        self._executor.submit(self._run, job["id"])
+        return job, False
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job by id, or None."""
+        return self.store.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Cancel a queued or running job.
+
+        Running jobs stop at their next progress check. Finished jobs are
+        left unchanged, including one that finishes while this call runs.
+
+        Returns:
+            The job after cancellation, or None if it does not exist
+        """
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+        if job["state"] not in FINISHED_STATES:
+            with self._lock:
+                self._cancelled.add(job_id)
+            self.store.update(job_id, expected_states=(QUEUED, RUNNING), state=CANCELLED)
+        return self.store.get(job_id)
+
+    def is_cancelled(self, job_id: str) -> bool:
+        """Check whether cancellation was requested for a job."""
+        return job_id in self._cancelled
+
+    def _run(self, job_id: str) -> None:
+        """Execute one job on a worker thread."""
+        try:
+            job = self.store.get(job_id)
+            if job is None or job["state"] != QUEUED:
+                return
+            runner, extension, isolated, _ = self._runners[job["kind"]]
+            artifact = os.path.join(self.artifact_dir, f"{job_id}.{extension}")
+            partial = artifact + ".part"
+            # Every transition is conditional so a cancel that lands between
+            # a check and the write is never overwritten
+            if not self.store.update(job_id, expected_states=(QUEUED,), state=RUNNING):
+                return
+            try:
+                if isolated:
+                    pool = self._get_process_pool()
+                    try:
+                        pool.submit(
+                            _run_in_process, runner, self.store.db_path, self.artifact_dir, job_id, job["spec"], partial
+                        ).result()
+                    except BrokenProcessPool:
+                        with self._lock:
+                            if self._process_pool is pool:
+                                self._process_pool = None
+                        raise
+                else:
+                    runner(job["spec"], partial, JobContext(self.store, self.artifact_dir, job_id, lambda: self.is_cancelled(job_id)))
+                if self.is_cancelled(job_id):
+                    raise JobCancelled(job_id)
+                os.replace(partial, artifact)
+                total = self.store.get(job_id)["progress_total"]
+                if not self.store.update(
+                    job_id, expected_states=(RUNNING,), state=SUCCEEDED, artifact=artifact, progress_done=total
+                ):
+                    os.remove(artifact)
+            except JobCancelled:
+                self.store.update(job_id, expected_states=(RUNNING,), state=CANCELLED)
+            except Exception as e:
+                self.store.update(job_id, expected_states=(RUNNING,), state=FAILED, error=str(e))
+            finally:
+                if os.path.exists(partial):
+                    os.remove(partial)
+        finally:
+            with self._lock:
+                self._cancelled.discard(job_id)
+            self._finish(job_id)
+
+    def _finish(self, job_id: str) -> None:
+        """Call the on_finish hook of a job that reached a finished state."""
+        job = self.store.get(job_id)
+        if job is None or job["state"] not in FINISHED_STATES:
+            return
+        on_finish = self._runners[job["kind"]][3]
+        if on_finish is not None:
+            on_finish(job["spec"])
+
+    def shutdown(self) -> None:
+        """Stop accepting work; running jobs are resumed on next start."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+        self.store.close()
+
+EXPORT_JOB_KIND = "export"
+
+def run_export_job(spec: Dict[str, Any], artifact_path: str, context: JobContext) -> None:
+    """
+    Export ascendant rows for several locations over a date range to CSV.
+
+    Spec fields:
+        locations: List of {"latitude", "longitude"} (optionally "name")
+        start_date, end_date: Inclusive range in YYYY-MM-DD format
+        include_degree_buckets: Also write the 720 bucket rows per day
+        include_planets: Add the nine grahas at sunrise to ascendant rows
+        timezone: Optional IANA name or "auto" (default IST)
+        cluster_radius_km: Optional radius for sharing sunrise work between
+            nearby locations (see astrocsv.clustering)
+        max_sunrise_error: Optional interpolation error bound in seconds
+
+    Rows are appended per location-day, so memory does not grow with the
+    size of the export (with clustering, results of a cluster are held
+    until its last member is written).
+    """
+    from .ephem import get_sunrise_times, get_ascendant_at_time
+    from .mapping_library import get_sign_and_lord, get_nakshatra_and_lord, get_kp_sub_lords
+    from .csvout import generate_csv_rows_for_date, create_ascendant_row, append_csv_rows
+    from .timezones import get_timezone
+
+    start_date = datetime.strptime(spec["start_date"], "%Y-%m-%d").date()
+    end_date = datetime.strptime(spec["end_date"], "%Y-%m-%d").date()
+    if start_date > end_date:
+        raise ValueError("Start date must be before or equal to end date")
+    locations = spec["locations"]
+    include_buckets = spec.get("include_degree_buckets", False)
+    include_planets = spec.get("include_planets", False)
+    if include_planets:
+        from .planets import planet_columns
+    days = (end_date - start_date).days + 1
+    context.set_total(days * len(locations))
+
+    coordinates = [(float(location["latitude"]), float(location["longitude"])) for location in locations]
+    zones = [get_timezone(spec.get("timezone"), lat, lon) for lat, lon in coordinates]
+    clusters = None
+    if spec.get("cluster_radius_km"):
+        from .clustering import LocationClusters, DEFAULT_MAX_SUNRISE_ERROR_SECONDS
+        clusters = LocationClusters(
+            coordinates, spec["cluster_radius_km"], zones,
+            spec.get("max_sunrise_error") or DEFAULT_MAX_SUNRISE_ERROR_SECONDS
+        )
+    # Cluster id -> per-day results of members not yet written
+    pending: Dict[int, List[Dict[int, Any]]] = {}
+
+    done = 0
+    with open(artifact_path, "w", newline="") as handle:
+        write_header = True
+        for index, (lat, lon) in enumerate(coordinates):
+            tz = zones[index]
+            cluster_days = None
+            if clusters is not None:
+                cluster_id = clusters.cluster_of[index]
+                if cluster_id not in pending:
+                    pending[cluster_id] = [
+                        clusters.compute_day(cluster_id, start_date + timedelta(days=offset))
+                        for offset in range(days)
+                    ]
+                cluster_days = pending[cluster_id]
+                if index == clusters.clusters[cluster_id][-1]:
+                    del pending[cluster_id]
+            for offset in range(days):
+                current_date = start_date + timedelta(days=offset)
+                if cluster_days is not None:
+                    sunrise, next_sunrise, ascendant = cluster_days[offset].pop(index)
+                else:
+                    sunrise, next_sunrise = get_sunrise_times(lat, lon, current_date, tz)
+                    ascendant = get_ascendant_at_time(lat, lon, sunrise)
+                args = (
+                    current_date, sunrise, next_sunrise, lat, lon, ascendant,
+                    *get_sign_and_lord(ascendant), *get_nakshatra_and_lord(ascendant),
+                    *get_kp_sub_lords(ascendant),
+                    planet_columns(sunrise) if include_planets else None
+                )
+                if include_buckets:
+                    rows = generate_csv_rows_for_date(*args)
+                else:
+                    rows = [create_ascendant_row(*args)]
+                append_csv_rows(rows, handle, write_header, include_planets)
+                write_header = False
+
+                done += 1
+                context.advance(done)
+
+CHART_BATCH_JOB_KIND = "chart_batch"
+CHART_BATCH_REJECTS = "rejects.csv"
+
+def remove_job_input(spec: Dict[str, Any]) -> None:
+    """on_finish hook deleting the uploaded file named by spec["input"]."""
+    if os.path.exists(spec["input"]):
+        os.remove(spec["input"])
+
+def run_chart_batch_job(spec: Dict[str, Any], artifact_path: str, context: JobContext) -> None:
+    """
+    Compute natal charts for an uploaded CSV of birth records.
+
+    Spec fields:
+        input: Path of the uploaded CSV (see astrocsv.chart_batch for columns)
+        input_sha256: Hash of the upload, to deduplicate on instead of input
+        timezone: Optional IANA name or "auto" for naive birth times (default IST)
+        workers: Optional number of processes (default: CPU count)
+
+    Skipped records and their reasons are written to the job's
+    CHART_BATCH_REJECTS sidecar file. Progress counts records.
+    """
+    from .chart_batch import count_records, write_chart_batch
+
+    context.set_total(count_records(spec["input"]))
+    write_chart_batch(
+        spec["input"], artifact_path, context.sidecar_path(CHART_BATCH_REJECTS),
+        timezone=spec.get("timezone"),
+        workers=spec.get("workers") or os.cpu_count() or 1,
+        progress=context.advance
+    )
@@ -0,0 +1,268 @@
+"""
+Live current-ascendant updates with server-side fan-out.
+
+One background task per subscribed location and zone computes the current ascendant
+and the next KP boundary crossing, and pushes each snapshot to every
+subscriber of that location. The cost is one computation per location per
+tick, however many clients are watching.
+
+If a snapshot cannot be computed (Placidus houses are undefined beyond the
+polar circles), subscribers receive one error item ({"error": message}) and
+the location's topic is closed.
+"""
+
+import asyncio
+import bisect
+from datetime import datetime
+from typing import Any, Dict, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
+
+from .ephem import (
+    get_ascendant_at_jd, julian_day_from_datetime, datetime_from_julian_day, IST
+)
+from .mapping_library import get_kp_segment_table, get_kp_boundaries
+from .cache import quantize_coordinate
+
+# The ascendant advances about 361° per sidereal day on average
+MEAN_ASCENDANT_RATE = 360.98564736629  # degrees per day
+
+def _segment_at(degree: float) -> Tuple[float, float, str, str, str, str, str, str]:
+    """Return the KP segment containing a degree."""
+    index = bisect.bisect_right(get_kp_boundaries(), degree % 360.0) - 1
+    return get_kp_segment_table()[index]
+
+def _degrees_ahead(start: float, target: float) -> float:
+    """Forward angular distance from start to target in [0, 360)."""
+    return (target - start) % 360.0
+
+def find_next_ascendant_crossing(
+    lat: float,
+    lon: float,
+    jd_ut: float,
+    tolerance_days: float = 0.1 / 86400.0
+) -> Tuple[float, float]:
+    """
+    Find when the ascendant next crosses a sign, nakshatra, sub or sub-sub boundary.
+
+    The ascendant only moves forward, so the crossing is bracketed by stepping
+    ahead at the mean rate and then refined by bisection.
+
+    Args:
+        lat: Latitude in decimal degrees
+        lon: Longitude in decimal degrees
+        jd_ut: Julian Day (UT) to search from
+        tolerance_days: Bisection tolerance (default 0.1 s)
+
+    Returns:
+        Tuple of (crossing_jd_ut, boundary_degree)
+    """
+    ascendant = get_ascendant_at_jd(lat, lon, jd_ut)
+    boundary = _segment_at(ascendant)[1] % 360.0
+    distance = _degrees_ahead(ascendant, boundary)
+
+    # Bracket: step until the boundary has been passed. The ascendant's
+    # speed varies over the day, so allow for several mean-rate steps.
+    low = jd_ut
+    step = max(distance / MEAN_ASCENDANT_RATE, 1.0 / 86400.0)
+    high = low + step
+    while _degrees_ahead(ascendant, get_ascendant_at_jd(lat, lon, high)) < distance:
+        low = high
+        step *= 2.0
+        high = low + step
+
+    # Bisect on the forward distance travelled since jd_ut
+    while high - low > tolerance_days:
+        middle = (low + high) / 2.0
+        if _degrees_ahead(ascendant, get_ascendant_at_jd(lat, lon, middle)) < distance:
+            low = middle
+        else:
+            high = middle
+    return high, boundary
+
+def compute_live_snapshot(
+    lat: float,
+    lon: float,
+    now: Optional[datetime] = None,
+    tz: Optional[ZoneInfo] = None
+) -> Dict[str, Any]:
+    """
+    Compute the current ascendant, its lords and the next boundary crossing.
+
+    Args:
+        lat: Latitude in decimal degrees
+        lon: Longitude in decimal degrees
+        now: Instant to compute for (default: current time)
+        tz: Zone of the snapshot times (default IST)
+
+    Returns:
+        JSON-serializable snapshot dictionary
+    """
+    tz = tz or IST
+    now = now or datetime.now(tz)
+    jd_ut = julian_day_from_datetime(now)
+    ascendant = get_ascendant_at_jd(lat, lon, jd_ut)
+    _, _, sign, sign_lord, nakshatra, nakshatra_lord, sub_lord, sub_sub_lord = _segment_at(ascendant)
+
+    crossing_jd, boundary = find_next_ascendant_crossing(lat, lon, jd_ut)
+    _, _, next_sign, next_sign_lord, next_nakshatra, next_nakshatra_lord, next_sub_lord, next_sub_sub_lord = \
+        _segment_at(boundary)
+
+    return {
+        "latitude": lat,
+        "longitude": lon,
+        "timezone": tz.key,
+        "time": now.astimezone(tz).isoformat(),
+        "ascendant": round(ascendant, 3),
+        "sign": sign,
+        "sign_lord": sign_lord,
+        "nakshatra": nakshatra,
+        "nakshatra_lord": nakshatra_lord,
+        "sub_lord": sub_lord,
+        "sub_sub_lord": sub_sub_lord,
+        "next_change": {
+            "time": datetime_from_julian_day(crossing_jd, tz).isoformat(),
+            "jd_ut": crossing_jd,
+            "ascendant_degree": round(boundary, 6),
+            "sign": next_sign,
+            "sign_lord": next_sign_lord,
+            "nakshatra": next_nakshatra,
+            "nakshatra_lord": next_nakshatra_lord,
+            "sub_lord": next_sub_lord,
+            "sub_sub_lord": next_sub_sub_lord
+        }
+    }
+
+TopicKey = Tuple[float, float, str]
+
+class _Topic:
+    """Subscribers and background task for one quantized location and zone."""
+
+    def __init__(self, lat: float, lon: float, tz: ZoneInfo):
+        self.lat = lat
+        self.lon = lon
+        self.tz = tz
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.task: Optional[asyncio.Task] = None
+        self.last_snapshot: Optional[Dict[str, Any]] = None
+
+class LiveAscendantHub:
+    """
+    Fan-out hub for live ascendant snapshots.
+
+    Args:
+        tick_seconds: Maximum time between snapshots for a location
+        crossings_only: Publish only at boundary crossings instead of every tick
+        queue_size: Snapshots buffered per subscriber; slow subscribers lose
+            the oldest snapshot rather than blocking the others
+        executor: Executor for the ephemeris work (None: loop default)
+        coord_decimals: Coordinate quantization for grouping subscribers
+    """
+
+    def __init__(
+        self,
+        tick_seconds: float = 5.0,
+        crossings_only: bool = False,
+        queue_size: int = 4,
+        executor=None,
+        coord_decimals: int = 4
+    ):
+        self.tick_seconds = tick_seconds
+        self.crossings_only = crossings_only
+        self.queue_size = queue_size
+        self.executor = executor
+        self.coord_decimals = coord_decimals
+        self._topics: Dict[TopicKey, _Topic] = {}
+        self.computations = 0
+        self.published = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def subscribe(self, lat: float, lon: float, tz: Optional[ZoneInfo] = None) -> Tuple[TopicKey, asyncio.Queue]:
+        """
+        Subscribe to snapshots for a location, with times in a zone (default IST).
+
+        The latest snapshot, if any, is delivered immediately.
+
+        Returns:
+            Tuple of (topic key, queue of snapshots) for unsubscribe()
+        """
+        tz = tz or IST
+        lat = quantize_coordinate(lat, self.coord_decimals)
+        lon = quantize_coordinate(lon, self.coord_decimals)
+        key = (lat, lon, tz.key)
+        topic = self._topics.get(key)
+        if topic is None:
+            topic = self._topics[key] = _Topic(lat, lon, tz)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        topic.subscribers.add(queue)
+        if topic.last_snapshot is not None:
+            queue.put_nowait(topic.last_snapshot)
+        if topic.task is None or topic.task.done():
+            topic.task = asyncio.ensure_future(self._run_topic(key, topic))
+        return key, queue
+
+    def unsubscribe(self, key: TopicKey, queue: asyncio.Queue) -> None:
+        """Remove a subscriber; the location's task stops when none remain."""
+        topic = self._topics.get(key)
+        if topic is None:
+            return
+        topic.subscribers.discard(queue)
+        if not topic.subscribers:
+            if topic.task is not None:
+                topic.task.cancel()
+            del self._topics[key]
+
+    def _publish(self, topic: _Topic, snapshot: Dict[str, Any]) -> None:
+        topic.last_snapshot = snapshot
+        for queue in list(topic.subscribers):
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(snapshot)
+            self.published += 1
+
+    def _close(self, key: TopicKey, topic: _Topic, message: str) -> None:
+        """Send an error item to every subscriber and drop the topic."""
+        self.errors += 1
+        error = {"error": message}
+        for queue in list(topic.subscribers):
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(error)
+        topic.subscribers.clear()
+        if self._topics.get(key) is topic:
+            del self._topics[key]
+
+    async def _run_topic(self, key: TopicKey, topic: _Topic) -> None:
+        """Compute and publish snapshots for one location while it has subscribers."""
+        loop = asyncio.get_running_loop()
+        while topic.subscribers:
+            try:
+                snapshot = await loop.run_in_executor(
+                    self.executor, compute_live_snapshot, topic.lat, topic.lon, None, topic.tz
+                )
+            except Exception as e:
+                self._close(key, topic, f"Cannot compute the ascendant at ({topic.lat}, {topic.lon}): {e}")
+                return
+            self.computations += 1
+            self._publish(topic, snapshot)
+
+            # Sleep until the next tick or the next crossing, whichever is
+            # first; in crossings-only mode wait for the crossing itself
+            now_jd = julian_day_from_datetime(datetime.now(IST))
+            until_crossing = max(0.0, (snapshot["next_change"]["jd_ut"] - now_jd) * 86400.0)
+            delay = until_crossing if self.crossings_only else min(self.tick_seconds, until_crossing)
+            # Land just after the boundary so the new segment is reported
+            await asyncio.sleep(delay + 0.05)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hub counters."""
+        return {
+            "locations": len(self._topics),
+            "subscribers": sum(len(topic.subscribers) for topic in self._topics.values()),
+            "computations": self.computations,
+            "published": self.published,
+            "dropped": self.dropped,
+            "errors": self.errors
+        }
@@ -4,6 +4,7 @@ This module provides reliable astrological calculations for multiple locations.
 """
 
 import swisseph as swe
+from functools import lru_cache
 from typing import Dict, Tuple, List, Any
 import math
 
@@ -241,6 +242,21 @@ def generate_ascendant_sub_sub_lord_changes() -> List[Dict[str, Any]]:
     Returns:
         List of dictionaries with astrological data at Sub Sub Lord change points
     """
+    # The table only depends on the fixed zodiac divisions; copy the cached
+    # rows so callers may modify them freely
+    return [dict(change) for change in get_ascendant_change_table()]
+
+@lru_cache(maxsize=1)
+def get_ascendant_change_table() -> Tuple[Dict[str, Any], ...]:
+    """
+    Get the cached Sub Sub Lord change table.
+    
+    Same rows as generate_ascendant_sub_sub_lord_changes(), computed once per
+    process. The rows are shared and must be treated as read-only.
+    
+    Returns:
+        Tuple of dictionaries with astrological data at Sub Sub Lord change points
+    """
     changes = []
     
     # Generate data at finer intervals to detect changes accurately
@@ -288,7 +304,7 @@ def generate_ascendant_sub_sub_lord_changes() -> List[Dict[str, Any]]:
                 }) if previous_data else 'initial'
             })
     
-    return changes
+    return tuple(changes)
 
 def _determine_change_type(previous: Dict[str, Any], current: Dict[str, Any]) -> str:
     """
@@ -317,6 +333,61 @@ def _determine_change_type(previous: Dict[str, Any], current: Dict[str, Any]) ->
     
     return "; ".join(changes) if changes else "no_change"
 
+# Exact span of one nakshatra in degrees (13°20')
+NAKSHATRA_SPAN = 360.0 / 27.0
+
+@lru_cache(maxsize=1)
+def get_kp_segment_table() -> Tuple[Tuple[float, float, str, str, str, str, str, str], ...]:
+    """
+    Get the zodiac divided at every sign, nakshatra, sub and sub-sub boundary.
+    
+    Boundaries are exact (Vimshottari proportions of a 360/27° nakshatra), so
+    the table can be used to solve for boundary crossing times. Lords of each
+    segment are taken at its midpoint with the standard lookups above.
+    
+    Returns:
+        Tuple of (start_deg, end_deg, sign, sign_lord, nakshatra, nakshatra_lord,
+        sub_lord, sub_sub_lord), contiguous from 0° to 360°
+    """
+    total_weight = sum(VIMSHOTTARI_WEIGHTS.values())  # 120
+    boundaries = {30.0 * i for i in range(12)}
+    
+    for nakshatra_index in range(27):
+        nakshatra_start = nakshatra_index * NAKSHATRA_SPAN
+        lord_index = VIMSHOTTARI_SEQUENCE.index(NAKSHATRAS[nakshatra_index][3])
+        sub_start = nakshatra_start
+        for i in range(9):
+            sub_lord = VIMSHOTTARI_SEQUENCE[(lord_index + i) % 9]
+            sub_span = VIMSHOTTARI_WEIGHTS[sub_lord] / total_weight * NAKSHATRA_SPAN
+            sub_lord_index = VIMSHOTTARI_SEQUENCE.index(sub_lord)
+            sub_sub_start = sub_start
+            for j in range(9):
+                boundaries.add(round(sub_sub_start, 9))
+                sub_sub_lord = VIMSHOTTARI_SEQUENCE[(sub_lord_index + j) % 9]
+                sub_sub_start += VIMSHOTTARI_WEIGHTS[sub_sub_lord] / total_weight * sub_span
+            sub_start += sub_span
+    
+    starts = sorted(boundaries)
+    segments = []
+    for index, start in enumerate(starts):
+        end = starts[index + 1] if index + 1 < len(starts) else 360.0
+        midpoint = (start + end) / 2.0
+        sign, sign_lord = get_sign_and_lord(midpoint)
+        nakshatra, nakshatra_lord = get_nakshatra_and_lord(midpoint)
+        sub_lord, sub_sub_lord = get_kp_sub_lords(midpoint)
+        segments.append((start, end, sign, sign_lord, nakshatra, nakshatra_lord, sub_lord, sub_sub_lord))
+    return tuple(segments)
+
+@lru_cache(maxsize=1)
+def get_kp_boundaries() -> Tuple[float, ...]:
+    """
+    Get the start degree of every segment in get_kp_segment_table().
+    
+    Returns:
+        Sorted tuple of boundary degrees in [0, 360)
+    """
+    return tuple(segment[0] for segment in get_kp_segment_table())
+
 def calculate_ascendant_swisseph(jd: float, lat: float, lon: float) -> float:
     """
     Calculate ascendant using Swiss Ephemeris for maximum accuracy.
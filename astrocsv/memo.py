@@ -0,0 +1,149 @@
+"""
+Memoization of sunrise and ascendant calculations.
+
+Results are kept in a bounded in-memory LRU and, optionally, in a SQLite
+store shared between runs and processes, so regenerating the same
+(location, date) rows becomes a cache read.
+
+Coordinate quantization (off by default) rounds latitude and longitude to a
+number of decimals before computing, so nearby requests share entries. The
+coordinate error is at most 0.5 * 10**-decimals degrees per axis, which for
+latitudes within +/-60 degrees bounds the error at about:
+
+    decimals   sunrise time   ascendant
+    2          4.7 s          0.04 deg
+    3          0.47 s         0.004 deg
+    4          0.05 s         0.0004 deg
+
+(sunrise moves at most 240 s per degree of longitude and about 690 s per
+degree of latitude; the ascendant at most about 4.4 degrees per degree of
+either coordinate). Closer to the poles the errors grow without bound, so
+leave quantization off for polar locations.
+"""
+
+import json
+import os
+from datetime import datetime, tzinfo
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from .cache import LRUCache, CacheBackend, SQLiteCacheBackend, quantize_coordinate
+
+# Environment configuration for the process-wide memo
+MEMO_SIZE_ENV = "ASTROCSV_EPHEM_MEMO_SIZE"
+MEMO_DECIMALS_ENV = "ASTROCSV_EPHEM_MEMO_DECIMALS"
+MEMO_PATH_ENV = "ASTROCSV_EPHEM_MEMO_PATH"
+DEFAULT_MEMO_SIZE = 8192
+
+class EphemerisMemo:
+    """
+    Two-level memo for sunrise and ascendant results.
+
+    Args:
+        engine_version: Engine identifier included in persistent keys
+        max_entries: In-memory LRU capacity
+        coord_decimals: Round coordinates to this many decimals (None: exact)
+        store: Optional persistent backend, e.g. SQLiteCacheBackend
+    """
+
+    def __init__(
+        self,
+        engine_version: str,
+        max_entries: int = DEFAULT_MEMO_SIZE,
+        coord_decimals: Optional[int] = None,
+        store: Optional[CacheBackend] = None
+    ):
+        self.engine_version = engine_version
+        self.coord_decimals = coord_decimals
+        self.store = store
+        self._memory = LRUCache(max_entries=max_entries)
+        self.computed = 0
+
+    def location(self, lat: float, lon: float) -> Sequence[float]:
+        """Return the (possibly quantized) coordinates results are computed for."""
+        if self.coord_decimals is None:
+            return float(lat), float(lon)
+        return (
+            quantize_coordinate(lat, self.coord_decimals),
+            quantize_coordinate(lon, self.coord_decimals)
+        )
+
+    def get_or_compute(
+        self,
+        kind: str,
+        parts: Sequence[Any],
+        compute: Callable[[], Any],
+        encode: Callable[[Any], Any] = lambda value: value,
+        decode: Callable[[Any], Any] = lambda value: value
+    ) -> Any:
+        """
+        Return a memoized result, computing and storing it on a miss.
+
+        Args:
+            kind: Result kind, e.g. "sunrise"
+            parts: Key parts (JSON-serializable)
+            compute: Zero-argument function producing the result
+            encode: Converts a result to JSON-serializable form for the store
+            decode: Inverse of encode
+
+        Returns:
+            The result
+        """
+        key = (kind, *parts)
+        value = self._memory.get(key)
+        if value is not None:
+            return value
+
+        if self.store is not None:
+            store_key = json.dumps([self.engine_version, kind, *parts], separators=(",", ":"))
+            stored = self.store.get(store_key)
+            if stored is not None:
+                value = decode(json.loads(stored))
+                self._memory.set(key, value)
+                return value
+
+        value = compute()
+        self.computed += 1
+        self._memory.set(key, value)
+        if self.store is not None:
+            self.store.set(store_key, json.dumps(encode(value), separators=(",", ":")).encode("utf-8"))
+        return value
+
+    def clear(self) -> None:
+        """Drop the in-memory entries (the persistent store is left alone)."""
+        self._memory.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return memory and store counters."""
+        stats = {f"memory_{name}": value for name, value in self._memory.stats().items()}
+        stats["computed"] = self.computed
+        if self.store is not None:
+            stats.update({f"store_{name}": value for name, value in self.store.stats().items()})
+        return stats
+
+def encode_datetimes(values: Sequence[datetime]) -> list:
+    """Encode a tuple of datetimes as ISO strings."""
+    return [value.isoformat() for value in values]
+
+def decode_datetimes(values: Sequence[str], tz: Optional[tzinfo] = None) -> tuple:
+    """Decode ISO strings back to a tuple of timezone-aware datetimes, optionally converted to tz."""
+    decoded = tuple(datetime.fromisoformat(value) for value in values)
+    if tz is not None:
+        decoded = tuple(value.astimezone(tz) for value in decoded)
+    return decoded
+
+def ephemeris_memo_from_env(engine_version: str) -> EphemerisMemo:
+    """
+    Build the memo configured by environment variables.
+
+    ASTROCSV_EPHEM_MEMO_SIZE sets the in-memory capacity,
+    ASTROCSV_EPHEM_MEMO_DECIMALS enables coordinate quantization and
+    ASTROCSV_EPHEM_MEMO_PATH enables the SQLite store at that path.
+    """
+    decimals = os.environ.get(MEMO_DECIMALS_ENV)
+    path = os.environ.get(MEMO_PATH_ENV)
+    return EphemerisMemo(
+        engine_version,
+        max_entries=int(os.environ.get(MEMO_SIZE_ENV, DEFAULT_MEMO_SIZE)),
+        coord_decimals=int(decimals) if decimals else None,
+        store=SQLiteCacheBackend(path) if path else None
+    )
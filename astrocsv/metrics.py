@@ -0,0 +1,303 @@
+"""
+Lightweight in-process metrics with Prometheus text exposition.
+
+Only the small subset of the Prometheus data model used by the APIs is
+implemented (counters, gauges, histograms and callback metrics), so the
+package does not need prometheus_client at runtime.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, from sub-millisecond cache hits to multi-second ranges
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Render a Prometheus label set such as {route="/calculate"}."""
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+def _format_value(value: float) -> str:
+    """Render a sample value the way Prometheus expects."""
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class _Metric:
+    """Base class holding the name, help text and label names of a metric."""
+
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        """Yield (sample_name, rendered_labels, value) tuples."""
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        """Render HELP, TYPE and sample lines for this metric."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}"
+        ]
+        for sample_name, labels, value in self.samples():
+            lines.append(f"{sample_name}{labels} {_format_value(value)}")
+        return lines
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increase the counter for the given labels."""
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Return the current value for the given labels."""
+        return self._values.get(self._label_values(labels), 0.0)
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield self.name, _format_labels(self.labelnames, key), value
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    metric_type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        """Set the gauge for the given labels."""
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increase the gauge for the given labels."""
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        """Decrease the gauge for the given labels."""
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track_inprogress(self, **labels: str) -> Iterator[None]:
+        """Increment the gauge for the duration of a with block."""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield self.name, _format_labels(self.labelnames, key), value
+
+class Histogram(_Metric):
+    """Cumulative histogram of observed values, typically durations in seconds."""
+
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., +Inf count], sum
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one observation."""
+        key = self._label_values(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[index] += 1
+            self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the wall-clock duration of a with block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        with self._lock:
+            items = [(key, list(counts), self._sums[key]) for key, counts in self._counts.items()]
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames + ("le",), key + (_format_value(bound),))
+                yield f"{self.name}_bucket", labels, cumulative
+            base_labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum", base_labels, total
+            yield f"{self.name}_count", base_labels, cumulative
+
+class CallbackMetric(_Metric):
+    """
+    Metric whose samples are read from a callback at scrape time.
+
+    Useful for exposing counters that already live elsewhere, such as cache
+    statistics, without double bookkeeping.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        func: Callable[[], Iterable[Tuple[Dict[str, str], float]]],
+        metric_type: str = "gauge"
+    ):
+        super().__init__(name, documentation)
+        self.metric_type = metric_type
+        self._func = func
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        for labels, value in self._func():
+            yield self.name, _format_labels(tuple(labels), tuple(labels.values())), value
+
+class Registry:
+    """Collection of metrics rendered together for a /metrics scrape."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Add a metric, replacing any earlier metric with the same name."""
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Optional[_Metric]:
+        """Return a registered metric by name."""
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+# Process-wide registry shared by the library and both APIs
+REGISTRY = Registry()
+
+SWE_CALLS = REGISTRY.register(Counter(
+    "astrocsv_swe_calls_total",
+    "Swiss Ephemeris calls made by astrocsv",
+    ["function"]
+))
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "astrocsv_stage_duration_seconds",
+    "Duration of calculation stages (sunrise, ascendant, mapping, serialization)",
+    ["stage"]
+))
+
+HTTP_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "astrocsv_http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"]
+))
+
+EXECUTOR_PENDING = REGISTRY.register(Gauge(
+    "astrocsv_executor_pending_tasks",
+    "Tasks submitted to a worker executor and not yet finished",
+    ["executor"]
+))
+
+ADMISSION_IN_FLIGHT = REGISTRY.register(Gauge(
+    "astrocsv_admission_in_flight",
+    "Requests admitted and currently executing",
+    ["route"]
+))
+
+ADMISSION_QUEUED = REGISTRY.register(Gauge(
+    "astrocsv_admission_queued",
+    "Requests waiting for an execution slot",
+    ["route"]
+))
+
+ADMISSION_WAIT_SECONDS = REGISTRY.register(Histogram(
+    "astrocsv_admission_wait_seconds",
+    "Time admitted requests spent waiting for an execution slot",
+    ["route"]
+))
+
+ADMISSION_REJECTED = REGISTRY.register(Counter(
+    "astrocsv_admission_rejected_total",
+    "Requests shed by admission control",
+    ["route", "reason"]
+))
+
+def cache_stats_collector(caches: Dict[str, Callable[[], Dict[str, int]]]) -> Callable[[], Iterable[Tuple[Dict[str, str], float]]]:
+    """
+    Build a CallbackMetric function exposing stats() dictionaries of named caches.
+
+    Args:
+        caches: Mapping of cache name to a zero-argument stats function
+
+    Returns:
+        Callback yielding ({"cache": name, "stat": key}, value) samples
+    """
+    def collect():
+        for cache_name, stats in caches.items():
+            for stat_name, value in stats().items():
+                yield {"cache": cache_name, "stat": stat_name}, value
+    return collect
@@ -0,0 +1,219 @@
+"""
+Panchang at sunrise: tithi, nakshatra, yoga, karana and vara.
+
+All five elements come from the Sun and Moon longitudes. Each instant is
+one position fetch (Sun and Moon with speeds), shared by every element:
+
+- tithi: Moon - Sun elongation in 12 degree steps
+- karana: the same elongation in 6 degree steps
+- nakshatra: sidereal Moon longitude in 13 deg 20' steps
+- yoga: sidereal Moon + Sun longitude in 13 deg 20' steps
+- vara: weekday of the sunrise (the day runs sunrise to sunrise)
+
+All three quantities increase monotonically, so the end time of each
+element is the root of "quantity = next boundary", found with Newton steps
+from the speeds at sunrise and refined on fresh fetches. The solve runs on
+NumPy arrays across a whole date range at once: each iteration is one fetch
+per still-unconverged day. Elements are evaluated at the whole sunrise
+second, like the ascendant. Positions are fetched in the sidereal zodiac
+of the chosen ayanamsa (Lahiri by default); tithi and karana depend only on
+the Moon - Sun difference and are the same in either zodiac.
+"""
+
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import swisseph as swe
+
+from .ephem import DEFAULT_AYANAMSA, IST, UNIX_EPOCH_JD, get_sunrise_times, sidereal_flags
+from .mapping_library import NAKSHATRAS
+from .metrics import SWE_CALLS
+
+_PAKSHA_TITHIS = [
+    "Pratipada", "Dwitiya", "Tritiya", "Chaturthi", "Panchami", "Shashthi", "Saptami",
+    "Ashtami", "Navami", "Dashami", "Ekadashi", "Dwadashi", "Trayodashi", "Chaturdashi"
+]
+TITHIS = (
+    [f"Shukla {name}" for name in _PAKSHA_TITHIS] + ["Purnima"]
+    + [f"Krishna {name}" for name in _PAKSHA_TITHIS] + ["Amavasya"]
+)
+
+YOGAS = [
+    "Vishkumbha", "Priti", "Ayushman", "Saubhagya", "Shobhana", "Atiganda", "Sukarma",
+    "Dhriti", "Shula", "Ganda", "Vriddhi", "Dhruva", "Vyaghata", "Harshana", "Vajra",
+    "Siddhi", "Vyatipata", "Variyan", "Parigha", "Shiva", "Siddha", "Sadhya", "Shubha",
+    "Shukla", "Brahma", "Indra", "Vaidhriti"
+]
+
+# Half-tithi 0 is Kimstughna, 1-56 cycle through the seven movable karanas
+# and the last three are fixed
+_MOVABLE_KARANAS = ["Bava", "Balava", "Kaulava", "Taitila", "Garaja", "Vanija", "Vishti"]
+KARANAS = ["Kimstughna"] + [_MOVABLE_KARANAS[i % 7] for i in range(56)] + ["Shakuni", "Chatushpada", "Naga"]
+
+# Sunday first
+VARAS = ["Ravivara", "Somavara", "Mangalavara", "Budhavara", "Guruvara", "Shukravara", "Shanivara"]
+
+ELEMENT_SPANS = {
+    "tithi": 12.0,
+    "nakshatra": 360.0 / 27.0,
+    "yoga": 360.0 / 27.0,
+    "karana": 6.0,
+}
+_ELEMENT_NAMES = {
+    "tithi": TITHIS,
+    "nakshatra": [name for _, _, name, _ in NAKSHATRAS],
+    "yoga": YOGAS,
+    "karana": KARANAS,
+}
+
+PANCHANG_COLUMNS = [
+    "date", "sunrise", "next_sunrise", "vara",
+    "tithi", "tithi_end", "nakshatra", "nakshatra_end",
+    "yoga", "yoga_end", "karana", "karana_end"
+]
+
+# End times are refined to this precision in days (~0.09 s). The Moon's
+# speed changes by at most ~0.5 deg/day per day against ~12 deg/day, so a
+# Newton step of c days leaves an error of about c * c / 50.
+TOLERANCE_DAYS = 1e-6
+ACCEPT_CORRECTION_DAYS = 5e-3
+MAX_ITERATIONS = 8
+
+def sun_moon_positions(
+    jd_ut: Sequence[float],
+    ayanamsa: str = DEFAULT_AYANAMSA
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Fetch sidereal Sun and Moon longitude and speed at each instant.
+
+    Args:
+        jd_ut: Julian Days (UT)
+        ayanamsa: Key of ephem.AYANAMSAS
+
+    Returns:
+        Sun longitude, Moon longitude, Sun speed, Moon speed (degrees, degrees/day)
+    """
+    flags = sidereal_flags(ayanamsa) | swe.FLG_SPEED
+    values = np.empty((len(jd_ut), 4))
+    for i, jd in enumerate(jd_ut):
+        SWE_CALLS.inc(2, function="calc_ut")
+        sun = swe.calc_ut(float(jd), swe.SUN, flags)[0]
+        moon = swe.calc_ut(float(jd), swe.MOON, flags)[0]
+        values[i] = (sun[0], moon[0], sun[3], moon[3])
+    return values[:, 0], values[:, 1], values[:, 2], values[:, 3]
+
+def _quantities(sun: np.ndarray, moon: np.ndarray, sun_speed: np.ndarray, moon_speed: np.ndarray) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """(value in degrees, rate in degrees/day) of the quantity behind each element."""
+    elongation = (np.mod(moon - sun, 360.0), moon_speed - sun_speed)
+    return {
+        "tithi": elongation,
+        "nakshatra": (np.mod(moon, 360.0), moon_speed),
+        "yoga": (np.mod(moon + sun, 360.0), moon_speed + sun_speed),
+        "karana": elongation,
+    }
+
+def _solve_end_times(
+    element: str,
+    start_jd: np.ndarray,
+    value: np.ndarray,
+    rate: np.ndarray,
+    ayanamsa: str = DEFAULT_AYANAMSA
+) -> np.ndarray:
+    """Julian Days when each element in progress at start_jd ends."""
+    span = ELEMENT_SPANS[element]
+    target = (np.floor(value / span) + 1.0) * span
+    jd = start_jd + (target - value) / rate
+    pending = np.arange(len(jd))
+    for _ in range(MAX_ITERATIONS):
+        if not len(pending):
+            break
+        current, current_rate = _quantities(*sun_moon_positions(jd[pending], ayanamsa))[element]
+        # Signed distance past the boundary, wrapped to [-180, 180)
+        overshoot = np.mod(current - target[pending] + 180.0, 360.0) - 180.0
+        correction = overshoot / current_rate
+        jd[pending] -= correction
+        # Newton converges quadratically: after a correction below
+        # ACCEPT_CORRECTION_DAYS the remaining error is under TOLERANCE_DAYS
+        pending = pending[np.abs(correction) > ACCEPT_CORRECTION_DAYS]
+    return jd
+
+def compute_panchang(sunrise_seconds: Sequence[int], ayanamsa: str = DEFAULT_AYANAMSA) -> Dict[str, Any]:
+    """
+    Panchang elements at many sunrise instants at once.
+
+    Args:
+        sunrise_seconds: Sunrise Unix times in whole seconds
+        ayanamsa: Key of ephem.AYANAMSAS for nakshatra and yoga
+
+    Returns:
+        Mapping of element name to an array of indices into its name list
+        and "<element>_end" to an array of end times as Unix seconds
+    """
+    seconds = np.asarray(sunrise_seconds, dtype=float)
+    start_jd = seconds / 86400.0 + UNIX_EPOCH_JD
+    quantities = _quantities(*sun_moon_positions(start_jd, ayanamsa))
+    result: Dict[str, Any] = {}
+    for element, span in ELEMENT_SPANS.items():
+        value, rate = quantities[element]
+        result[element] = (np.floor(value / span).astype(int)) % len(_ELEMENT_NAMES[element])
+        if element == "karana":
+            # The second karana of a tithi ends with it; solve only the first
+            end_jd = result["tithi_end"] / 86400.0 + UNIX_EPOCH_JD
+            first = result[element] % 2 == 0
+            end_jd[first] = _solve_end_times(element, start_jd[first], value[first], rate[first], ayanamsa)
+        else:
+            end_jd = _solve_end_times(element, start_jd, value, rate, ayanamsa)
+        result[f"{element}_end"] = (end_jd - UNIX_EPOCH_JD) * 86400.0
+    return result
+
+def panchang_for_dates(
+    lat: float,
+    lon: float,
+    dates: Sequence[date],
+    tz: Optional[ZoneInfo] = None,
+    sunrise_model=None,
+    ayanamsa: str = DEFAULT_AYANAMSA
+) -> List[Dict[str, Any]]:
+    """
+    Panchang at sunrise for each date, with end times of every element.
+
+    Args:
+        lat: Latitude in decimal degrees
+        lon: Longitude in decimal degrees
+        dates: Local dates
+        tz: Time zone of the dates and output times (default IST)
+        sunrise_model: Optional fitted SunriseModel covering the dates
+        ayanamsa: Key of ephem.AYANAMSAS for nakshatra and yoga
+
+    Returns:
+        One row per date keyed by PANCHANG_COLUMNS; end times are ISO
+        strings and may fall after the next sunrise
+
+    Raises:
+        ValueError: If the ayanamsa is unknown or the sun does not rise
+    """
+    tz = tz or IST
+    sidereal_flags(ayanamsa)
+    sunrises: List[Tuple[datetime, datetime]] = []
+    for target_date in dates:
+        if sunrise_model is not None:
+            sunrises.append(sunrise_model.sunrise_times(target_date))
+        else:
+            sunrises.append(get_sunrise_times(lat, lon, target_date, tz))
+    elements = compute_panchang([int(sunrise.timestamp() // 1) for sunrise, _ in sunrises], ayanamsa)
+
+    rows = []
+    for i, (target_date, (sunrise, next_sunrise)) in enumerate(zip(dates, sunrises)):
+        row: Dict[str, Any] = {
+            "date": target_date.isoformat(),
+            "sunrise": sunrise.isoformat(),
+            "next_sunrise": next_sunrise.isoformat(),
+            "vara": VARAS[(sunrise.weekday() + 1) % 7],
+        }
+        for element in ELEMENT_SPANS:
+            row[element] = _ELEMENT_NAMES[element][elements[element][i]]
+            row[f"{element}_end"] = datetime.fromtimestamp(float(elements[f"{element}_end"][i]), tz).isoformat()
+        rows.append(row)
+    return rows
@@ -0,0 +1,115 @@
+"""
+Positions of the nine grahas and their sign, nakshatra and KP lords.
+
+Geocentric planet positions do not depend on the observer, so they are
+computed once per instant (whole UTC second, the resolution the ascendant
+is computed at) with one calc_ut pass over all bodies, and shared through
+a process-wide LRU by every location whose sunrise falls on that second.
+Longitudes are in the same zodiac as the ascendant.
+
+Classification maps all longitudes at once onto get_kp_segment_table():
+one np.searchsorted over the segment boundaries, then array lookups per
+column, instead of separate sign, nakshatra and sub-lord calls per graha.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import swisseph as swe
+
+from .cache import LRUCache
+from .csvout import PLANET_GRAHAS, PLANET_FIELDS
+from .ephem import UNIX_EPOCH_JD, _ensure_ephemeris
+from .mapping_library import get_kp_segment_table, get_kp_boundaries
+from .metrics import SWE_CALLS
+
+# Graha name and Swiss Ephemeris body; Ketu is opposite the (mean) Rahu
+GRAHAS: Tuple[Tuple[str, int], ...] = (
+    ("sun", swe.SUN),
+    ("moon", swe.MOON),
+    ("mars", swe.MARS),
+    ("mercury", swe.MERCURY),
+    ("jupiter", swe.JUPITER),
+    ("venus", swe.VENUS),
+    ("saturn", swe.SATURN),
+    ("rahu", swe.MEAN_NODE),
+)
+GRAHA_NAMES: Tuple[str, ...] = tuple(PLANET_GRAHAS)
+
+# Columns of get_kp_segment_table() behind PLANET_FIELDS[1:]
+_TABLE_COLUMNS = (2, 3, 4, 5, 6, 7)
+
+_positions = LRUCache(max_entries=16384)
+
+def get_planet_longitudes(unix_second: int) -> np.ndarray:
+    """
+    Longitudes of the nine grahas at a whole UTC second, cached.
+
+    Args:
+        unix_second: Unix time in whole seconds
+
+    Returns:
+        Array of longitudes in GRAHA_NAMES order (degrees, 0-360)
+    """
+    longitudes = _positions.get(unix_second)
+    if longitudes is None:
+        _ensure_ephemeris()
+        jd_ut = unix_second / 86400.0 + UNIX_EPOCH_JD
+        values = []
+        for _, body in GRAHAS:
+            SWE_CALLS.inc(function="calc_ut")
+            values.append(swe.calc_ut(jd_ut, body)[0][0])
+        values.append(values[-1] + 180.0)
+        longitudes = np.mod(np.array(values), 360.0)
+        longitudes.flags.writeable = False
+        _positions.set(unix_second, longitudes)
+    return longitudes
+
+_lookup_tables = None
+
+def _get_lookup_tables() -> Tuple[np.ndarray, List[np.ndarray]]:
+    """Boundary array and one object array per classification column."""
+    global _lookup_tables
+    if _lookup_tables is None:
+        table = get_kp_segment_table()
+        _lookup_tables = (
+            np.asarray(get_kp_boundaries()),
+            [np.array([row[column] for row in table], dtype=object) for column in _TABLE_COLUMNS]
+        )
+    return _lookup_tables
+
+def classify_longitudes(longitudes: Sequence[float]) -> List[np.ndarray]:
+    """
+    Sign, sign lord, nakshatra, nakshatra lord, sub lord and sub-sub lord
+    for many longitudes at once.
+
+    Returns:
+        One array per field of PLANET_FIELDS[1:], aligned with longitudes
+    """
+    boundaries, columns = _get_lookup_tables()
+    segments = np.searchsorted(boundaries, np.mod(np.asarray(longitudes, dtype=float), 360.0), side="right") - 1
+    return [column[segments] for column in columns]
+
+def planet_columns(instant: datetime) -> Dict[str, object]:
+    """
+    CSV columns for all grahas at an instant (truncated to the whole second).
+
+    Args:
+        instant: Timezone-aware datetime, e.g. the sunrise
+
+    Returns:
+        Mapping of csvout.PLANET_COLUMNS to values
+    """
+    longitudes = get_planet_longitudes(int(instant.timestamp() // 1))
+    classified = classify_longitudes(longitudes)
+    columns: Dict[str, object] = {}
+    for position, graha in enumerate(GRAHA_NAMES):
+        columns[f"{graha}_deg"] = round(float(longitudes[position]), 3)
+        for field, values in zip(PLANET_FIELDS[1:], classified):
+            columns[f"{graha}_{field}"] = values[position]
+    return columns
+
+def planet_cache_stats() -> Dict[str, int]:
+    """Hit, miss and eviction counters of the shared position cache."""
+    return _positions.stats()
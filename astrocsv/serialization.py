@@ -0,0 +1,64 @@
+"""
+Fast JSON encoding for large API payloads.
+
+Uses orjson when it is installed and falls back to the standard library
+encoder otherwise. Both produce compact UTF-8 JSON bytes.
+"""
+
+import json
+from typing import Any, Mapping
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+class RawJSON(bytes):
+    """
+    Already-encoded JSON value.
+
+    dumps_object() embeds RawJSON values verbatim, which lets callers cache
+    the serialized form of large static parts of a response.
+    """
+
+def dumps(obj: Any) -> bytes:
+    """
+    Encode an object as compact JSON bytes.
+
+    Args:
+        obj: JSON-compatible object
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if isinstance(obj, RawJSON):
+        return obj
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def dumps_object(fields: Mapping[str, Any]) -> bytes:
+    """
+    Encode a mapping as a JSON object, embedding RawJSON values verbatim.
+
+    Args:
+        fields: Mapping of key to JSON-compatible value or RawJSON
+
+    Returns:
+        UTF-8 encoded JSON object
+    """
+    parts = [dumps(key) + b":" + dumps(value) for key, value in fields.items()]
+    return b"{" + b",".join(parts) + b"}"
+
+def dumps_array(items: Any) -> RawJSON:
+    """
+    Join already-encoded JSON values into a JSON array.
+
+    Args:
+        items: Iterable of encoded JSON values (bytes)
+
+    Returns:
+        Encoded array as RawJSON
+    """
+    return RawJSON(b"[" + b",".join(items) + b"]")
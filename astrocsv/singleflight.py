@@ -0,0 +1,55 @@
+"""
+Single-flight coalescing of identical concurrent computations.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+class SingleFlight:
+    """
+    Run at most one computation per key at a time.
+
+    Callers that arrive while a computation for their key is in flight wait
+    for that computation and share its result (or exception) instead of
+    starting their own. The computation runs as its own task, so a caller
+    that disconnects does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the result of func(), sharing it with concurrent callers for key.
+
+        Args:
+            key: Identity of the computation
+            func: Zero-argument coroutine function performing the computation
+
+        Returns:
+            The computation's result
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: "asyncio.Future[Any]") -> None:
+        """Drop a finished computation so the next caller starts a fresh one."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Return execution and coalescing counters."""
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight)
+        }
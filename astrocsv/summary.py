@@ -0,0 +1,93 @@
+"""
+Day-level ascendant summaries shared by the CLI jobs and both APIs.
+"""
+
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+from zoneinfo import ZoneInfo
+
+from .ephem import get_sunrise_times, get_ascendant_at_time, IST
+from .mapping_library import get_sign_and_lord, get_nakshatra_and_lord, get_kp_sub_lords
+from .cache import ResultCache
+from .metrics import STAGE_SECONDS
+
+# Cache namespace for day summaries
+DAY_NAMESPACE = "day"
+
+def compute_day_summary(
+    lat: float,
+    lon: float,
+    target_date: date,
+    tz: Optional[ZoneInfo] = None
+) -> Dict[str, Any]:
+    """
+    Compute sunrise, next sunrise, ascendant at sunrise and its lords for one day.
+
+    Args:
+        lat: Latitude in decimal degrees
+        lon: Longitude in decimal degrees
+        target_date: Local date to calculate for
+        tz: Time zone of the date and sunrise times (default IST)
+
+    Returns:
+        JSON-serializable dictionary with ISO sunrise times, the unrounded
+        ascendant degree and sign/nakshatra/KP lords
+    """
+    with STAGE_SECONDS.time(stage="sunrise"):
+        sunrise, next_sunrise = get_sunrise_times(lat, lon, target_date, tz)
+
+    with STAGE_SECONDS.time(stage="ascendant"):
+        ascendant = get_ascendant_at_time(lat, lon, sunrise)
+
+    with STAGE_SECONDS.time(stage="mapping"):
+        sign, sign_lord = get_sign_and_lord(ascendant)
+        nakshatra, nakshatra_lord = get_nakshatra_and_lord(ascendant)
+        sub_lord, sub_sub_lord = get_kp_sub_lords(ascendant)
+
+    return {
+        "sunrise": sunrise.isoformat(),
+        "next_sunrise": next_sunrise.isoformat(),
+        "ascendant": ascendant,
+        "sign": sign,
+        "sign_lord": sign_lord,
+        "nakshatra": nakshatra,
+        "nakshatra_lord": nakshatra_lord,
+        "sub_lord": sub_lord,
+        "sub_sub_lord": sub_sub_lord
+    }
+
+def get_day_summary(
+    lat: float,
+    lon: float,
+    target_date: date,
+    cache: Optional[ResultCache] = None,
+    tz: Optional[ZoneInfo] = None
+) -> Dict[str, Any]:
+    """
+    Get a day summary, reading and filling the given result cache.
+
+    Args:
+        lat: Latitude in decimal degrees
+        lon: Longitude in decimal degrees
+        target_date: Local date to calculate for
+        cache: Optional shared result cache
+        tz: Time zone of the date and sunrise times (default IST)
+
+    Returns:
+        Day summary as returned by compute_day_summary
+    """
+    if cache is None:
+        return compute_day_summary(lat, lon, target_date, tz)
+
+    key = (float(lat), float(lon), target_date.isoformat())
+    if tz is not None and tz.key != IST.key:
+        key += (tz.key,)
+    summary = cache.get(DAY_NAMESPACE, key)
+    if summary is None:
+        summary = compute_day_summary(lat, lon, target_date, tz)
+        cache.set(DAY_NAMESPACE, key, summary)
+    return summary
+
+def summary_sunrise(summary: Dict[str, Any]) -> datetime:
+    """Return the sunrise of a day summary as a timezone-aware datetime."""
+    return datetime.fromisoformat(summary["sunrise"])
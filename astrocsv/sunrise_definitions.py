@@ -0,0 +1,284 @@
+"""
+Sunrise under different definitions and observer conditions.
+
+get_sunrise_times follows astral: the upper limb on the horizon with
+astral's fixed refraction, at sea level. Schools differ on both points, so
+this module defines sunrise by:
+
+- limb: the upper limb, the disc centre or the lower limb on the horizon
+- refraction: on the apparent horizon (standard atmosphere, scaled by
+  pressure and temperature) or on the true, geometric horizon
+
+and an Observer with elevation (which lowers the horizon by its dip),
+pressure and temperature. Refraction and dip come from Swiss Ephemeris'
+extended refraction model (swe.refrac_extended). Each definition reduces
+to one geometric altitude of the Sun's centre at the moment of rise, so
+all variants are solved in one batched pass. For every day, the Sun's equatorial position
+is fetched at three instants around sunrise and interpolated. The rise
+time of every (day, definition) pair is then iterated on the hour-angle
+equation with NumPy, and no more ephemeris calls are needed.
+
+Results are memoized through the ephemeris memo under a key that includes
+the definition and the observer, so variants never collide with each other
+or with get_sunrise_times' default results.
+"""
+
+import math
+from datetime import date, datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import swisseph as swe
+
+from .ephem import IST, J2000, UNIX_EPOCH_JD, _ensure_ephemeris, get_ephemeris_memo, nutation
+from .memo import encode_datetimes, decode_datetimes
+from .metrics import SWE_CALLS
+
+class SunriseDefinition(NamedTuple):
+    limb: str  # "upper", "center" or "lower"
+    refraction: bool
+
+SUNRISE_DEFINITIONS: Dict[str, SunriseDefinition] = {
+    # Upper limb on the apparent horizon: the almanac convention, and astral's
+    "upper_limb": SunriseDefinition("upper", True),
+    "center": SunriseDefinition("center", True),
+    "lower_limb": SunriseDefinition("lower", True),
+    "upper_limb_geometric": SunriseDefinition("upper", False),
+    # Disc centre on the true horizon, as in the Hindu siddhantas
+    "center_geometric": SunriseDefinition("center", False),
+}
+
+class Observer(NamedTuple):
+    elevation: float = 0.0  # metres above the visible horizon (e.g. a hill over plains)
+    pressure: Optional[float] = None  # hPa; None estimates it from the elevation
+    temperature: float = 15.0  # degrees Celsius
+
+    def station_pressure(self) -> float:
+        """Pressure in hPa, from the standard atmosphere when not given."""
+        if self.pressure is not None:
+            return self.pressure
+        return 1013.25 * (1.0 - 0.0065 * self.elevation / 288.0) ** 5.255
+
+SEA_LEVEL = Observer()
+
+# Solar semidiameter and horizontal parallax at 1 AU, in degrees
+SUN_SEMIDIAMETER_1AU = 959.63 / 3600.0
+SUN_PARALLAX_1AU = 8.794 / 3600.0
+
+# Temperature lapse rate for Swiss Ephemeris' extended refraction (K/m)
+LAPSE_RATE = 0.0065
+
+EARTH_RADIUS_M = 6378137.0
+
+# Mean solar days per revolution of the hour angle of a fixed point
+SIDEREAL_RATE = 360.98564736629
+
+RISE_ITERATIONS = 5
+
+_LIMB_SIGN = {"upper": 1.0, "center": 0.0, "lower": -1.0}
+
+def horizon_altitude(definition: SunriseDefinition, observer: Observer = SEA_LEVEL) -> float:
+    """
+    Geometric altitude of the observer's horizon, in degrees.
+
+    Elevation lowers the visible horizon by its dip. With refraction this
+    is the apparent horizon: Swiss Ephemeris' dip for the elevation and
+    atmosphere, minus the refraction there. Without refraction it is the
+    geometric dip alone.
+    """
+    if not definition.refraction:
+        return -math.degrees(math.acos(1.0 / (1.0 + max(observer.elevation, 0.0) / EARTH_RADIUS_M)))
+    pressure = observer.station_pressure()
+    SWE_CALLS.inc(2, function="refrac_extended")
+    dip = swe.refrac_extended(
+        1e-6, observer.elevation, pressure, observer.temperature, LAPSE_RATE, swe.APP_TO_TRUE
+    )[1][3]
+    return swe.refrac_extended(
+        dip, observer.elevation, pressure, observer.temperature, LAPSE_RATE, swe.APP_TO_TRUE
+    )[0]
+
+def rise_altitude(definition: SunriseDefinition, distance_au: np.ndarray, observer: Observer = SEA_LEVEL) -> np.ndarray:
+    """
+    Geocentric geometric altitude of the Sun's centre at the moment of rise.
+
+    Args:
+        definition: Limb and refraction convention
+        distance_au: Sun-Earth distance per day
+        observer: Elevation and atmosphere
+
+    Returns:
+        Altitude in degrees per day
+    """
+    limb = _LIMB_SIGN[definition.limb] * SUN_SEMIDIAMETER_1AU / distance_au
+    return horizon_altitude(definition, observer) - limb + SUN_PARALLAX_1AU / distance_au
+
+def _sun_samples(jd_ut: np.ndarray) -> np.ndarray:
+    """Right ascension, declination and distance of the Sun, shape (n, 3)."""
+    _ensure_ephemeris()
+    flags = swe.FLG_SWIEPH | swe.FLG_EQUATORIAL
+    values = np.empty((len(jd_ut), 3))
+    for i, jd in enumerate(jd_ut):
+        SWE_CALLS.inc(function="calc_ut")
+        values[i] = swe.calc_ut(float(jd), swe.SUN, flags)[0][:3]
+    return values
+
+def _sidereal_time_function(jd_ut: np.ndarray):
+    """Greenwich apparent sidereal time in degrees, nutation fixed at the batch's mean date."""
+    obliquity, nutation_longitude = nutation(float(np.nanmean(jd_ut)))
+    equation_of_equinoxes = nutation_longitude * math.cos(math.radians(obliquity))
+
+    def sidereal_time(jd: np.ndarray) -> np.ndarray:
+        t = (jd - J2000) / 36525.0
+        mean = 280.46061837 + SIDEREAL_RATE * (jd - J2000) + 0.000387933 * t * t - t * t * t / 38710000.0
+        return mean + equation_of_equinoxes
+
+    return sidereal_time
+
+def _solve_rises(lat: float, lon: float, base_jd: np.ndarray, altitudes: Dict[str, np.ndarray], samples: np.ndarray) -> Dict[str, np.ndarray]:
+    """Rise Julian Days per definition, NaN where the Sun does not reach the altitude."""
+    # Quadratic interpolation through samples at base_jd - 0.25, base_jd, base_jd + 0.25
+    ra = np.unwrap(np.radians(samples[:, :, 0]), axis=1)
+    dec = np.radians(samples[:, :, 1])
+    sin_lat, cos_lat = math.sin(math.radians(lat)), math.cos(math.radians(lat))
+    sidereal_time = _sidereal_time_function(base_jd)
+
+    def interpolate(values: np.ndarray, x: np.ndarray) -> np.ndarray:
+        # x in units of the sample spacing, 0 at the middle sample
+        low, middle, high = values[:, 0], values[:, 1], values[:, 2]
+        return middle + x * (high - low) / 2.0 + x * x * (high - 2.0 * middle + low) / 2.0
+
+    results = {}
+    for name, altitude in altitudes.items():
+        sin_altitude = np.sin(np.radians(altitude))
+        jd = base_jd.copy()
+        for _ in range(RISE_ITERATIONS):
+            x = (jd - base_jd) / 0.25
+            ra_t, dec_t = interpolate(ra, x), interpolate(dec, x)
+            cos_hour_angle = (sin_altitude - sin_lat * np.sin(dec_t)) / (cos_lat * np.cos(dec_t))
+            hour_angle = np.degrees(np.arccos(np.clip(cos_hour_angle, -1.0, 1.0)))
+            local_hour_angle = sidereal_time(jd) + lon - np.degrees(ra_t)
+            error = np.mod(local_hour_angle + hour_angle + 180.0, 360.0) - 180.0
+            jd = jd - error / (SIDEREAL_RATE - 360.0 / 365.2422)
+        results[name] = np.where(np.abs(cos_hour_angle) <= 1.0, jd, np.nan)
+    return results
+
+def compute_rise_times(
+    lat: float,
+    lon: float,
+    dates: Sequence[date],
+    tz: Optional[ZoneInfo] = None,
+    definitions: Sequence[str] = ("upper_limb",),
+    observer: Observer = SEA_LEVEL
+) -> Dict[str, np.ndarray]:
+    """
+    Sunrise Unix times for every date and definition in one batched pass.
+
+    Args:
+        lat: Latitude in decimal degrees
+        lon: Longitude in decimal degrees
+        dates: Local dates
+        tz: Time zone defining the local dates (default IST)
+        definitions: Names from SUNRISE_DEFINITIONS
+        observer: Elevation and atmosphere
+
+    Returns:
+        Definition name -> array of sunrise Unix times aligned with dates
+        (NaN where the Sun does not rise)
+
+    Raises:
+        ValueError: For an unknown definition
+    """
+    unknown = [name for name in definitions if name not in SUNRISE_DEFINITIONS]
+    if unknown:
+        raise ValueError(f"Unknown sunrise definition: {', '.join(unknown)}")
+    tz = tz or IST
+    if not len(dates):
+        return {name: np.empty(0) for name in definitions}
+    ordinals = np.array([target_date.toordinal() for target_date in dates])
+    # Local mean 6h of each date, in UT; the local-date check below corrects
+    # the rare zones more than 12 hours from local mean time
+    base_jd = (ordinals - date(1970, 1, 1).toordinal()) + UNIX_EPOCH_JD + 0.25 - lon / 360.0
+    shift = np.zeros(len(dates))
+    pending = np.arange(len(dates))
+    results = {name: np.full(len(dates), np.nan) for name in definitions}
+
+    for _ in range(3):
+        if not len(pending):
+            break
+        base = base_jd[pending] + shift[pending]
+        samples = _sun_samples(np.concatenate((base - 0.25, base, base + 0.25))).reshape(3, len(pending), 3).transpose(1, 0, 2)
+        altitudes = {
+            name: rise_altitude(SUNRISE_DEFINITIONS[name], samples[:, 1, 2], observer) for name in definitions
+        }
+        solved = _solve_rises(lat, lon, base, altitudes, samples)
+
+        # Keep rises that fall on their local date; move the search a day otherwise
+        retry = set()
+        for name, jd in solved.items():
+            for k, index in enumerate(pending):
+                if np.isnan(jd[k]):
+                    continue
+                timestamp = (jd[k] - UNIX_EPOCH_JD) * 86400.0
+                offset = (datetime.fromtimestamp(timestamp, tz).date() - dates[index]).days
+                if offset == 0:
+                    results[name][index] = timestamp
+                else:
+                    retry.add(index)
+                    shift[index] -= offset
+        pending = np.array(sorted(retry), dtype=int)
+    return results
+
+def _memo_key(lat: float, lon: float, target_date: date, tz: ZoneInfo, name: str, observer: Observer) -> Tuple:
+    return (lat, lon, target_date.isoformat(), tz.key, name, *observer)
+
+def get_sunrise_variants(
+    lat: float,
+    lon: float,
+    target_date: date,
+    tz: Optional[ZoneInfo] = None,
+    definitions: Sequence[str] = ("upper_limb",),
+    observer: Observer = SEA_LEVEL
+) -> Dict[str, Tuple[datetime, datetime]]:
+    """
+    Sunrise and next sunrise under several definitions, memoized per variant.
+
+    Variants missing from the memo are computed together in one pass.
+
+    Args:
+        lat: Latitude in decimal degrees
+        lon: Longitude in decimal degrees
+        target_date: Local date
+        tz: Time zone of the date and results (default IST)
+        definitions: Names from SUNRISE_DEFINITIONS
+        observer: Elevation and atmosphere
+
+    Returns:
+        Definition name -> (sunrise, next_sunrise) in tz
+
+    Raises:
+        ValueError: For an unknown definition, or if the Sun does not rise
+    """
+    tz = tz or IST
+    memo = get_ephemeris_memo()
+    lat, lon = memo.location(lat, lon)
+    batch: List[Dict[str, np.ndarray]] = []
+
+    def compute(name: str) -> Tuple[datetime, datetime]:
+        if not batch:
+            batch.append(compute_rise_times(
+                lat, lon, [target_date, target_date + timedelta(days=1)], tz, definitions, observer
+            ))
+        sunrise, next_sunrise = batch[0][name]
+        if np.isnan(sunrise) or np.isnan(next_sunrise):
+            raise ValueError(f"No {name} sunrise on {target_date} at this location")
+        return datetime.fromtimestamp(float(sunrise), tz), datetime.fromtimestamp(float(next_sunrise), tz)
+
+    return {
+        name: memo.get_or_compute(
+            "sunrise", _memo_key(lat, lon, target_date, tz, name, observer),
+            lambda name=name: compute(name),
+            encode=encode_datetimes, decode=lambda values: decode_datetimes(values, tz)
+        )
+        for name in definitions
+    }
@@ -0,0 +1,227 @@
+"""
+Piecewise Chebyshev models of sunrise time at one location.
+
+Over a year, the UTC time of sunrise at a fixed location (measured from 0h
+UT of each calendar date) is a smooth function of the day. SunriseModel.fit
+computes exact sunrises only at Chebyshev anchor days of each segment
+(about 92 days by default) and fits a polynomial through them. Any day in
+the range is then one polynomial evaluation, vectorized over NumPy arrays
+for bulk generation.
+
+Every segment is verified against the exact engine at the days halfway
+between its anchors, where interpolation error peaks. A segment that misses
+the error bound is split in half and refitted. If it is still too short, or
+the sun does not rise on one of its days (polar edge cases), it falls back
+to exact computation.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+from numpy.polynomial import chebyshev
+
+from .ephem import IST, get_sunrise_times, _compute_sunrise_times
+
+DEFAULT_SEGMENT_DAYS = 92
+DEFAULT_DEGREE = 12
+MIN_SEGMENT_DAYS = 12
+
+# Maximum deviation from the exact sunrise, in seconds
+DEFAULT_MAX_ERROR_SECONDS = 0.01
+
+# Proleptic ordinal of the Unix epoch
+_ORDINAL_EPOCH = datetime(1970, 1, 1).toordinal()
+
+Segment = Tuple[int, int, Optional[np.ndarray]]
+
+def _utc_midnight(ordinals: Any) -> Any:
+    """Unix time of 0h UT on the given proleptic ordinals."""
+    return (np.asarray(ordinals, dtype=float) - _ORDINAL_EPOCH) * 86400.0
+
+class SunriseModel:
+    """
+    Fitted sunrise model for one location and date range.
+
+    Build with SunriseModel.fit.
+
+    Args:
+        lat: Latitude in decimal degrees
+        lon: Longitude in decimal degrees
+        tz: Zone defining the local dates
+        segments: (first ordinal, last ordinal, Chebyshev coefficients or
+            None for exact fallback), contiguous and sorted
+        max_error: Error bound the segments were verified against
+        anchors: Number of exact sunrises computed while fitting
+    """
+
+    def __init__(self, lat: float, lon: float, tz: ZoneInfo, segments: List[Segment], max_error: float, anchors: int):
+        self.lat = lat
+        self.lon = lon
+        self.tz = tz
+        self.segments = segments
+        self.max_error = max_error
+        self.anchors = anchors
+        self._starts = np.array([first for first, _, _ in segments])
+
+    @classmethod
+    def fit(
+        cls,
+        lat: float,
+        lon: float,
+        start_date: date,
+        end_date: date,
+        tz: Optional[ZoneInfo] = None,
+        max_error: float = DEFAULT_MAX_ERROR_SECONDS,
+        segment_days: int = DEFAULT_SEGMENT_DAYS,
+        degree: int = DEFAULT_DEGREE
+    ) -> "SunriseModel":
+        """
+        Fit a model covering start_date through end_date plus one day, so
+        next sunrise is available for every date in the range.
+
+        Args:
+            lat: Latitude in decimal degrees
+            lon: Longitude in decimal degrees
+            start_date: First local date
+            end_date: Last local date
+            tz: Zone defining the local dates (default IST)
+            max_error: Verified error bound in seconds
+            segment_days: Initial segment length
+            degree: Polynomial degree per segment
+
+        Returns:
+            The fitted model
+        """
+        tz = tz or IST
+        exact: Dict[int, Optional[float]] = {}
+
+        def offset(ordinal: int) -> Optional[float]:
+            # Exact sunrise as seconds after 0h UT of the date, None without one
+            if ordinal not in exact:
+                try:
+                    sunrise, _ = _compute_sunrise_times(lat, lon, date.fromordinal(ordinal), tz)
+                    exact[ordinal] = sunrise.timestamp() - float(_utc_midnight(ordinal))
+                except Exception:
+                    exact[ordinal] = None
+            return exact[ordinal]
+
+        def fit_segment(first: int, last: int) -> List[Segment]:
+            length = last - first + 1
+            nodes = np.cos(np.pi * (np.arange(degree + 1) + 0.5) / (degree + 1))
+            anchor_days = sorted({int(round(value)) for value in (first + last) / 2 + (last - first) / 2 * nodes})
+            checks = [(a + b) // 2 for a, b in zip([first] + anchor_days, anchor_days + [last]) if b - a > 1]
+            values = [offset(day) for day in anchor_days]
+            if None not in values and len(anchor_days) > 1:
+                def scaled(days: Sequence[int]) -> np.ndarray:
+                    return 2.0 * (np.asarray(days, dtype=float) - first) / max(last - first, 1) - 1.0
+                coefficients = chebyshev.chebfit(scaled(anchor_days), values, min(degree, len(anchor_days) - 1))
+                expected = [offset(day) for day in checks]
+                if None not in expected and (
+                    not checks
+                    or np.max(np.abs(chebyshev.chebval(scaled(checks), coefficients) - expected)) <= max_error
+                ):
+                    return [(first, last, coefficients)]
+            if length >= 2 * MIN_SEGMENT_DAYS:
+                middle = first + length // 2
+                return fit_segment(first, middle - 1) + fit_segment(middle, last)
+            return [(first, last, None)]
+
+        segments: List[Segment] = []
+        first, last = start_date.toordinal(), end_date.toordinal() + 1
+        while first <= last:
+            segment_last = min(first + segment_days - 1, last)
+            if last - segment_last < MIN_SEGMENT_DAYS:
+                segment_last = last  # fold a short tail into this segment
+            segments.extend(fit_segment(first, segment_last))
+            first = segment_last + 1
+        return cls(lat, lon, tz, segments, max_error, sum(value is not None for value in exact.values()))
+
+    @property
+    def start_date(self) -> date:
+        return date.fromordinal(self.segments[0][0])
+
+    @property
+    def end_date(self) -> date:
+        """Last date with both sunrise and next sunrise covered."""
+        return date.fromordinal(self.segments[-1][1] - 1)
+
+    def timestamps(self, ordinals: Sequence[int]) -> np.ndarray:
+        """
+        Evaluate sunrise Unix times for many dates at once.
+
+        Args:
+            ordinals: Proleptic ordinals of local dates inside the fitted range
+
+        Returns:
+            Sunrise Unix times; exact-fallback days are computed exactly
+            (NaN if the sun does not rise)
+        """
+        ordinals = np.asarray(ordinals, dtype=int)
+        positions = np.searchsorted(self._starts, ordinals, side="right") - 1
+        if ordinals.size and (positions.min() < 0 or ordinals.max() > self.segments[-1][1]):
+            raise ValueError("Date outside the fitted range")
+        result = np.empty(ordinals.shape)
+        for position in np.unique(positions):
+            first, last, coefficients = self.segments[position]
+            mask = positions == position
+            if coefficients is None:
+                result[mask] = [self._exact_timestamp(int(day)) for day in ordinals[mask]]
+            else:
+                x = 2.0 * (ordinals[mask] - first) / max(last - first, 1) - 1.0
+                result[mask] = chebyshev.chebval(x, coefficients) + _utc_midnight(ordinals[mask])
+        return result
+
+    def _exact_timestamp(self, ordinal: int) -> float:
+        try:
+            sunrise, _ = get_sunrise_times(self.lat, self.lon, date.fromordinal(ordinal), self.tz)
+            return sunrise.timestamp()
+        except Exception:
+            return float("nan")
+
+    def sunrise_times(self, target_date: date) -> Tuple[datetime, datetime]:
+        """
+        Drop-in replacement for get_sunrise_times within the fitted range.
+
+        Raises:
+            ValueError: If the date is outside the range or the sun does not rise
+        """
+        sunrise, next_sunrise = self.timestamps([target_date.toordinal(), target_date.toordinal() + 1])
+        if np.isnan(sunrise) or np.isnan(next_sunrise):
+            raise ValueError(f"No sunrise on {target_date} at this location")
+        return datetime.fromtimestamp(sunrise, self.tz), datetime.fromtimestamp(next_sunrise, self.tz)
+
+    def verify(self, dates: Optional[Sequence[date]] = None) -> Dict[str, Any]:
+        """
+        Compare the model with the exact engine.
+
+        Args:
+            dates: Dates to check (default: every date in the range)
+
+        Returns:
+            Number of dates checked, maximum absolute error in seconds and
+            whether it is within max_error
+        """
+        if dates is None:
+            dates = [self.start_date + timedelta(days=offset) for offset in range((self.end_date - self.start_date).days + 1)]
+        modelled = self.timestamps([day.toordinal() for day in dates])
+        errors = []
+        for day, value in zip(dates, modelled):
+            try:
+                sunrise, _ = _compute_sunrise_times(self.lat, self.lon, day, self.tz)
+            except Exception:
+                continue
+            errors.append(abs(sunrise.timestamp() - value))
+        max_error = float(max(errors)) if errors else 0.0
+        return {"checked": len(errors), "max_error_seconds": max_error, "within_bound": max_error <= self.max_error}
+
+    def stats(self) -> Dict[str, Any]:
+        """Return segment and anchor counts."""
+        fallback_days = sum(last - first + 1 for first, last, coefficients in self.segments if coefficients is None)
+        return {
+            "days": self.segments[-1][1] - self.segments[0][0] + 1,
+            "segments": len(self.segments),
+            "exact_anchors": self.anchors,
+            "fallback_days": fallback_days
+        }
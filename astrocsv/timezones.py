@@ -0,0 +1,228 @@
+"""
+Offline timezone resolution for coordinates.
+
+Time zone polygons are read once from a GeoJSON file in the format published
+by the timezone-boundary-builder project (features with a "tzid" property,
+Polygon or MultiPolygon geometry; the ".geojson.gz" form is read directly).
+The file is looked up at $ASTROCSV_TZ_DATA, then in the package's tzdata
+directory. Polygons are indexed on a one-degree grid, and each polygon's
+edges are bucketed by one-degree latitude band, so a point-in-polygon test
+only looks at the few edges near the query latitude. Resolved points are
+memoized.
+
+Without polygon data, coordinates take the zone of the nearest gazetteer
+place (see gazetteer.py) within NEAREST_PLACE_MAX_KM, and anything farther
+away is an error: a fixed-offset zone would silently drop DST and half-hour
+offsets. With polygon data, points outside every polygon (open sea in the
+land-only data set) resolve to the nautical zone for their longitude
+(Etc/GMT-5 for 75 degrees east).
+"""
+
+import gzip
+import json
+import math
+import os
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from .gazetteer import get_gazetteer
+
+# Default zone for requests that do not ask for another one
+DEFAULT_TIMEZONE = "Asia/Kolkata"
+
+# Resolve the zone from the coordinates instead of naming one
+AUTO_TIMEZONE = "auto"
+
+TZ_DATA_ENV = "ASTROCSV_TZ_DATA"
+PACKAGE_TZ_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tzdata")
+PACKAGE_TZ_FILES = ("timezones.geojson.gz", "timezones.geojson")
+
+# Decimals of the coordinates memoized by resolve_timezone_name (~11 m)
+RESOLVE_CACHE_DECIMALS = 4
+
+# Farthest gazetteer place whose zone "auto" uses without polygon data
+NEAREST_PLACE_MAX_KM = 500.0
+
+Edge = Tuple[float, float, float, float]
+
+@lru_cache(maxsize=1024)
+def get_zone(name: str) -> ZoneInfo:
+    """
+    Return the ZoneInfo for an IANA name, cached.
+
+    Raises:
+        ValueError: If the zone is unknown
+    """
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone: {name}")
+
+def nautical_timezone_name(lon: float) -> str:
+    """Return the Etc/GMT zone whose 15-degree band contains a longitude."""
+    offset = max(-12, min(12, int(round(lon / 15.0))))
+    if offset == 0:
+        return "Etc/GMT"
+    # POSIX-style names have the sign inverted: Etc/GMT-5 is UTC+5
+    return f"Etc/GMT{-offset:+d}"
+
+class TimezoneIndex:
+    """
+    Grid and latitude-band index over time zone polygons.
+
+    Args:
+        polygons: (tzid, rings) per polygon, rings being lists of (lon, lat)
+            with the outer ring first and holes after it
+    """
+
+    def __init__(self, polygons: List[Tuple[str, List[List[Tuple[float, float]]]]]):
+        self.zones: List[str] = []
+        self._bands: List[Dict[int, List[Edge]]] = []
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+
+        for tzid, rings in polygons:
+            polygon_id = len(self.zones)
+            self.zones.append(tzid)
+            bands: Dict[int, List[Edge]] = {}
+            min_lon = min_lat = math.inf
+            max_lon = max_lat = -math.inf
+            for ring in rings:
+                for (x1, y1), (x2, y2) in zip(ring, ring[1:] + ring[:1]):
+                    min_lon, max_lon = min(min_lon, x1), max(max_lon, x1)
+                    min_lat, max_lat = min(min_lat, y1), max(max_lat, y1)
+                    if y1 == y2:
+                        continue  # horizontal edges never cross an eastward ray
+                    for band in range(math.floor(min(y1, y2)), math.floor(max(y1, y2)) + 1):
+                        bands.setdefault(band, []).append((x1, y1, x2, y2))
+            self._bands.append(bands)
+            if min_lon == math.inf:
+                continue
+            for cell_lon in range(math.floor(min_lon), math.floor(max_lon) + 1):
+                for cell_lat in range(math.floor(min_lat), math.floor(max_lat) + 1):
+                    self._cells.setdefault((cell_lon, cell_lat), []).append(polygon_id)
+
+    def _contains(self, polygon_id: int, lat: float, lon: float) -> bool:
+        """Even-odd ray cast eastward from the point, using edges in its latitude band."""
+        inside = False
+        for x1, y1, x2, y2 in self._bands[polygon_id].get(math.floor(lat), ()):
+            if (y1 > lat) != (y2 > lat):
+                crossing = x1 + (lat - y1) * (x2 - x1) / (y2 - y1)
+                if crossing > lon:
+                    inside = not inside
+        return inside
+
+    def lookup(self, lat: float, lon: float) -> Optional[str]:
+        """Return the tzid containing a point, or None if no polygon does."""
+        candidates = self._cells.get((math.floor(lon), math.floor(lat)), ())
+        for polygon_id in candidates:
+            if self._contains(polygon_id, lat, lon):
+                return self.zones[polygon_id]
+        return None
+
+def load_timezone_polygons(path: str) -> List[Tuple[str, List[List[Tuple[float, float]]]]]:
+    """
+    Read time zone polygons from a (optionally gzipped) GeoJSON file.
+
+    Returns:
+        (tzid, rings) per polygon
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as handle:
+        collection = json.load(handle)
+
+    polygons = []
+    for feature in collection["features"]:
+        tzid = feature["properties"]["tzid"]
+        geometry = feature["geometry"]
+        if geometry["type"] == "Polygon":
+            parts = [geometry["coordinates"]]
+        elif geometry["type"] == "MultiPolygon":
+            parts = geometry["coordinates"]
+        else:
+            continue
+        for rings in parts:
+            polygons.append((tzid, [[(point[0], point[1]) for point in ring] for ring in rings]))
+    return polygons
+
+def find_timezone_data() -> Optional[str]:
+    """Return the polygon file to use, or None if there is none."""
+    if os.environ.get(TZ_DATA_ENV):
+        return os.environ[TZ_DATA_ENV]
+    for name in PACKAGE_TZ_FILES:
+        path = os.path.join(PACKAGE_TZ_DIR, name)
+        if os.path.exists(path):
+            return path
+    return None
+
+_index: Optional[TimezoneIndex] = None
+_index_loaded = False
+_index_lock = threading.Lock()
+
+def get_timezone_index() -> Optional[TimezoneIndex]:
+    """Return the process-wide polygon index, loading it on first use (None without data)."""
+    global _index, _index_loaded
+    if not _index_loaded:
+        with _index_lock:
+            if not _index_loaded:
+                path = find_timezone_data()
+                _index = TimezoneIndex(load_timezone_polygons(path)) if path else None
+                _index_loaded = True
+    return _index
+
+@lru_cache(maxsize=65536)
+def _resolve_quantized(lat: float, lon: float) -> str:
+    index = get_timezone_index()
+    if index is not None:
+        return index.lookup(lat, lon) or nautical_timezone_name(lon)
+    place, distance = get_gazetteer().nearest(lat, lon)
+    if place is None or not place.timezone or distance > NEAREST_PLACE_MAX_KM:
+        raise ValueError(
+            f"Cannot resolve the time zone of ({lat}, {lon}): no time zone polygon data is "
+            f"installed and no gazetteer place is within {NEAREST_PLACE_MAX_KM:.0f} km; "
+            f"name the zone or install polygons (see astrocsv/tzdata/README.md)"
+        )
+    return place.timezone
+
+def resolve_timezone_name(lat: float, lon: float) -> str:
+    """
+    Resolve coordinates to an IANA zone name.
+
+    Args:
+        lat: Latitude in decimal degrees
+        lon: Longitude in decimal degrees
+
+    Returns:
+        Zone name from the polygon data (the nautical zone if no polygon
+        covers the point), or without polygon data the zone of the nearest
+        gazetteer place
+
+    Raises:
+        ValueError: Without polygon data, if no gazetteer place with a zone
+            is within NEAREST_PLACE_MAX_KM
+    """
+    return _resolve_quantized(round(lat, RESOLVE_CACHE_DECIMALS), round(lon, RESOLVE_CACHE_DECIMALS))
+
+def resolve_timezone(lat: float, lon: float) -> ZoneInfo:
+    """Resolve coordinates to a cached ZoneInfo (see resolve_timezone_name)."""
+    return get_zone(resolve_timezone_name(lat, lon))
+
+def get_timezone(name: Optional[str], lat: float, lon: float) -> ZoneInfo:
+    """
+    Return the zone requested for a location.
+
+    Args:
+        name: IANA name, "auto" to resolve from the coordinates, or None for
+            the default (IST)
+        lat: Latitude in decimal degrees
+        lon: Longitude in decimal degrees
+
+    Raises:
+        ValueError: If the zone name is unknown, or "auto" cannot be resolved
+    """
+    if not name:
+        return get_zone(DEFAULT_TIMEZONE)
+    if name == AUTO_TIMEZONE:
+        return resolve_timezone(lat, lon)
+    return get_zone(name)
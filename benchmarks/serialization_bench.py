@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark: JSON serialization of the largest API payloads.
+
+Compares the original path (build one dict per change row, validate through
+the AstroResponse model, encode with the standard json module) against the
+pre-serialized fragment path now used by api/main.py. Reports bytes per
+second and p50/p99 latency for /calculate with ascendant changes and for
+/ascendant-changes.
+
+Usage:
+    python benchmarks/serialization_bench.py [--iterations 200]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.main import (
+    AstroResponse, _change_row_fragments, _render_change_rows
+)
+from astrocsv.mapping_library import generate_ascendant_sub_sub_lord_changes
+from astrocsv.serialization import dumps_object, ORJSON_AVAILABLE
+
+SUNRISE = datetime.fromisoformat("2025-08-20T06:12:34.567890+05:30")
+
+HEADER = {
+    "date": "2025-08-20",
+    "latitude": 19.076,
+    "longitude": 72.8777,
+    "timezone": "Asia/Kolkata",
+    "sunrise": SUNRISE.isoformat(),
+    "next_sunrise": (SUNRISE + timedelta(days=1)).isoformat(),
+    "ascendant": 137.123,
+    "ascendant_sign": "Leo",
+    "ascendant_sign_lord": "Sun",
+    "ascendant_nakshatra": "Purva Phalguni",
+    "ascendant_nakshatra_lord": "Venus",
+    "ascendant_sub_lord": "Moon",
+    "ascendant_sub_sub_lord": "Mars",
+}
+
+def legacy_change_rows(base_time: datetime) -> list:
+    """Build change rows the way the endpoints did before the fast path."""
+    rows = []
+    for change_data in generate_ascendant_sub_sub_lord_changes():
+        change_time = base_time + timedelta(minutes=change_data['degree'] * 4)
+        rows.append({
+            "degree": change_data['degree'],
+            "date": change_time.strftime("%Y-%m-%d"),
+            "time": change_time.strftime("%H:%M:%S"),
+            "ascendant_degree": change_data['degree'],
+            "sign": change_data['sign'],
+            "sign_lord": change_data['sign_lord'],
+            "nakshatra": change_data['nakshatra'],
+            "nakshatra_lord": change_data['nakshatra_lord'],
+            "sub_lord": change_data['sub_lord'],
+            "sub_sub_lord": change_data['sub_sub_lord'],
+            "is_sub_sub_lord_change": 'Sub Sub Lord:' in change_data['change_type'],
+            "change_type": change_data['change_type']
+        })
+    return rows
+
+def legacy_calculate() -> bytes:
+    response = AstroResponse(
+        **HEADER,
+        ascendant_changes=legacy_change_rows(SUNRISE),
+        message="Astrological calculations completed successfully"
+    )
+    return json.dumps(response.model_dump(), separators=(",", ":")).encode("utf-8")
+
+def fast_calculate() -> bytes:
+    return dumps_object({
+        **HEADER,
+        "ascendant_changes": _render_change_rows(SUNRISE, _change_row_fragments(True)),
+        "message": "Astrological calculations completed successfully"
+    })
+
+def legacy_ascendant_changes() -> bytes:
+    rows = legacy_change_rows(datetime.now())
+    return json.dumps({"total_changes": len(rows), "ascendant_changes": rows}).encode("utf-8")
+
+def fast_ascendant_changes() -> bytes:
+    fragments = _change_row_fragments(True)
+    return dumps_object({
+        "total_changes": len(fragments),
+        "ascendant_changes": _render_change_rows(datetime.now(), fragments)
+    })
+
+def measure(func, iterations: int) -> dict:
+    """Time func over iterations runs after one warm-up call."""
+    size = len(func())
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {
+        "bytes": size,
+        "p50_ms": statistics.median(samples) * 1000,
+        "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000,
+        "mb_per_s": size * len(samples) / sum(samples) / 1e6
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"orjson available: {ORJSON_AVAILABLE}")
+    print(f"{'payload':<22}{'path':<8}{'bytes':>10}{'p50 ms':>10}{'p99 ms':>10}{'MB/s':>10}")
+    cases = [
+        ("/calculate", legacy_calculate, fast_calculate),
+        ("/ascendant-changes", legacy_ascendant_changes, fast_ascendant_changes),
+    ]
+    for name, legacy, fast in cases:
+        for label, func in (("before", legacy), ("after", fast)):
+            result = measure(func, args.iterations)
+            print(f"{name:<22}{label:<8}{result['bytes']:>10}{result['p50_ms']:>10.2f}"
+                  f"{result['p99_ms']:>10.2f}{result['mb_per_s']:>10.1f}")
+
+if __name__ == "__main__":
+    main()
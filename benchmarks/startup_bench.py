@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: desktop backend startup.
+
+Launches python_backend/main.py the way the Electron app does and measures,
+from process spawn, how long until /health answers, how long until /ready
+reports warm-up finished, and the latency of the first and second
+/calculate requests made right after /health answers (the cold path) or
+after /ready (the warm path).
+
+Usage:
+    python benchmarks/startup_bench.py [--runs 5] [--wait-ready]
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND = os.path.join(ROOT, "python_backend", "main.py")
+
+CALCULATE_BODY = json.dumps({
+    "latitude": 19.076,
+    "longitude": 72.8777,
+    "date": "2025-08-20",
+    "include_degree_buckets": True
+}).encode("utf-8")
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def request(url: str, body: bytes = None) -> int:
+    """Send a GET (or POST with a JSON body) and return the status code."""
+    req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=60) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+def wait_for(url: str, start: float, timeout: float = 120.0) -> float:
+    """Poll url until it returns 200; return seconds since start."""
+    while time.perf_counter() - start < timeout:
+        try:
+            if request(url) == 200:
+                return time.perf_counter() - start
+        except (urllib.error.URLError, ConnectionError):
+            pass
+        time.sleep(0.01)
+    raise TimeoutError(f"{url} not ready after {timeout}s")
+
+def timed_calculate(base: str) -> float:
+    start = time.perf_counter()
+    status = request(f"{base}/calculate", CALCULATE_BODY)
+    if status != 200:
+        raise RuntimeError(f"/calculate returned {status}")
+    return time.perf_counter() - start
+
+def run_once(wait_ready: bool) -> dict:
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    env = {**os.environ, "PORT": str(port)}
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, BACKEND], env=env, cwd=ROOT,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        result = {"health_s": wait_for(f"{base}/health", start)}
+        if wait_ready:
+            result["ready_s"] = wait_for(f"{base}/ready", start)
+        result["first_request_s"] = timed_calculate(base)
+        result["second_request_s"] = timed_calculate(base)
+        if not wait_ready:
+            result["ready_s"] = wait_for(f"{base}/ready", start)
+        return result
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--wait-ready", action="store_true",
+                        help="Send the first /calculate after /ready instead of after /health")
+    args = parser.parse_args()
+
+    runs = [run_once(args.wait_ready) for _ in range(args.runs)]
+    print(f"{'metric':<20}{'median s':>10}{'min s':>10}{'max s':>10}")
+    for metric in ("health_s", "ready_s", "first_request_s", "second_request_s"):
+        values = [run[metric] for run in runs]
+        print(f"{metric:<20}{statistics.median(values):>10.3f}{min(values):>10.3f}{max(values):>10.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -4,41 +4,89 @@ Python Backend for LBAT Desktop Application
 Runs as a local server that Electron communicates with
 """
 
+import time
+
+# Reference point for time-to-ready, taken before the heavier imports
+_PROCESS_START = time.perf_counter()
+
 import sys
 import os
+import csv
+import hashlib
 import json
 import asyncio
-from datetime import datetime, date
-from typing import Dict, Any, Optional
+import multiprocessing
+import threading
+import uuid
+from contextlib import contextmanager
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, date, timedelta
+from typing import Dict, Any, List, Optional, AsyncIterator, Iterator
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, File, Form, HTTPException, Request, Response, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse, FileResponse
+from starlette.routing import Match
 from pydantic import BaseModel
 import logging
 
 # Add the parent directory to Python path to import astrocsv
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-try:
-    from astrocsv.ephem import get_sunrise_times, get_ascendant_at_time
-    from astrocsv.mapping_library import (
-        get_sign_and_lord, get_nakshatra_and_lord, get_kp_sub_lords,
-        generate_degree_buckets
-    )
-    from astrocsv.csvout import generate_csv_rows_for_date, write_csv_to_file
-except ImportError as e:
-    logging.error(f"Failed to import astrocsv modules: {e}")
-    # Create dummy functions for fallback
-    def dummy_function(*args, **kwargs):
-        raise Exception("AstroCSV modules not available")
-    
-    get_sunrise_times = dummy_function
-    get_ascendant_at_time = dummy_function
-    get_sign_and_lord = dummy_function
-    get_nakshatra_and_lord = dummy_function
-    get_kp_sub_lords = dummy_function
-    generate_csv_rows_for_date = dummy_function
-    write_csv_to_file = dummy_function
+# Calculation modules (Swiss Ephemeris, astral, pandas) are imported on first
+# use or by the warm-up task, so /health answers as soon as the server listens
+_engine_loaded = False
+_engine_lock = threading.Lock()
+
+def _load_engine() -> None:
+    """Import the astrocsv calculation functions into this module, once per process."""
+    global _engine_loaded, get_sunrise_times, get_ascendant_at_time
+    global get_sign_and_lord, get_nakshatra_and_lord, get_kp_sub_lords, generate_degree_buckets
+    global generate_csv_rows_for_date, write_csv_to_file, get_day_summary, ENGINE_VERSION
+    if _engine_loaded:
+        return
+    with _engine_lock:
+        if _engine_loaded:
+            return
+        try:
+            from astrocsv.ephem import get_sunrise_times, get_ascendant_at_time
+            from astrocsv.mapping_library import (
+                get_sign_and_lord, get_nakshatra_and_lord, get_kp_sub_lords,
+                generate_degree_buckets
+            )
+            from astrocsv.csvout import generate_csv_rows_for_date, write_csv_to_file
+            from astrocsv.summary import get_day_summary
+            from astrocsv.ephem import ENGINE_VERSION
+        except ImportError as e:
+            logging.error(f"Failed to import astrocsv modules: {e}")
+            # Create dummy functions for fallback
+            def dummy_function(*args, **kwargs):
+                raise Exception("AstroCSV modules not available")
+            
+            get_sunrise_times = dummy_function
+            get_ascendant_at_time = dummy_function
+            get_sign_and_lord = dummy_function
+            get_nakshatra_and_lord = dummy_function
+            get_kp_sub_lords = dummy_function
+            generate_degree_buckets = dummy_function
+            generate_csv_rows_for_date = dummy_function
+            write_csv_to_file = dummy_function
+            get_day_summary = dummy_function
+            ENGINE_VERSION = "unavailable"
+        _engine_loaded = True
+
+from astrocsv.cache import result_cache_from_env
+from astrocsv.timezones import get_timezone
+from astrocsv.gazetteer import resolve_place, search_places
+from astrocsv.metrics import (
+    REGISTRY, CONTENT_TYPE as METRICS_CONTENT_TYPE, CallbackMetric,
+    STAGE_SECONDS, HTTP_REQUEST_SECONDS, EXECUTOR_PENDING, cache_stats_collector
+)
+from astrocsv.jobs import (
+    JobManager, EXPORT_JOB_KIND, CHART_BATCH_JOB_KIND, CHART_BATCH_REJECTS, SUCCEEDED,
+    run_export_job, run_chart_batch_job, remove_job_input
+)
 
 # Configure logging
 logging.basicConfig(
@@ -63,12 +111,37 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def _route_template(request: Request) -> str:
+    """Return the path template of the route serving a request, e.g. /calculate."""
+    for route in request.app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return getattr(route, "path", request.url.path)
+    return "unmatched"
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """Observe per-route request latency for /metrics."""
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        elapsed = time.perf_counter() - start
+        route = _route_template(request)
+        HTTP_REQUEST_SECONDS.observe(elapsed, method=request.method, route=route, status=str(status))
+        if _startup["first_request_seconds"] is None and route in CALCULATION_ROUTES:
+            _startup["first_request_seconds"] = round(elapsed, 4)
+
 # Pydantic models
 class AstroRequest(BaseModel):
     latitude: float
     longitude: float
     date: str
     include_degree_buckets: bool = True
+    timezone: Optional[str] = None  # IANA name or "auto"; default IST
 
 class DateRangeRequest(BaseModel):
     latitude: float
@@ -76,6 +149,27 @@ class DateRangeRequest(BaseModel):
     start_date: str
     end_date: str
     include_degree_buckets: bool = True
+    timezone: Optional[str] = None  # IANA name or "auto"; default IST
+
+class StreamRangeRequest(DateRangeRequest):
+    format: str = "ndjson"  # "ndjson" or "sse"
+    workers: int = 1  # >1 computes days in parallel, still delivered in date order
+
+class ExportLocation(BaseModel):
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    name: Optional[str] = None
+    city: Optional[str] = None  # gazetteer name instead of coordinates
+
+class ExportJobRequest(BaseModel):
+    locations: List[ExportLocation]
+    start_date: str
+    end_date: str
+    include_degree_buckets: bool = False
+    include_planets: bool = False
+    timezone: Optional[str] = None
+    cluster_radius_km: Optional[float] = None  # share sunrise work between nearby locations
+    max_sunrise_error: Optional[float] = None  # seconds, for clustered locations
 
 class AstroResponse(BaseModel):
     date: str
@@ -100,6 +194,262 @@ class HealthResponse(BaseModel):
     timestamp: str
     backend_version: str
 
+# Background jobs for exports too large for a single request
+JOBS_DIR = os.environ.get("LBAT_JOBS_DIR", os.path.join(os.path.dirname(__file__), "outputs", "jobs"))
+JOB_WORKERS = int(os.environ.get("LBAT_JOB_WORKERS", "2"))
+UPLOADS_DIR = os.path.join(JOBS_DIR, "uploads")
+UPLOAD_BLOCK_SIZE = 1 << 20
+_job_manager: Optional[JobManager] = None
+
+def _get_job_manager() -> JobManager:
+    """Return the job manager, creating it and resuming unfinished jobs on first use."""
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = JobManager(
+            os.path.join(JOBS_DIR, "jobs.sqlite3"),
+            os.path.join(JOBS_DIR, "artifacts"),
+            max_workers=JOB_WORKERS
+        )
+        # Exports are CPU-bound sunrise and ascendant work: keep them off the
+        # API process. Chart batches already compute in their own pool.
+        _job_manager.register_runner(EXPORT_JOB_KIND, run_export_job, extension="csv", isolated=True)
+        _job_manager.register_runner(
+            CHART_BATCH_JOB_KIND, run_chart_batch_job, extension="csv", on_finish=remove_job_input
+        )
+        resumed = _job_manager.resume()
+        if resumed:
+            logger.info(f"Resumed {resumed} unfinished jobs")
+    return _job_manager
+
+def _job_status(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Public view of a job record."""
+    return {
+        "job_id": job["id"],
+        "kind": job["kind"],
+        "state": job["state"],
+        "progress_done": job["progress_done"],
+        "progress_total": job["progress_total"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+        "artifact_url": f"/jobs/{job['id']}/artifact" if job["state"] == SUCCEEDED else None
+    }
+
+# Process pool for parallel range calculations, created on first use
+_range_executor: Optional[ProcessPoolExecutor] = None
+
+def _get_range_executor() -> ProcessPoolExecutor:
+    """Return the shared range process pool, sized to the machine's CPU count."""
+    global _range_executor
+    if _range_executor is None:
+        _range_executor = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+    return _range_executor
+
+def _iter_dates(start_date: date, end_date: date) -> Iterator[date]:
+    """Yield every date from start_date to end_date inclusive."""
+    current_date = start_date
+    while current_date <= end_date:
+        yield current_date
+        current_date += timedelta(days=1)
+
+# Day and range results, shared between processes when ASTROCSV_CACHE_URL
+# points at a SQLite file or Redis server. Opened per process on first use.
+_result_cache = None
+_result_cache_pid = None
+
+def _get_result_cache():
+    """Return this process's result cache, reopening it after a fork."""
+    global _result_cache, _result_cache_pid
+    _load_engine()
+    if _result_cache is None or _result_cache_pid != os.getpid():
+        _result_cache = result_cache_from_env(ENGINE_VERSION)
+        _result_cache_pid = os.getpid()
+    return _result_cache
+
+REGISTRY.register(CallbackMetric(
+    "astrocsv_backend_cache",
+    "Day and range result cache statistics",
+    cache_stats_collector({"results": lambda: _result_cache.stats() if _result_cache is not None else {}})
+))
+
+def _calculate_day(
+    latitude: float,
+    longitude: float,
+    current_date: date,
+    timezone: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Calculate the ascendant summary for one day of a date range.
+
+    Errors are reported in the result instead of raised so a single bad day
+    does not abort the whole range. The time zone is passed by name so the
+    call can be sent to the process pool.
+    """
+    _load_engine()
+    try:
+        tz = get_timezone(timezone, latitude, longitude)
+        summary = get_day_summary(latitude, longitude, current_date, _get_result_cache(), tz)
+
+        return {
+            "date": current_date.strftime("%Y-%m-%d"),
+            "sunrise_ist": summary["sunrise"],
+            "next_sunrise_ist": summary["next_sunrise"],
+            "latitude": latitude,
+            "longitude": longitude,
+            "ascendant_degree": round(summary["ascendant"], 3),
+            "ascendant_sign": summary["sign"],
+            "ascendant_sign_lord": summary["sign_lord"],
+            "ascendant_nakshatra": summary["nakshatra"],
+            "ascendant_nakshatra_lord": summary["nakshatra_lord"],
+            "ascendant_sub_lord": summary["sub_lord"],
+            "ascendant_sub_sub_lord": summary["sub_sub_lord"],
+            "success": True
+        }
+
+    except Exception as e:
+        logger.error(f"Error calculating for date {current_date}: {e}")
+        return {
+            "date": current_date.strftime("%Y-%m-%d"),
+            "success": False,
+            "error": str(e)
+        }
+
+async def _iter_range_results(
+    latitude: float,
+    longitude: float,
+    start_date: date,
+    end_date: date,
+    workers: int = 1,
+    timezone: Optional[str] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield day results in date order as soon as each one is available.
+
+    With workers > 1 days are computed in the shared process pool. At most
+    ``workers * 2`` days are in flight per stream, so memory stays bounded
+    and the first day is delivered after one calculation regardless of the
+    range length.
+    """
+    loop = asyncio.get_running_loop()
+
+    if workers <= 1:
+        for current_date in _iter_dates(start_date, end_date):
+            with EXECUTOR_PENDING.track_inprogress(executor="default"):
+                result = await loop.run_in_executor(
+                    None, _calculate_day, latitude, longitude, current_date, timezone
+                )
+            yield result
+        return
+
+    executor = _get_range_executor()
+    window = workers * 2
+    pending = deque()
+    try:
+        for current_date in _iter_dates(start_date, end_date):
+            future = loop.run_in_executor(executor, _calculate_day, latitude, longitude, current_date, timezone)
+            EXECUTOR_PENDING.inc(executor="range")
+            future.add_done_callback(lambda _: EXECUTOR_PENDING.dec(executor="range"))
+            pending.append(future)
+            if len(pending) >= window:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        # Client went away or the stream failed: drop queued days
+        for future in pending:
+            future.cancel()
+
+def _format_stream_event(item: Dict[str, Any], stream_format: str, event: str = "day") -> str:
+    """Encode one streamed item as an NDJSON line or an SSE event."""
+    with STAGE_SECONDS.time(stage="serialization"):
+        payload = json.dumps(item)
+    if stream_format == "sse":
+        return f"event: {event}\ndata: {payload}\n\n"
+    return payload + "\n"
+
+# Startup progress reported by /ready and /metrics
+WARMUP_RANGE_POOL = os.environ.get("LBAT_WARMUP_RANGE_POOL", "1") == "1"
+CALCULATION_ROUTES = ("/calculate", "/calculate-range", "/calculate-range/stream", "/generate-csv")
+_startup: Dict[str, Any] = {
+    "state": "starting",  # starting -> warming -> ready | failed
+    "stages": {},
+    "time_to_listen_seconds": None,
+    "time_to_ready_seconds": None,
+    "first_request_seconds": None,
+    "ephemeris_backend": None,
+    "ephemeris_path": None,
+    "error": None
+}
+
+@contextmanager
+def _startup_stage(name: str) -> Iterator[None]:
+    """Record the duration of one warm-up stage."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _startup["stages"][name] = round(time.perf_counter() - start, 4)
+
+def _warm_worker(_: int) -> int:
+    """Load the calculation modules, ephemeris files and lookup tables in a range pool worker."""
+    from astrocsv.mapping_library import get_kp_segment_table
+    from astrocsv.ephem import setup_swiss_ephemeris
+    _load_engine()
+    setup_swiss_ephemeris()
+    get_kp_segment_table()
+    return os.getpid()
+
+def _warm_up() -> None:
+    """
+    Preload everything the first calculation would otherwise pay for.
+
+    Imports the calculation modules, builds the lookup tables, runs one
+    calculation so the ephemeris files are opened, and starts the range
+    process pool.
+    """
+    from astrocsv.mapping_library import get_kp_segment_table, get_ascendant_change_table
+    from astrocsv.ephem import setup_swiss_ephemeris
+
+    _startup["state"] = "warming"
+    try:
+        with _startup_stage("imports"):
+            _load_engine()
+        with _startup_stage("tables"):
+            get_kp_segment_table()
+            get_ascendant_change_table()
+            generate_degree_buckets()
+        with _startup_stage("ephemeris"):
+            ephemeris = setup_swiss_ephemeris()
+            _startup["ephemeris_backend"] = ephemeris["backend"]
+            _startup["ephemeris_path"] = ephemeris["path"]
+            get_day_summary(28.6139, 77.2090, date.today())
+        if WARMUP_RANGE_POOL:
+            with _startup_stage("range_pool"):
+                workers = os.cpu_count() or 1
+                list(_get_range_executor().map(_warm_worker, range(workers)))
+        _startup["state"] = "ready"
+    except Exception as e:
+        logger.error(f"Warm-up failed: {e}")
+        _startup["state"] = "failed"
+        _startup["error"] = str(e)
+    finally:
+        _startup["time_to_ready_seconds"] = round(time.perf_counter() - _PROCESS_START, 4)
+        logger.info(f"Warm-up {_startup['state']} after {_startup['time_to_ready_seconds']}s: {_startup['stages']}")
+
+def _startup_samples():
+    """Startup durations as CallbackMetric samples."""
+    for stage, seconds in list(_startup["stages"].items()):
+        yield {"stage": stage}, seconds
+    for stage in ("time_to_listen", "time_to_ready", "first_request"):
+        if _startup[f"{stage}_seconds"] is not None:
+            yield {"stage": stage}, _startup[f"{stage}_seconds"]
+
+REGISTRY.register(CallbackMetric(
+    "astrocsv_backend_startup_seconds",
+    "Warm-up stage durations, time to ready and first calculation latency",
+    _startup_samples
+))
+
 @app.get("/", response_model=HealthResponse)
 async def root():
     """Root endpoint with health information."""
@@ -120,9 +470,33 @@ async def health_check():
         backend_version="1.0.0"
     )
 
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness endpoint.
+
+    Returns 200 once warm-up has finished and 503 with Retry-After while it
+    is running. Calculations still work before then, they are just slower.
+    """
+    body = {**_startup, "stages": dict(_startup["stages"])}
+    if _startup["state"] == "ready":
+        return body
+    return Response(
+        content=json.dumps(body),
+        status_code=503,
+        media_type="application/json",
+        headers={"Retry-After": "1"}
+    )
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus text exposition of request, stage and ephemeris metrics."""
+    return Response(content=REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
+
 @app.post("/calculate", response_model=AstroResponse)
 async def calculate_astro_data(request: AstroRequest):
     """Calculate astrological data for a given location and date."""
+    _load_engine()
     try:
         logger.info(f"Calculating astro data for {request.latitude}, {request.longitude} on {request.date}")
         
@@ -135,16 +509,10 @@ async def calculate_astro_data(request: AstroRequest):
         # Parse date string to date object
         target_date = datetime.strptime(request.date, "%Y-%m-%d").date()
         
-        # Calculate sunrise times
-        sunrise, next_sunrise = get_sunrise_times(request.latitude, request.longitude, target_date)
-        
-        # Calculate ascendant at sunrise time
-        ascendant = get_ascendant_at_time(request.latitude, request.longitude, sunrise)
-        
-        # Get astrological details for ascendant
-        sign, sign_lord = get_sign_and_lord(ascendant)
-        nakshatra, nakshatra_lord = get_nakshatra_and_lord(ascendant)
-        sub_lord, sub_sub_lord = get_kp_sub_lords(ascendant)
+        # Sunrise, ascendant and lords through the shared day cache, as for
+        # each day of /calculate-range (stages are timed inside)
+        tz = get_timezone(request.timezone, request.latitude, request.longitude)
+        summary = get_day_summary(request.latitude, request.longitude, target_date, _get_result_cache(), tz)
         
         # Generate degree buckets if requested
         degree_buckets = None
@@ -153,17 +521,17 @@ async def calculate_astro_data(request: AstroRequest):
         
         return AstroResponse(
             date=request.date,
-            sunrise_ist=sunrise.isoformat(),
-            next_sunrise_ist=next_sunrise.isoformat(),
+            sunrise_ist=summary["sunrise"],
+            next_sunrise_ist=summary["next_sunrise"],
             latitude=request.latitude,
             longitude=request.longitude,
-            ascendant_degree=round(ascendant, 3),
-            ascendant_sign=sign,
-            ascendant_sign_lord=sign_lord,
-            ascendant_nakshatra=nakshatra,
-            ascendant_nakshatra_lord=nakshatra_lord,
-            ascendant_sub_lord=sub_lord,
-            ascendant_sub_sub_lord=sub_sub_lord,
+            ascendant_degree=round(summary["ascendant"], 3),
+            ascendant_sign=summary["sign"],
+            ascendant_sign_lord=summary["sign_lord"],
+            ascendant_nakshatra=summary["nakshatra"],
+            ascendant_nakshatra_lord=summary["nakshatra_lord"],
+            ascendant_sub_lord=summary["sub_lord"],
+            ascendant_sub_sub_lord=summary["sub_sub_lord"],
             degree_buckets=degree_buckets,
             success=True,
             message="Calculation completed successfully"
@@ -208,45 +576,24 @@ async def calculate_date_range(request: DateRangeRequest):
         if start_date >= end_date:
             raise HTTPException(status_code=400, detail="Start date must be before end date")
         
-        results = []
-        current_date = start_date
-        
-        while current_date <= end_date:
-            try:
-                # Calculate for current date
-                sunrise, next_sunrise = get_sunrise_times(request.latitude, request.longitude, current_date)
-                ascendant = get_ascendant_at_time(request.latitude, request.longitude, sunrise)
-                
-                sign, sign_lord = get_sign_and_lord(ascendant)
-                nakshatra, nakshatra_lord = get_nakshatra_and_lord(ascendant)
-                sub_lord, sub_sub_lord = get_kp_sub_lords(ascendant)
-                
-                results.append({
-                    "date": current_date.strftime("%Y-%m-%d"),
-                    "sunrise_ist": sunrise.isoformat(),
-                    "next_sunrise_ist": next_sunrise.isoformat(),
-                    "latitude": request.latitude,
-                    "longitude": request.longitude,
-                    "ascendant_degree": round(ascendant, 3),
-                    "ascendant_sign": sign,
-                    "ascendant_sign_lord": sign_lord,
-                    "ascendant_nakshatra": nakshatra,
-                    "ascendant_nakshatra_lord": nakshatra_lord,
-                    "ascendant_sub_lord": sub_lord,
-                    "ascendant_sub_sub_lord": sub_sub_lord,
-                    "success": True
-                })
-                
-            except Exception as e:
-                logger.error(f"Error calculating for date {current_date}: {e}")
-                results.append({
-                    "date": current_date.strftime("%Y-%m-%d"),
-                    "success": False,
-                    "error": str(e)
-                })
-            
-            current_date = current_date.replace(day=current_date.day + 1)
+        try:
+            get_timezone(request.timezone, request.latitude, request.longitude)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
+        # Whole ranges are cached too, so repeated exports are a single read
+        range_key = (request.latitude, request.longitude, start_date.isoformat(), end_date.isoformat())
+        if request.timezone:
+            range_key += (request.timezone,)
+        results = _get_result_cache().get("range", range_key)
+        if results is None:
+            results = [
+                _calculate_day(request.latitude, request.longitude, current_date, request.timezone)
+                for current_date in _iter_dates(start_date, end_date)
+            ]
+            if all(result["success"] for result in results):
+                _get_result_cache().set("range", range_key, results)
+
         return {
             "success": True,
             "message": f"Calculated data for {len(results)} dates",
@@ -258,9 +605,62 @@ async def calculate_date_range(request: DateRangeRequest):
         logger.error(f"Error in calculate_date_range: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/calculate-range/stream")
+async def stream_date_range(request: StreamRangeRequest):
+    """
+    Stream astrological data for a date range, one day at a time.
+
+    Each day is emitted as soon as it is computed, either as NDJSON lines
+    (``format="ndjson"``) or as Server-Sent Events (``format="sse"``).
+    """
+    logger.info(f"Streaming astro data range for {request.latitude}, {request.longitude} from {request.start_date} to {request.end_date}")
+
+    # Validate coordinates
+    if not -90 <= request.latitude <= 90:
+        raise HTTPException(status_code=400, detail="Latitude must be between -90 and 90")
+    if not -180 <= request.longitude <= 180:
+        raise HTTPException(status_code=400, detail="Longitude must be between -180 and 180")
+    if request.format not in ("ndjson", "sse"):
+        raise HTTPException(status_code=400, detail="Format must be 'ndjson' or 'sse'")
+
+    # Parse dates
+    try:
+        start_date = datetime.strptime(request.start_date, "%Y-%m-%d").date()
+        end_date = datetime.strptime(request.end_date, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Dates must be in YYYY-MM-DD format")
+
+    if start_date >= end_date:
+        raise HTTPException(status_code=400, detail="Start date must be before end date")
+
+    try:
+        get_timezone(request.timezone, request.latitude, request.longitude)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    workers = max(1, min(request.workers, os.cpu_count() or 1))
+
+    async def event_stream():
+        total_dates = 0
+        async for result in _iter_range_results(
+            request.latitude, request.longitude, start_date, end_date, workers, request.timezone
+        ):
+            total_dates += 1
+            yield _format_stream_event(result, request.format)
+        if request.format == "sse":
+            yield _format_stream_event({"total_dates": total_dates}, request.format, event="end")
+
+    media_type = "text/event-stream" if request.format == "sse" else "application/x-ndjson"
+    return StreamingResponse(
+        event_stream(),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/generate-csv")
 async def generate_csv(request: AstroRequest):
     """Generate CSV file for the given location and date."""
+    _load_engine()
     try:
         logger.info(f"Generating CSV for {request.latitude}, {request.longitude} on {request.date}")
         
@@ -274,7 +674,8 @@ async def generate_csv(request: AstroRequest):
         target_date = datetime.strptime(request.date, "%Y-%m-%d").date()
         
         # Calculate sunrise times
-        sunrise, next_sunrise = get_sunrise_times(request.latitude, request.longitude, target_date)
+        tz = get_timezone(request.timezone, request.latitude, request.longitude)
+        sunrise, next_sunrise = get_sunrise_times(request.latitude, request.longitude, target_date, tz)
         
         # Calculate ascendant at sunrise time
         ascendant = get_ascendant_at_time(request.latitude, request.longitude, sunrise)
@@ -313,7 +714,218 @@ async def generate_csv(request: AstroRequest):
         logger.error(f"Error in generate_csv: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.on_event("startup")
+async def start_job_manager():
+    """Resume jobs left unfinished by a previous run."""
+    _get_job_manager()
+
+@app.on_event("startup")
+async def start_warm_up():
+    """Start warming up in the background so the server listens immediately."""
+    _startup["time_to_listen_seconds"] = round(time.perf_counter() - _PROCESS_START, 4)
+    asyncio.get_running_loop().run_in_executor(None, _warm_up)
+
+@app.on_event("shutdown")
+async def stop_job_manager():
+    """Stop job workers; unfinished jobs resume on the next start."""
+    if _job_manager is not None:
+        _job_manager.shutdown()
+
+@app.get("/places")
+async def places(q: str, limit: int = 10, country: Optional[str] = None):
+    """Search the offline gazetteer by name prefix, most populous places first."""
+    if not 1 <= limit <= 100:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 100")
+    return {"places": [place.to_dict() for place in search_places(q, limit=limit, country=country)]}
+
+# Longest date range served by /panchang in one request
+PANCHANG_MAX_DAYS = 366
+
+@app.get("/panchang")
+async def panchang(
+    latitude: float,
+    longitude: float,
+    start_date: str,
+    end_date: Optional[str] = None,
+    timezone: Optional[str] = None,
+    ayanamsa: str = "lahiri"
+):
+    """Panchang elements at sunrise and their end times for a date range."""
+    _load_engine()
+    from astrocsv.ephem import AYANAMSAS
+    from astrocsv.panchang import panchang_for_dates
+
+    if not -90 <= latitude <= 90:
+        raise HTTPException(status_code=400, detail="Latitude must be between -90 and 90")
+    if not -180 <= longitude <= 180:
+        raise HTTPException(status_code=400, detail="Longitude must be between -180 and 180")
+    try:
+        first = datetime.strptime(start_date, "%Y-%m-%d").date()
+        last = datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else first
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    if last < first:
+        raise HTTPException(status_code=400, detail="Start date must be before or equal to end date")
+    if (last - first).days >= PANCHANG_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range must not exceed {PANCHANG_MAX_DAYS} days")
+    if ayanamsa not in AYANAMSAS:
+        raise HTTPException(status_code=400, detail=f"Ayanamsa must be one of {', '.join(AYANAMSAS)}")
+    try:
+        tz = get_timezone(timezone, latitude, longitude)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    loop = asyncio.get_running_loop()
+    try:
+        rows = await loop.run_in_executor(
+            None, panchang_for_dates, latitude, longitude, list(_iter_dates(first, last)), tz, None, ayanamsa
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"success": True, "timezone": tz.key, "results": rows, "total_dates": len(rows)}
+
+@app.post("/jobs")
+async def submit_export_job(request: ExportJobRequest):
+    """
+    Submit a multi-location, multi-day CSV export as a background job.
+
+    Identical submissions return the existing job instead of starting a new one.
+    """
+    if not request.locations:
+        raise HTTPException(status_code=400, detail="At least one location is required")
+    for location in request.locations:
+        if location.city:
+            try:
+                place = resolve_place(location.city)
+            except KeyError as e:
+                raise HTTPException(status_code=404, detail=str(e.args[0]))
+            location.latitude, location.longitude = place.latitude, place.longitude
+            location.name = location.name or place.name
+        elif location.latitude is None or location.longitude is None:
+            raise HTTPException(status_code=400, detail="Each location needs latitude and longitude or a city")
+        if not -90 <= location.latitude <= 90:
+            raise HTTPException(status_code=400, detail="Latitude must be between -90 and 90")
+        if not -180 <= location.longitude <= 180:
+            raise HTTPException(status_code=400, detail="Longitude must be between -180 and 180")
+    try:
+        start_date = datetime.strptime(request.start_date, "%Y-%m-%d").date()
+        end_date = datetime.strptime(request.end_date, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Dates must be in YYYY-MM-DD format")
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="Start date must be before or equal to end date")
+    if request.cluster_radius_km is not None and request.cluster_radius_km < 0:
+        raise HTTPException(status_code=400, detail="cluster_radius_km must not be negative")
+
+    spec = {
+        "locations": [location.model_dump() for location in request.locations],
+        "start_date": request.start_date,
+        "end_date": request.end_date,
+        "include_degree_buckets": request.include_degree_buckets,
+        "include_planets": request.include_planets,
+        "timezone": request.timezone,
+        "cluster_radius_km": request.cluster_radius_km,
+        "max_sunrise_error": request.max_sunrise_error
+    }
+    job, deduplicated = _get_job_manager().submit(EXPORT_JOB_KIND, spec)
+    logger.info(f"Export job {job['id']} {'reused' if deduplicated else 'submitted'}")
+    return {**_job_status(job), "deduplicated": deduplicated}
+
+@app.post("/chart-batch")
+async def submit_chart_batch_job(file: UploadFile = File(...), timezone: Optional[str] = Form(None)):
+    """
+    Upload a CSV of birth records and compute their natal charts as a background job.
+
+    The file needs id, birth_time, latitude and longitude columns (and may
+    have a timezone column); timezone applies to naive birth times of rows
+    without one. Skipped records are listed at /jobs/{job_id}/rejects.
+    Uploading the same file again returns the existing job. The upload is
+    deleted once its job finishes.
+    """
+    if timezone and timezone != "auto":
+        try:
+            get_timezone(timezone, 0.0, 0.0)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    # Stream the upload to disk, writing off the event loop
+    loop = asyncio.get_running_loop()
+    os.makedirs(UPLOADS_DIR, exist_ok=True)
+    digest = hashlib.sha256()
+    path = os.path.join(UPLOADS_DIR, f"{uuid.uuid4().hex}.csv")
+    partial = path + ".part"
+    try:
+        with open(partial, "wb") as handle:
+            while block := await file.read(UPLOAD_BLOCK_SIZE):
+                digest.update(block)
+                await loop.run_in_executor(None, handle.write, block)
+    except BaseException:
+        os.remove(partial)
+        raise
+    with open(partial, newline="", encoding="utf-8", errors="replace") as handle:
+        header = next(csv.reader(handle), [])
+    missing = [column for column in ("id", "birth_time", "latitude", "longitude") if column not in header]
+    if missing:
+        os.remove(partial)
+        raise HTTPException(status_code=400, detail=f"Upload is missing column(s): {', '.join(missing)}")
+    os.replace(partial, path)
+
+    # Each job owns its upload (deleted when the job finishes); identical
+    # uploads are matched by content hash and the duplicate is dropped
+    spec = {"input": path, "input_sha256": digest.hexdigest(), "timezone": timezone}
+    job, deduplicated = _get_job_manager().submit(
+        CHART_BATCH_JOB_KIND, spec, dedupe_spec={"input_sha256": spec["input_sha256"], "timezone": timezone}
+    )
+    if deduplicated:
+        os.remove(path)
+    logger.info(f"Chart batch job {job['id']} {'reused' if deduplicated else 'submitted'}")
+    return {
+        **_job_status(job),
+        "deduplicated": deduplicated,
+        "rejects_url": f"/jobs/{job['id']}/rejects"
+    }
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Get the state and progress of a job."""
+    job = _get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_status(job)
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a queued or running job."""
+    job = _get_job_manager().cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_status(job)
+
+@app.get("/jobs/{job_id}/artifact")
+async def download_job_artifact(job_id: str):
+    """Download the output of a finished job."""
+    job = _get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["state"] != SUCCEEDED or not job["artifact"] or not os.path.exists(job["artifact"]):
+        raise HTTPException(status_code=409, detail=f"Job artifact not available (state: {job['state']})")
+    return FileResponse(job["artifact"], media_type="text/csv", filename=f"export_{job_id}.csv")
+
+@app.get("/jobs/{job_id}/rejects")
+async def download_job_rejects(job_id: str):
+    """Download the skipped records and reasons of a finished chart batch job."""
+    job = _get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    path = os.path.join(_get_job_manager().artifact_dir, f"{job_id}.{CHART_BATCH_REJECTS}")
+    if job["kind"] != CHART_BATCH_JOB_KIND or job["state"] != SUCCEEDED or not os.path.exists(path):
+        raise HTTPException(status_code=409, detail=f"Job rejects not available (state: {job['state']})")
+    return FileResponse(path, media_type="text/csv", filename=f"rejects_{job_id}.csv")
+
 if __name__ == "__main__":
+    # Needed for the range process pool in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
+
     # Get port from environment or use default
     port = int(os.environ.get("PORT", 8000))
     host = os.environ.get("HOST", "127.0.0.1")
@@ -0,0 +1,28 @@
+"""
+Polar birth records keep their angles and planets; only the Placidus cusps are empty.
+"""
+
+import pandas as pd
+
+from astrocsv.chart_batch import write_chart_batch
+
+def test_polar_record_is_written_without_cusps(tmp_path):
+    input_path = tmp_path / "births.csv"
+    input_path.write_text(
+        "id,birth_time,latitude,longitude,timezone\n"
+        "pune,1990-05-17T06:30:00,18.5204,73.8567,Asia/Kolkata\n"
+        "tromso,1990-05-17T06:30:00,69.6492,18.9553,Europe/Oslo\n"
+        "bad,1990-05-17T06:30:00,95,18.9553,Europe/Oslo\n",
+        encoding="utf-8"
+    )
+    output_path, rejects_path = tmp_path / "charts.csv", tmp_path / "rejects.csv"
+
+    result = write_chart_batch(str(input_path), str(output_path), str(rejects_path))
+
+    assert (result["charts"], result["rejected"]) == (2, 1)
+    charts = pd.read_csv(output_path).set_index("id")
+    assert charts.loc["pune"].notna().all()
+    tromso = charts.loc["tromso"]
+    assert pd.isna(tromso["cusp_1_deg"]) and pd.isna(tromso["cusp_1_sub_lord"])
+    assert tromso[["asc_deg", "asc_sub_lord", "mc_deg", "sun_deg", "sun_sub_lord"]].notna().all()
+    assert pd.read_csv(rejects_path)["id"].tolist() == ["bad"]
@@ -0,0 +1,33 @@
+"""
+The dasha Moon is sidereal: Lahiri by default, other ayanamsas on request.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+import swisseph as swe
+
+from astrocsv.dasha import dasha_periods, moon_longitudes, parse_birth_times
+from astrocsv.ephem import IST, UNIX_EPOCH_JD
+from astrocsv.mapping_library import VIMSHOTTARI_SEQUENCE
+
+BIRTH = parse_birth_times(pd.Series(["1990-05-15T10:30:00"]), IST)
+
+def test_moon_is_lahiri_sidereal_by_default():
+    jd = BIRTH[0] / 86400.0 + UNIX_EPOCH_JD
+    tropical = swe.calc_ut(jd, swe.MOON)[0][0]
+    swe.set_sid_mode(swe.SIDM_LAHIRI)
+    ayanamsa = swe.get_ayanamsa_ut(jd)
+    # Within nutation in longitude, which sidereal positions leave out
+    assert moon_longitudes(BIRTH)[0] == pytest.approx((tropical - ayanamsa) % 360.0, abs=0.01)
+
+def test_first_maha_dasha_follows_the_sidereal_nakshatra():
+    # Sidereal Moon ~269.8 deg is in Uttara Ashadha, ruled by the Sun;
+    # the tropical Moon (~293.5 deg, Shravana) would start with the Moon
+    periods = dasha_periods(BIRTH, moon_longitudes(BIRTH), "maha")
+    assert VIMSHOTTARI_SEQUENCE[periods["maha"][0]] == "Sun"
+    assert periods["start"][0] == BIRTH[0]
+
+def test_unknown_ayanamsa_raises():
+    with pytest.raises(ValueError):
+        moon_longitudes(np.array([0.0]), "tropical")
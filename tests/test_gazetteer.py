@@ -0,0 +1,24 @@
+"""
+build_gazetteer writes region names from the GeoNames admin1 code table.
+"""
+
+import pytest
+
+from astrocsv.gazetteer import build_gazetteer, load_gazetteer
+
+PUNE = "1259229\tPune\tPune\tPoona,Puna\t18.51957\t73.85535\tP\tPPLA2\tIN\t\t16\t\t\t\t3124458\t\t560\tAsia/Kolkata\t2020-01-01\n"
+
+def test_admin1_codes_become_names(tmp_path):
+    (tmp_path / "cities15000.txt").write_text(PUNE, encoding="utf-8")
+    (tmp_path / "admin1CodesASCII.txt").write_text("IN.16\tMaharashtra\tMaharashtra\t1264418\n", encoding="utf-8")
+    outfile = str(tmp_path / "places.tsv")
+
+    assert build_gazetteer(str(tmp_path / "cities15000.txt"), outfile) == 1
+    place = load_gazetteer(outfile).search("pune")[0]
+    assert place.admin1 == "Maharashtra"
+    assert place.label() == "Pune, Maharashtra, IN"
+
+def test_missing_admin1_table_is_an_error(tmp_path):
+    (tmp_path / "cities15000.txt").write_text(PUNE, encoding="utf-8")
+    with pytest.raises(ValueError, match="admin1"):
+        build_gazetteer(str(tmp_path / "cities15000.txt"), str(tmp_path / "places.tsv"))
@@ -0,0 +1,102 @@
+"""
+Job state transitions are compare-and-set, so a cancel racing the end of a
+job is never overwritten.
+"""
+
+import os
+
+from astrocsv.jobs import CANCELLED, QUEUED, RUNNING, SUCCEEDED, JobManager
+
+def _wait(manager, job_id):
+    manager._executor.shutdown(wait=True)
+    return manager.get(job_id)
+
+def test_update_with_expected_states_is_conditional(tmp_path):
+    manager = JobManager(str(tmp_path / "jobs.db"), str(tmp_path / "artifacts"))
+    job = manager.store.create("noop", {}, "digest")
+    assert not manager.store.update(job["id"], expected_states=(RUNNING,), state=SUCCEEDED)
+    assert manager.store.update(job["id"], expected_states=(QUEUED,), state=RUNNING)
+    assert manager.get(job["id"])["state"] == RUNNING
+    manager.shutdown()
+
+def test_cancel_landing_after_the_last_check_wins(tmp_path):
+    manager = JobManager(str(tmp_path / "jobs.db"), str(tmp_path / "artifacts"))
+
+    def runner(spec, path, context):
+        with open(path, "w") as handle:
+            handle.write("done\n")
+        # A cancel whose store write lands after _run's is_cancelled check
+        manager.store.update(context.job_id, state=CANCELLED)
+
+    manager.register_runner("race", runner)
+    job, _ = manager.submit("race", {})
+    job = _wait(manager, job["id"])
+    assert job["state"] == CANCELLED
+    assert not os.listdir(tmp_path / "artifacts")
+    manager.store.close()
+
+def test_cancel_after_success_leaves_the_job(tmp_path):
+    manager = JobManager(str(tmp_path / "jobs.db"), str(tmp_path / "artifacts"))
+    manager.register_runner("ok", lambda spec, path, context: open(path, "w").close())
+    job, _ = manager.submit("ok", {})
+    _wait(manager, job["id"])
+    assert manager.cancel(job["id"])["state"] == SUCCEEDED
+    manager.store.close()
+
+def test_spec_hash_changes_with_the_engine_version(monkeypatch):
+    from astrocsv import ephem, jobs
+    before = jobs.spec_hash("export", {"a": 1})
+    monkeypatch.setattr(ephem, "ENGINE_VERSION", ephem.ENGINE_VERSION + ".next")
+    assert jobs.spec_hash("export", {"a": 1}) != before
+
+def _slow_runner(spec, path, context):
+    import time
+    context.set_total(spec["steps"])
+    with open(path, "w") as handle:
+        for step in range(1, spec["steps"] + 1):
+            handle.write(f"{os.getpid()}\n")
+            time.sleep(spec["sleep"])
+            context.advance(step)
+
+def test_isolated_runner_runs_in_another_process(tmp_path):
+    manager = JobManager(str(tmp_path / "jobs.db"), str(tmp_path / "artifacts"))
+    manager.register_runner("slow", _slow_runner, isolated=True)
+    job, _ = manager.submit("slow", {"steps": 3, "sleep": 0.0})
+    job = _wait(manager, job["id"])
+    assert job["state"] == SUCCEEDED
+    with open(job["artifact"]) as handle:
+        assert int(handle.readline()) != os.getpid()
+    manager.shutdown()
+
+def test_isolated_runner_sees_cancellation(tmp_path):
+    import time
+    manager = JobManager(str(tmp_path / "jobs.db"), str(tmp_path / "artifacts"))
+    manager.register_runner("slow", _slow_runner, isolated=True)
+    job, _ = manager.submit("slow", {"steps": 100, "sleep": 0.05})
+    while manager.get(job["id"])["state"] != RUNNING:
+        time.sleep(0.01)
+    manager.cancel(job["id"])
+    job = _wait(manager, job["id"])
+    assert job["state"] == CANCELLED
+    assert not os.listdir(tmp_path / "artifacts")
+    manager.shutdown()
+
+def test_on_finish_runs_for_finished_and_queued_cancelled_jobs(tmp_path):
+    manager = JobManager(str(tmp_path / "jobs.db"), str(tmp_path / "artifacts"), max_workers=1)
+    finished = []
+    manager.register_runner("slow", _slow_runner, on_finish=lambda spec: finished.append(spec["name"]))
+    first, _ = manager.submit("slow", {"name": "first", "steps": 2, "sleep": 0.2})
+    second, _ = manager.submit("slow", {"name": "second", "steps": 1, "sleep": 0})
+    assert manager.cancel(second["id"])["state"] == CANCELLED
+    _wait(manager, first["id"])
+    assert sorted(finished) == ["first", "second"]
+    manager.store.close()
+
+def test_dedupe_spec_reuses_jobs_with_different_specs(tmp_path):
+    manager = JobManager(str(tmp_path / "jobs.db"), str(tmp_path / "artifacts"))
+    manager.register_runner("ok", lambda spec, path, context: open(path, "w").close())
+    job, _ = manager.submit("ok", {"input": "a.csv", "sha": "x"}, dedupe_spec={"sha": "x"})
+    _wait(manager, job["id"])
+    again, deduplicated = manager.submit("ok", {"input": "b.csv", "sha": "x"}, dedupe_spec={"sha": "x"})
+    assert deduplicated and again["id"] == job["id"]
+    manager.store.close()
@@ -0,0 +1,30 @@
+"""
+Live ascendant hub: failures reach subscribers instead of killing the topic
+task silently.
+"""
+
+import asyncio
+
+from astrocsv.live import LiveAscendantHub
+
+def test_polar_latitude_sends_an_error_and_closes_the_topic():
+    async def run():
+        hub = LiveAscendantHub(tick_seconds=0.1)
+        key, queue = hub.subscribe(70.0, 20.0)
+        item = await asyncio.wait_for(queue.get(), timeout=5)
+        hub.unsubscribe(key, queue)
+        return item, hub.stats()
+
+    item, stats = asyncio.run(run())
+    assert "error" in item
+    assert stats["locations"] == 0
+    assert stats["errors"] == 1
+
+def test_snapshot_times_are_in_the_requested_zone():
+    from zoneinfo import ZoneInfo
+    from astrocsv.live import compute_live_snapshot
+
+    snapshot = compute_live_snapshot(51.5074, -0.1278, tz=ZoneInfo("Europe/London"))
+    assert snapshot["timezone"] == "Europe/London"
+    assert snapshot["time"][-6:] in ("+00:00", "+01:00")
+    assert snapshot["next_change"]["time"][-6:] in ("+00:00", "+01:00")
@@ -0,0 +1,33 @@
+"""
+Regression tests for sidereal nakshatra and yoga.
+
+Reference values for Pune on 2024-01-01 (Lahiri): Magha until 08:36 and
+Ayushman until 04:35 the next morning; tithi and karana do not depend on
+the ayanamsa.
+"""
+
+from datetime import date
+
+import pytest
+
+from astrocsv.panchang import panchang_for_dates
+
+PUNE = (18.5204, 73.8567)
+
+def test_nakshatra_and_yoga_are_sidereal():
+    row = panchang_for_dates(*PUNE, [date(2024, 1, 1)])[0]
+    assert row["nakshatra"] == "Magha"
+    assert row["nakshatra_end"].startswith("2024-01-01T08:36")
+    assert row["yoga"] == "Ayushman"
+    assert row["yoga_end"].startswith("2024-01-02T04:35")
+
+def test_tithi_and_karana_do_not_depend_on_the_ayanamsa():
+    lahiri = panchang_for_dates(*PUNE, [date(2024, 1, 1)])[0]
+    raman = panchang_for_dates(*PUNE, [date(2024, 1, 1)], ayanamsa="raman")[0]
+    for element in ("tithi", "tithi_end", "karana", "karana_end"):
+        assert lahiri[element] == raman[element]
+    assert lahiri["nakshatra"] != raman["nakshatra"]
+
+def test_unknown_ayanamsa_raises():
+    with pytest.raises(ValueError):
+        panchang_for_dates(*PUNE, [date(2024, 1, 1)], ayanamsa="tropical")
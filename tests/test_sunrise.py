@@ -0,0 +1,51 @@
+"""
+Regression tests for sunrises near 00:00 UTC.
+
+astral computes the rise of a UTC date; where the local sunrise falls close
+to midnight UTC (Bangladesh, eastern Arunachal Pradesh) it used to raise
+and the fallback returned an evening time.
+"""
+
+from datetime import date, time, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from astrocsv.ephem import IST, _compute_sunrise_times, _fallback_sunrise_calculation
+
+DHAKA = ZoneInfo("Asia/Dhaka")
+
+CASES = [
+    (23.8, 90.4, date(2024, 3, 22), DHAKA),    # Dhaka
+    (27.92, 96.17, date(2024, 3, 1), IST),     # Tezu
+    (28.0, 97.0, date(2024, 2, 26), IST),      # Kibithu / Dong
+    (28.0, 97.0, date(2024, 2, 27), IST),
+    (18.5204, 73.8567, date(2024, 3, 1), IST), # Pune
+]
+
+@pytest.mark.parametrize("lat, lon, target_date, tz", CASES)
+def test_sunrise_is_in_the_local_morning(lat, lon, target_date, tz):
+    sunrise, next_sunrise = _compute_sunrise_times(lat, lon, target_date, tz)
+    assert sunrise.date() == target_date
+    assert next_sunrise.date() == target_date + timedelta(days=1)
+    assert time(4, 30) <= sunrise.time() <= time(8, 0)
+    assert timedelta(hours=23, minutes=55) <= next_sunrise - sunrise <= timedelta(hours=24, minutes=5)
+
+@pytest.mark.parametrize("lat, lon, target_date, tz", CASES)
+def test_fallback_agrees_with_astral(lat, lon, target_date, tz):
+    sunrise, _ = _compute_sunrise_times(lat, lon, target_date, tz)
+    fallback = _fallback_sunrise_calculation(lat, lon, target_date, tz)
+    assert abs((fallback - sunrise).total_seconds()) < 60
+
+def test_polar_night_raises():
+    with pytest.raises(ValueError):
+        _compute_sunrise_times(78.0, 15.0, date(2024, 12, 21), ZoneInfo("Arctic/Longyearbyen"))
+
+def test_sunrise_is_continuous_across_utc_midnight():
+    # Sunrise crosses 00:00 UTC here between 2024-10-07 and 2024-10-09
+    rises = [
+        _compute_sunrise_times(34.75, 90.25, date(2024, 10, day), IST)[0]
+        for day in range(5, 12)
+    ]
+    steps = [(b - a).total_seconds() - 86400 for a, b in zip(rises, rises[1:])]
+    assert all(30 < step < 70 for step in steps), steps
@@ -0,0 +1,28 @@
+"""
+timezone="auto" without polygon data: the nearest gazetteer place's zone,
+never a fixed-offset Etc/GMT zone.
+"""
+
+import pytest
+
+from astrocsv import timezones
+from astrocsv.timezones import get_timezone
+
+@pytest.fixture(autouse=True)
+def no_polygons(monkeypatch):
+    monkeypatch.setattr(timezones, "get_timezone_index", lambda: None)
+    timezones._resolve_quantized.cache_clear()
+    yield
+    timezones._resolve_quantized.cache_clear()
+
+@pytest.mark.parametrize("lat, lon, zone", [
+    (18.5204, 73.8567, "Asia/Kolkata"),      # Pune: +05:30, not Etc/GMT-5
+    (51.5074, -0.1278, "Europe/London"),     # keeps British Summer Time
+    (40.7128, -74.0060, "America/New_York"),
+])
+def test_auto_uses_the_nearest_place_zone(lat, lon, zone):
+    assert get_timezone("auto", lat, lon).key == zone
+
+def test_auto_far_from_every_place_raises():
+    with pytest.raises(ValueError, match="Cannot resolve the time zone"):
+        get_timezone("auto", 0.0, -140.0)